@@ -0,0 +1,133 @@
+"""Measure the per-trial time and memory of the hpoglue run loop.
+
+The benchmark and optimizer used here do (almost) no work themselves, so what is
+measured is the cost of creating queries and results and of the bookkeeping in
+`_run_problem_with_trial_budget`.
+
+The memory retained per trial is mostly the queries and results kept in the history,
+which is what the slotted `Query` and `Result` reduce. The time per trial is dominated
+by the bookkeeping of the loop, differences of a few percent are within noise.
+
+Run from the `examples` directory:
+
+```bash
+python benchmark_trial_loop.py --trials 100000
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ConfigSpace import ConfigurationSpace
+
+from hpoglue import Config, FunctionalBenchmark, Measure, Optimizer, Problem, Query, Result
+from hpoglue._run import _run_problem_with_trial_budget
+
+if TYPE_CHECKING:
+    from hpoglue.benchmark import BenchmarkDescription
+
+
+class ReplayOptimizer(Optimizer):
+    """Asks a fixed, precomputed list of configs, in order."""
+
+    name = "ReplayOptimizer"
+    support = Problem.Support(
+        fidelities=(None,),
+        objectives=("single",),
+        cost_awareness=(None,),
+        tabular=False,
+    )
+    mem_req_mb = 1
+
+    def __init__(self, *, problem: Problem, seed: int, working_directory: Path) -> None:  # noqa: ARG002
+        """Precompute the configs to ask for."""
+        n = int(problem.budget.total)
+        self.problem = problem
+        self.configs = [Config(config_id=str(i), values={"x": float(i)}) for i in range(n)]
+        self._next = 0
+
+    def ask(self) -> Query:
+        """Ask for the next config."""
+        config = self.configs[self._next]
+        self._next += 1
+        return Query(config=config, fidelity=None)
+
+    def tell(self, result: Result) -> None:
+        """Ignore the result."""
+
+
+def _query(query: Query) -> Result:
+    return Result(query=query, fidelity=None, values={"y": 0.0})
+
+
+def _problem(trials: int) -> tuple[Problem, BenchmarkDescription]:
+    bench = FunctionalBenchmark(
+        name="constant",
+        config_space=ConfigurationSpace({"x": (0.0, float(trials))}),
+        metrics={"y": Measure.metric((0.0, 1.0), minimize=True)},
+        query=_query,
+    )
+    problem = Problem.problem(
+        optimizer=ReplayOptimizer,
+        benchmark=bench.desc,
+        budget=trials,
+        continuations=False,
+    )
+    return problem, bench.desc
+
+
+def _loop(problem: Problem, optimizer: Optimizer, desc: BenchmarkDescription) -> list[Result]:
+    return _run_problem_with_trial_budget(
+        run_name="benchmark_trial_loop",
+        optimizer=optimizer,
+        benchmark=desc.load(desc),
+        problem=problem,
+        budget_total=int(problem.budget.total),
+        on_error="raise",
+        minimum_normalized_fidelity=1.0,
+        progress_bar=False,
+        use_continuations_as_budget=False,
+    )
+
+
+def main() -> None:
+    """Report the time and memory per trial of the run loop."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    problem, desc = _problem(args.trials)
+
+    # NOTE: The configs are created up front by the optimizer, so that only the
+    # queries, results and bookkeeping of the loop itself are measured.
+    timings = []
+    for _ in range(args.repeats):
+        optimizer = ReplayOptimizer(problem=problem, seed=0, working_directory=Path())
+        gc.collect()
+        start = time.perf_counter()
+        history = _loop(problem, optimizer, desc)
+        timings.append(time.perf_counter() - start)
+        del history
+
+    optimizer = ReplayOptimizer(problem=problem, seed=0, working_directory=Path())
+    gc.collect()
+    tracemalloc.start()
+    history = _loop(problem, optimizer, desc)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"trials:             {args.trials}")
+    print(f"time per trial:     {1e6 * min(timings) / args.trials:.2f} us (best of {args.repeats})")
+    print(f"retained per trial: {retained / len(history):.0f} bytes")
+    print(f"peak per trial:     {peak / len(history):.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
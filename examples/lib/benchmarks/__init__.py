@@ -4,13 +4,16 @@ from typing import TYPE_CHECKING
 
 from lib.benchmarks.ackley import ACKLEY_BENCH
 from lib.benchmarks.branin import BRANIN_BENCH
+from lib.benchmarks.synthetic import SYNTHETIC_FUNCTIONAL_BENCH, SYNTHETIC_TABULAR_BENCH
 
 if TYPE_CHECKING:
     from hpoglue.benchmark import BenchmarkDescription
 
 BENCHMARKS: dict[str, BenchmarkDescription] = {}
-BENCHMARKS["ackley"] = ACKLEY_BENCH
-BENCHMARKS["branin"] = BRANIN_BENCH
+BENCHMARKS["ackley"] = ACKLEY_BENCH.desc
+BENCHMARKS["branin"] = BRANIN_BENCH.desc
+BENCHMARKS["synthetic_functional"] = SYNTHETIC_FUNCTIONAL_BENCH.desc
+BENCHMARKS["synthetic_tabular"] = SYNTHETIC_TABULAR_BENCH
 
 __all__ = [
     "BENCHMARKS"
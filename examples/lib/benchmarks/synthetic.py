@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from ConfigSpace import CategoricalHyperparameter, ConfigurationSpace, Float, Integer
+
+from hpoglue import BenchmarkDescription, FunctionalBenchmark, Measure, Result, TabularBenchmark
+from hpoglue.fidelity import RangeFidelity
+
+if TYPE_CHECKING:
+    from hpoglue import Query
+
+FIDELITY_NAME = "epoch"
+INT_UPPER = 100
+
+
+class SyntheticResponse:
+    """A deterministic, vectorized response surface for synthetic benchmarks.
+
+    Every metric is a weighted quadratic bowl around a random center of the numerical
+    hyperparameters, plus a random offset per category of each categorical hyperparameter
+    and a power-law learning curve over the fidelity. All of its parameters are drawn
+    from the `seed`, so the same arguments always give the same benchmark.
+
+    Metrics are to be minimized and bounded below by `0`. Costs grow linearly with
+    the fidelity. Test metrics are the metrics with a constant generalization gap.
+    """
+
+    def __init__(
+        self,
+        *,
+        n_numerical: int,
+        n_categorical: int,
+        n_categories: int,
+        n_metrics: int,
+        n_costs: int,
+        seed: int,
+    ) -> None:
+        """Draw the parameters of the response surface from the `seed`."""
+        self.n_numerical = n_numerical
+        self.n_categorical = n_categorical
+        self.n_categories = n_categories
+        self.n_metrics = n_metrics
+        self.n_costs = n_costs
+        self.seed = seed
+
+        rng = np.random.default_rng(seed)
+        self.center = rng.uniform(0.1, 0.9, size=(n_metrics, n_numerical))
+        self.weight = rng.uniform(0.5, 2.0, size=(n_metrics, n_numerical))
+        self.cat_offset = rng.uniform(0.0, 0.5, size=(n_metrics, n_categorical, n_categories))
+        self.curve_scale = rng.uniform(0.5, 1.5, size=n_metrics)
+        self.curve_power = rng.uniform(0.5, 2.0, size=n_metrics)
+        self.test_gap = rng.uniform(0.01, 0.1, size=n_metrics)
+        self.cost_weight = rng.uniform(0.0, 1.0, size=(n_costs, n_numerical))
+
+    @property
+    def metric_names(self) -> list[str]:
+        """The names of the metrics."""
+        return [f"loss{i}" for i in range(self.n_metrics)]
+
+    @property
+    def test_metric_names(self) -> list[str]:
+        """The names of the test metrics."""
+        return [f"test_loss{i}" for i in range(self.n_metrics)]
+
+    @property
+    def cost_names(self) -> list[str]:
+        """The names of the costs."""
+        return [f"cost{i}" for i in range(self.n_costs)]
+
+    def evaluate(
+        self,
+        numerical: np.ndarray,
+        categorical: np.ndarray,
+        fidelity: np.ndarray,
+    ) -> dict[str, np.ndarray]:
+        """Evaluate all metrics, test metrics and costs for many configurations at once.
+
+        Args:
+            numerical: The numerical hyperparameters scaled to `[0, 1]`,
+                of shape `(n, n_numerical)`.
+            categorical: The category index of each categorical hyperparameter,
+                of shape `(n, n_categorical)`.
+            fidelity: The fidelity scaled to `[0, 1]`, of shape `(n,)`.
+
+        Returns:
+            A column of values for each metric, test metric and cost.
+        """
+        # (n, 1, n_numerical) - (n_metrics, n_numerical) -> (n, n_metrics)
+        dist = (self.weight * (numerical[:, None, :] - self.center) ** 2).sum(axis=-1)
+        cat_cols = np.arange(self.n_categorical)
+        offsets = self.cat_offset[:, cat_cols, categorical].sum(axis=-1).T
+        curve = self.curve_scale * (1.0 - fidelity[:, None]) ** self.curve_power
+        loss = dist + offsets + curve
+
+        columns: dict[str, np.ndarray] = {}
+        for i, name in enumerate(self.metric_names):
+            columns[name] = loss[:, i]
+        for i, name in enumerate(self.test_metric_names):
+            columns[name] = loss[:, i] + self.test_gap[i]
+        cost = (1.0 + numerical @ self.cost_weight.T) * (0.01 + fidelity[:, None])
+        for i, name in enumerate(self.cost_names):
+            columns[name] = cost[:, i]
+        return columns
+
+    def measures(self) -> tuple[dict[str, Measure], dict[str, Measure], dict[str, Measure]]:
+        """The metrics, test metrics and costs of the response surface."""
+        metrics = {
+            name: Measure.metric((0.0, np.inf), minimize=True) for name in self.metric_names
+        }
+        test_metrics = {
+            name: Measure.test_metric((0.0, np.inf), minimize=True)
+            for name in self.test_metric_names
+        }
+        costs = {name: Measure.cost((0.0, np.inf), minimize=True) for name in self.cost_names}
+        return metrics, test_metrics, costs
+
+
+def _hp_names(n_float: int, n_int: int, n_categorical: int) -> tuple[list[str], list[str]]:
+    numerical = [f"x{i}" for i in range(n_float)] + [f"n{i}" for i in range(n_int)]
+    categorical = [f"c{i}" for i in range(n_categorical)]
+    return numerical, categorical
+
+
+def _choices(n_categories: int) -> list[str]:
+    return [f"choice{i}" for i in range(n_categories)]
+
+
+def _sample_configs(
+    n_configs: int,
+    *,
+    n_float: int,
+    n_int: int,
+    n_categorical: int,
+    n_categories: int,
+    seed: int,
+) -> pd.DataFrame:
+    n_distinct = np.inf if n_float > 0 else INT_UPPER**n_int * n_categories**n_categorical
+    if n_configs > n_distinct:
+        raise ValueError(
+            f"{n_configs=} is more than the {n_distinct} distinct configs of a space with"
+            f" {n_int} integer and {n_categorical} categorical hyperparameters."
+        )
+
+    rng = np.random.default_rng(seed)
+    numerical, categorical = _hp_names(n_float, n_int, n_categorical)
+    choices = np.asarray(_choices(n_categories), dtype=object)
+
+    # Draw batches of `n_configs` until there are `n_configs` distinct ones, the first
+    # batch alone is enough unless the space is small.
+    configs = pd.DataFrame(columns=[*numerical, *categorical])
+    n = n_configs
+    while len(configs) < n_configs:
+        columns: dict[str, np.ndarray] = {}
+        for name in numerical[:n_float]:
+            columns[name] = rng.random(n)
+        for name in numerical[n_float:]:
+            columns[name] = rng.integers(1, INT_UPPER + 1, size=n)
+        for name in categorical:
+            columns[name] = choices[rng.integers(n_categories, size=n)]
+
+        drawn = pd.DataFrame(columns)
+        configs = drawn if configs.empty else pd.concat([configs, drawn], ignore_index=True)
+        configs = configs.drop_duplicates(ignore_index=True)
+
+    # NOTE: `TabularBenchmark` assigns config ids by the sorted order of the configs,
+    # so the table must use the same ids.
+    keys = [*numerical, *categorical]
+    return configs.head(n_configs).sort_values(by=keys).reset_index(drop=True)
+
+
+def _scaled_numerical(configs: pd.DataFrame, n_float: int, n_int: int) -> np.ndarray:
+    numerical, _ = _hp_names(n_float, n_int, 0)
+    if not numerical:
+        return np.zeros((len(configs), 0))
+
+    X = configs[numerical].to_numpy(dtype=np.float64)
+    X[:, n_float:] = (X[:, n_float:] - 1) / (INT_UPPER - 1)
+    return X
+
+
+def _category_codes(configs: pd.DataFrame, n_categorical: int, n_categories: int) -> np.ndarray:
+    _, categorical = _hp_names(0, 0, n_categorical)
+    if not categorical:
+        return np.zeros((len(configs), 0), dtype=np.int64)
+
+    categories = _choices(n_categories)
+    return np.stack(
+        [pd.Categorical(configs[name], categories=categories).codes for name in categorical],
+        axis=1,
+    ).astype(np.int64)
+
+
+def synthetic_tabular(  # noqa: PLR0913
+    *,
+    name: str = "synthetic_tabular",
+    n_configs: int = 1_000,
+    n_float: int = 4,
+    n_int: int = 1,
+    n_categorical: int = 1,
+    n_categories: int = 3,
+    n_fidelity_levels: int = 10,
+    n_metrics: int = 1,
+    n_costs: int = 1,
+    seed: int = 0,
+    mem_req_mb: int | None = None,
+) -> BenchmarkDescription:
+    """Generate a synthetic tabular benchmark.
+
+    The table has `n_configs * n_fidelity_levels` rows, one for every config evaluated at
+    every fidelity level, and is only generated when the benchmark is loaded.
+
+    Args:
+        name: The name of the benchmark.
+        n_configs: The number of configurations in the table.
+        n_float: The number of float hyperparameters, in `[0, 1]`.
+        n_int: The number of integer hyperparameters, in `[1, 100]`.
+        n_categorical: The number of categorical hyperparameters.
+        n_categories: The number of choices of each categorical hyperparameter.
+        n_fidelity_levels: The number of fidelity levels, `0` for no fidelity.
+        n_metrics: The number of metrics, each with a matching test metric.
+        n_costs: The number of costs.
+        seed: The seed to generate the configurations and the response surface from.
+        mem_req_mb: The memory requirement of the benchmark in mb.
+            Defaults to an estimate from the size of the table.
+
+    Returns:
+        The description of the benchmark.
+    """
+    if n_float + n_int + n_categorical == 0:
+        raise ValueError("A synthetic benchmark needs at least one hyperparameter.")
+
+    response = SyntheticResponse(
+        n_numerical=n_float + n_int,
+        n_categorical=n_categorical,
+        n_categories=n_categories,
+        n_metrics=n_metrics,
+        n_costs=n_costs,
+        seed=seed,
+    )
+    configs = _sample_configs(
+        n_configs,
+        n_float=n_float,
+        n_int=n_int,
+        n_categorical=n_categorical,
+        n_categories=n_categories,
+        seed=seed,
+    )
+    config_keys = list(configs.columns)
+    metrics, test_metrics, costs = response.measures()
+    fidelities = (
+        {
+            FIDELITY_NAME: RangeFidelity.from_tuple(
+                (1, n_fidelity_levels, 1), supports_continuation=True
+            )
+        }
+        if n_fidelity_levels > 1
+        else None
+    )
+    if mem_req_mb is None:
+        n_columns = len(config_keys) + 2 + 2 * n_metrics + n_costs
+        n_rows = len(configs) * max(n_fidelity_levels, 1)
+        mem_req_mb = max(1, int(n_rows * n_columns * 8 / 2**20))
+
+    return BenchmarkDescription(
+        name=name,
+        config_space=TabularBenchmark.get_tabular_config_space(configs, config_keys),
+        load=partial(
+            _load_tabular,
+            configs=configs,
+            response=response,
+            n_float=n_float,
+            n_int=n_int,
+            n_fidelity_levels=n_fidelity_levels,
+        ),
+        metrics=metrics,
+        test_metrics=test_metrics,
+        costs=costs or None,
+        fidelities=fidelities,
+        is_tabular=True,
+        mem_req_mb=mem_req_mb,
+    )
+
+
+def _load_tabular(
+    desc: BenchmarkDescription,
+    *,
+    configs: pd.DataFrame,
+    response: SyntheticResponse,
+    n_float: int,
+    n_int: int,
+    n_fidelity_levels: int,
+) -> TabularBenchmark:
+    n_levels = max(n_fidelity_levels, 1)
+    rows = np.repeat(np.arange(len(configs)), n_levels)
+    ids = np.array([str(i) for i in range(len(configs))], dtype=object)
+    columns: dict[str, np.ndarray] = {"config_idx": ids[rows]}
+
+    levels = np.tile(np.arange(1, n_levels + 1), len(configs))
+    scaled = (levels - 1) / (n_levels - 1) if n_levels > 1 else np.ones(len(levels))
+    if desc.fidelities is not None:
+        columns[FIDELITY_NAME] = levels
+
+    for key in configs.columns:
+        columns[key] = configs[key].to_numpy()[rows]
+
+    columns.update(
+        response.evaluate(
+            _scaled_numerical(configs, n_float, n_int)[rows],
+            _category_codes(configs, response.n_categorical, response.n_categories)[rows],
+            scaled,
+        )
+    )
+    table = pd.DataFrame(columns)
+    return TabularBenchmark(
+        desc=desc,
+        table=table,
+        id_key="config_idx",
+        config_keys=list(configs.columns),
+    )
+
+
+@dataclass(frozen=True)
+class _SyntheticQuery:
+    response: SyntheticResponse
+    n_float: int
+    n_int: int
+    max_fidelity: int
+
+    def __call__(self, query: Query) -> Result:
+        configs = pd.DataFrame([query.config.values])
+        match query.fidelity:
+            case None:
+                fidelity = 1.0
+            case (_, value):
+                fidelity = (value - 1) / (self.max_fidelity - 1)
+            case _:
+                raise NotImplementedError("Synthetic benchmarks support a single fidelity.")
+
+        values = self.response.evaluate(
+            _scaled_numerical(configs, self.n_float, self.n_int),
+            _category_codes(configs, self.response.n_categorical, self.response.n_categories),
+            np.array([fidelity], dtype=np.float64),
+        )
+        return Result(
+            query=query,
+            fidelity=query.fidelity,
+            values={k: float(v[0]) for k, v in values.items()},
+        )
+
+
+def synthetic_functional(
+    *,
+    name: str = "synthetic_functional",
+    n_float: int = 4,
+    n_int: int = 1,
+    n_categorical: int = 1,
+    n_categories: int = 3,
+    n_fidelity_levels: int = 10,
+    n_metrics: int = 1,
+    n_costs: int = 1,
+    seed: int = 0,
+) -> FunctionalBenchmark:
+    """Generate a synthetic functional benchmark.
+
+    It uses the same response surface as
+    [`synthetic_tabular`][lib.benchmarks.synthetic.synthetic_tabular] with the same
+    arguments, but can be queried at any configuration of its config space.
+
+    Args:
+        name: The name of the benchmark.
+        n_float: The number of float hyperparameters, in `[0, 1]`.
+        n_int: The number of integer hyperparameters, in `[1, 100]`.
+        n_categorical: The number of categorical hyperparameters.
+        n_categories: The number of choices of each categorical hyperparameter.
+        n_fidelity_levels: The number of fidelity levels, `0` for no fidelity.
+        n_metrics: The number of metrics, each with a matching test metric.
+        n_costs: The number of costs.
+        seed: The seed to generate the response surface from.
+
+    Returns:
+        The functional benchmark.
+    """
+    if n_float + n_int + n_categorical == 0:
+        raise ValueError("A synthetic benchmark needs at least one hyperparameter.")
+
+    response = SyntheticResponse(
+        n_numerical=n_float + n_int,
+        n_categorical=n_categorical,
+        n_categories=n_categories,
+        n_metrics=n_metrics,
+        n_costs=n_costs,
+        seed=seed,
+    )
+    numerical, categorical = _hp_names(n_float, n_int, n_categorical)
+    config_space = ConfigurationSpace(seed=seed)
+    config_space.add([Float(hp, (0.0, 1.0)) for hp in numerical[:n_float]])
+    config_space.add([Integer(hp, (1, INT_UPPER)) for hp in numerical[n_float:]])
+    config_space.add(
+        [CategoricalHyperparameter(hp, _choices(n_categories)) for hp in categorical]
+    )
+    metrics, test_metrics, costs = response.measures()
+    return FunctionalBenchmark(
+        name=name,
+        config_space=config_space,
+        metrics=metrics,
+        test_metrics=test_metrics,
+        costs=costs or None,
+        fidelities=(
+            {
+                FIDELITY_NAME: RangeFidelity.from_tuple(
+                    (1, n_fidelity_levels, 1), supports_continuation=True
+                )
+            }
+            if n_fidelity_levels > 1
+            else None
+        ),
+        query=_SyntheticQuery(
+            response=response,
+            n_float=n_float,
+            n_int=n_int,
+            max_fidelity=max(n_fidelity_levels, 1),
+        ),
+    )
+
+
+# NOTE: Building the descriptions is cheap, the table of the tabular benchmark is only
+# generated when it is loaded.
+SYNTHETIC_TABULAR_BENCH = synthetic_tabular()
+SYNTHETIC_FUNCTIONAL_BENCH = synthetic_functional()
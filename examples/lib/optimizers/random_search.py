@@ -8,7 +8,7 @@ from typing import TYPE_CHECKING, Literal
 import numpy as np
 from ConfigSpace import ConfigurationSpace
 
-from hpoglue import Config, Optimizer, Problem, Query
+from hpoglue import Config, ConfigSchema, Optimizer, Problem, Query
 
 if TYPE_CHECKING:
     from hpoglue import Result
@@ -42,6 +42,7 @@ class RandomSearch(Optimizer):
             case ConfigurationSpace():
                 self.config_space = copy.deepcopy(problem.config_space)
                 self.config_space.seed(seed)
+                self.schema = ConfigSchema.from_configspace(self.config_space)
             case list():
                 self.config_space = problem.config_space
             case _:
@@ -57,9 +58,9 @@ class RandomSearch(Optimizer):
         # We are dealing with a tabular benchmark
         match self.config_space:
             case ConfigurationSpace():
-                config = Config(
+                config = self.schema.make(
                     config_id=str(self._counter),
-                    values=dict(self.config_space.sample_configuration())
+                    values=dict(self.config_space.sample_configuration()),
                 )
             case list():
                 index = int(self.rng.integers(len(self.config_space)))
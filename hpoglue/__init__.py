@@ -5,7 +5,7 @@ from hpoglue.benchmark import (
     SurrogateBenchmark,
     TabularBenchmark,
 )
-from hpoglue.config import Config
+from hpoglue.config import CompactConfig, Config, ConfigSchema
 from hpoglue.measure import Measure
 from hpoglue.optimizer import Optimizer
 from hpoglue.problem import Problem
@@ -16,7 +16,9 @@ from hpoglue.run_glue import run_glue as run
 __all__ = [
     "Benchmark",
     "BenchmarkDescription",
+    "CompactConfig",
     "Config",
+    "ConfigSchema",
     "FunctionalBenchmark",
     "Measure",
     "Optimizer",
@@ -2,27 +2,37 @@ from __future__ import annotations
 
 import logging
 import warnings
-from collections.abc import Mapping
-from contextlib import nullcontext
+from collections.abc import Mapping, Sequence
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass, field
 from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, overload
 
 import numpy as np
 from tqdm import TqdmWarning, tqdm
 
+from hpoglue.benchmark import BENCHMARK_CACHE
 from hpoglue.budget import CostBudget, TrialBudget
+from hpoglue.callbacks import bound_hooks
 from hpoglue.fidelity import Fidelity
+from hpoglue.trajectory import TrajectoryBuffer
 
 if TYPE_CHECKING:
     from hpoglue.problem import Problem
 from hpoglue.utils import rescale
 
 if TYPE_CHECKING:
+    from hpoglue.batching import BatchingBenchmark
     from hpoglue.benchmark import Benchmark
+    from hpoglue.callbacks import Callback
+    from hpoglue.env import Venv
     from hpoglue.optimizer import Optimizer
+    from hpoglue.pareto import ParetoArchive
+    from hpoglue.query import Query
     from hpoglue.result import Result
+    from hpoglue.result_store import ResultStore
+    from hpoglue.worker import BenchmarkWorker
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +93,7 @@ class RuntimeHist:
         return self.configs
 
 
+@overload
 def _run(
     problem: Problem,
     seed: int,
@@ -91,9 +102,49 @@ def _run(
     on_error: Literal["raise", "continue"] = "raise",
     progress_bar: bool = False,
     use_continuations_as_budget: bool = False,
-) -> list[Result]:
+    benchmark_venv: Venv | None = None,
+    cache_benchmark: bool = False,
+    loaded_benchmark: Benchmark | BatchingBenchmark | BenchmarkWorker | None = None,
+    result_store: None = None,
+    pareto_archive: ParetoArchive | None = None,
+    callbacks: Sequence[Callback] = (),
+) -> list[Result]: ...
+
+
+@overload
+def _run(
+    problem: Problem,
+    seed: int,
+    *,
+    run_name: str | None = None,
+    on_error: Literal["raise", "continue"] = "raise",
+    progress_bar: bool = False,
+    use_continuations_as_budget: bool = False,
+    benchmark_venv: Venv | None = None,
+    cache_benchmark: bool = False,
+    loaded_benchmark: Benchmark | BatchingBenchmark | BenchmarkWorker | None = None,
+    result_store: ResultStore,
+    pareto_archive: ParetoArchive | None = None,
+    callbacks: Sequence[Callback] = (),
+) -> ResultStore: ...
+
+
+def _run(  # noqa: PLR0913
+    problem: Problem,
+    seed: int,
+    *,
+    run_name: str | None = None,
+    on_error: Literal["raise", "continue"] = "raise",
+    progress_bar: bool = False,
+    use_continuations_as_budget: bool = False,
+    benchmark_venv: Venv | None = None,
+    cache_benchmark: bool = False,
+    loaded_benchmark: Benchmark | BatchingBenchmark | BenchmarkWorker | None = None,
+    result_store: ResultStore | None = None,
+    pareto_archive: ParetoArchive | None = None,
+    callbacks: Sequence[Callback] = (),
+) -> list[Result] | ResultStore:
     run_name = run_name if run_name is not None else problem.name
-    benchmark = problem.benchmark.load(problem.benchmark)
     opt = problem.optimizer(
         problem=problem,
         working_directory=Path("./Optimizers_cache"),
@@ -109,48 +160,90 @@ def _run(
         )
         use_continuations_as_budget = False
 
-    match problem.budget:
-        case TrialBudget(
-            total=budget_total,
-            minimum_fidelity_normalized_value=minimum_normalized_fidelity,
-        ):
-            history = _run_problem_with_trial_budget(
-                run_name=run_name,
-                optimizer=opt,
-                benchmark=benchmark,
-                problem=problem,
-                budget_total=budget_total,
-                on_error=on_error,
-                minimum_normalized_fidelity=minimum_normalized_fidelity,
-                progress_bar=progress_bar,
-                use_continuations_as_budget=use_continuations_as_budget,
-            )
-        case CostBudget():
-            raise NotImplementedError("CostBudget not yet implemented")
-        case _:
-            raise RuntimeError(f"Invalid budget type: {problem.budget}")
+    for on_start in bound_hooks(callbacks, "on_start"):
+        on_start(problem=problem, seed=seed, run_name=run_name)
+
+    # NOTE: Only start loading the benchmark, possibly in a worker process, once nothing
+    # else can fail before the `with` that cleans it up.
+    benchmark_ctx: AbstractContextManager[Benchmark | BatchingBenchmark | BenchmarkWorker]
+    if loaded_benchmark is not None:
+        # NOTE: Owned by the caller, e.g. shared between concurrent runs.
+        benchmark_ctx = nullcontext(loaded_benchmark)
+    elif benchmark_venv is not None:
+        # NOTE: Imported here so that `python -m hpoglue.worker` does not find the
+        # module already imported through `hpoglue.__init__`.
+        from hpoglue.worker import BenchmarkWorker  # noqa: PLC0415
+
+        benchmark_ctx = BenchmarkWorker.from_venv(problem.benchmark, venv=benchmark_venv)
+    elif cache_benchmark:
+        benchmark_ctx = nullcontext(BENCHMARK_CACHE.load(problem.benchmark))
+    else:
+        benchmark_ctx = nullcontext(problem.benchmark.load(problem.benchmark))
+
+    with benchmark_ctx as benchmark:
+        match problem.budget:
+            case TrialBudget(
+                total=budget_total,
+                minimum_fidelity_normalized_value=minimum_normalized_fidelity,
+            ):
+                history = _run_problem_with_trial_budget(
+                    run_name=run_name,
+                    optimizer=opt,
+                    benchmark=benchmark,
+                    problem=problem,
+                    budget_total=budget_total,
+                    on_error=on_error,
+                    minimum_normalized_fidelity=minimum_normalized_fidelity,
+                    progress_bar=progress_bar,
+                    use_continuations_as_budget=use_continuations_as_budget,
+                    result_store=result_store,
+                    pareto_archive=pareto_archive,
+                    callbacks=callbacks,
+                )
+            case CostBudget():
+                raise NotImplementedError("CostBudget not yet implemented")
+            case _:
+                raise RuntimeError(f"Invalid budget type: {problem.budget}")
 
     logger.info(f"COMPLETED running {run_name}")
     return history
 
 
-def _run_problem_with_trial_budget(  # noqa: C901, PLR0912, PLR0915
+def _run_problem_with_trial_budget(  # noqa: C901, PLR0912, PLR0913, PLR0915
     *,
     run_name: str,
     optimizer: Optimizer,
-    benchmark: Benchmark,
+    benchmark: Benchmark | BatchingBenchmark | BenchmarkWorker,
     problem: Problem,
     budget_total: int,
     on_error: Literal["raise", "continue"],
     minimum_normalized_fidelity: float,
     progress_bar: bool,
     use_continuations_as_budget: bool,
-) -> list[Result]:
+    result_store: ResultStore | None = None,
+    pareto_archive: ParetoArchive | None = None,
+    callbacks: Sequence[Callback] = (),
+) -> list[Result] | ResultStore:
     used_budget: float = 0.0
     used_trial_budget: float = 0.0
     continuations_used_budget: float = 0.0
 
-    history: list[Result] = []
+    # NOTE: Results are either kept as is, or written straight into the columns of a store.
+    history: list[Result] | ResultStore = result_store if result_store is not None else []
+
+    # NOTE: Learning curves are stored once per config and shared by all of its results.
+    trajectories = TrajectoryBuffer()
+    provide_trajectory = optimizer.multi_fideltiy_requires_learning_curve
+
+    # NOTE: The first result in the history for each config, keyed by its rounded values,
+    # to look up resampled configs without scanning the history.
+    first_result_of_config: dict[tuple, Result] = {}
+
+    # NOTE: Only the hooks overridden by a callback are kept, without any the loop
+    # only checks for an empty list.
+    on_ask = bound_hooks(callbacks, "on_ask")
+    on_result = bound_hooks(callbacks, "on_result")
+    on_error_hooks = bound_hooks(callbacks, "on_error")
 
     if progress_bar:
         ctx = partial(tqdm, desc=f"{run_name}", total=budget_total)
@@ -164,8 +257,14 @@ def _run_problem_with_trial_budget(  # noqa: C901, PLR0912, PLR0915
 
         with ctx() as pbar:
             while used_budget < budget_total:
+                # NOTE: Reset, such that an error in `ask()` is not reported with the
+                # query of the previous iteration.
+                query: Query | None = None
                 try:
                     query = optimizer.ask()
+                    if on_ask:
+                        for hook in on_ask:
+                            hook(query)
 
                     match query.fidelity:
                         case None:
@@ -180,26 +279,20 @@ def _run_problem_with_trial_budget(  # noqa: C901, PLR0912, PLR0915
                                 exist_already = runhist.add_conf(config=config, fid_name=fid_name)
 
                                 if exist_already:
-                                    # NOTE: Not a cheap operation since we don't store the costs
-                                    # in the continuations dict
-                                    result = None
-                                    for existing_result in history:
-                                        tup = existing_result.config.to_tuple(problem.precision)
-                                        if Conf(tup, fid_value) == config:
-                                            if query.config_id == existing_result.query.config_id:
-                                                raise ValueError(
-                                                    "Resampled configuration has same config_id"
-                                                    " in history!"
-                                                )
-                                            existing_result.query = query
-                                            result = existing_result
-                                            break
-
-                                    if result is None:
+                                    existing_result = first_result_of_config.get(config.t)
+                                    if existing_result is None:
                                         raise ValueError(
                                             "Resampled configuration not found in history!"
                                         )
 
+                                    if query.config_id == existing_result.query.config_id:
+                                        raise ValueError(
+                                            "Resampled configuration has same config_id"
+                                            " in history!"
+                                        )
+                                    existing_result.query = query
+                                    result = existing_result
+
                                 else:
                                     result = benchmark.query(query)
                                     if problem.continuations:
@@ -213,6 +306,18 @@ def _run_problem_with_trial_budget(  # noqa: C901, PLR0912, PLR0915
                                 f" but got: {query.fidelity}"
                             )
 
+                    if problem.supports_trajectory and (
+                        provide_trajectory or query.request_trajectory
+                    ):
+                        frm, to = _trajectory_range(query, problem)
+                        result.trajectory = trajectories.fetch(
+                            benchmark,
+                            key=query.config.to_tuple(problem.precision),
+                            query=query,
+                            frm=frm,
+                            to=to,
+                        )
+
                     match result.fidelity:
                         case None:
                             _fid_value = None
@@ -262,12 +367,23 @@ def _run_problem_with_trial_budget(  # noqa: C901, PLR0912, PLR0915
 
                     optimizer.tell(result)
                     history.append(result)
+                    if pareto_archive is not None:
+                        pareto_archive.add_result(result)
+                    if problem.continuations:
+                        first_result_of_config.setdefault(
+                            result.config.to_tuple(problem.precision), result
+                        )
                     if pbar is not None:
                         pbar.update(budget_cost)
+                    if on_result:
+                        for hook in on_result:
+                            hook(result)
 
                 except Exception as e:
                     logger.exception(e)
                     logger.error(f"Error running {run_name}: {e}")
+                    for hook in on_error_hooks:
+                        hook(e, query=query)
                     match on_error:
                         case "raise":
                             raise e
@@ -275,9 +391,24 @@ def _run_problem_with_trial_budget(  # noqa: C901, PLR0912, PLR0915
                             raise NotImplementedError("Continue not yet implemented!") from e
                         case _:
                             raise RuntimeError(f"Invalid value for `on_error`: {on_error}") from e
+
+    for hook in bound_hooks(callbacks, "on_budget_exhausted"):
+        hook(used_budget=used_budget, budget_total=budget_total)
+
     return history
 
 
+def _trajectory_range(query: Query, problem: Problem) -> tuple[int | float, int | float]:
+    assert isinstance(query.fidelity, tuple)
+    assert isinstance(problem.fidelities, tuple)
+    _, fid_value = query.fidelity
+    match query.request_trajectory:
+        case (frm, to):
+            return frm, to
+        case _:
+            return problem.fidelities[1].min, fid_value
+
+
 def _trial_budget_cost(
     *,
     value: None | tuple[str, int | float] | Mapping[str, int | float],
@@ -0,0 +1,311 @@
+"""Archives of run results as partitioned parquet files.
+
+A [`RunArchive`][hpoglue.archive.RunArchive] stores every run in its own parquet file,
+partitioned by benchmark, optimizer and seed:
+
+```
+<root>/benchmark=<benchmark>/optimizer=<optimizer>/seed=<seed>/<problem-hash>.parquet
+```
+
+The [`Problem.to_dict()`][hpoglue.problem.Problem.to_dict] of the run is kept in the
+metadata of the file. When reading, only the directories matching the requested
+benchmarks, optimizers and seeds are visited, and budget ranges are pushed down to the
+parquet reader. Runs are written in row groups of
+[`ROW_GROUP_SIZE`][hpoglue.archive.ROW_GROUP_SIZE] rows, so that the row groups of a
+run outside the range are never loaded.
+
+Requires `pyarrow`, e.g. with `pip install hpoglue[arrow]`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote, unquote
+
+import pandas as pd
+
+from hpoglue.dataframe_utils import flatten_results
+from hpoglue.result_store import ResultStore
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError as e:
+    raise ImportError(
+        "`pyarrow` is required for `hpoglue.archive`. Install it with `pip install hpoglue[arrow]`."
+    ) from e
+
+if TYPE_CHECKING:
+    from hpoglue.problem import Problem
+
+logger = logging.getLogger(__name__)
+
+PROBLEM_METADATA_KEY = b"hpoglue.problem"
+"""The key of the problem, as json, in the metadata of an archived run."""
+
+SEED_METADATA_KEY = b"hpoglue.seed"
+"""The key of the seed in the metadata of an archived run."""
+
+PARTITION_KEYS = ("benchmark", "optimizer", "seed")
+"""The keys the archive is partitioned by, in order of the directory levels."""
+
+ROW_GROUP_SIZE = 1024
+"""The number of rows per row group of an archived run.
+
+As the budget used grows with every row of a run, each row group covers a narrow budget
+range, which lets the reader skip the row groups outside a requested range.
+"""
+
+_NESTED_COLUMNS = ("config", "results", "fidelity")
+
+
+@dataclass(frozen=True)
+class ArchiveFile:
+    """A single run in a [`RunArchive`][hpoglue.archive.RunArchive]."""
+
+    path: Path
+    """The path of the parquet file."""
+
+    benchmark: str
+    """The name of the benchmark of the run."""
+
+    optimizer: str
+    """The name of the optimizer of the run."""
+
+    seed: int
+    """The seed of the run."""
+
+    def problem_dict(self) -> dict[str, Any]:
+        """Read the `Problem.to_dict()` of the run from the file metadata."""
+        metadata = pq.read_schema(self.path).metadata or {}
+        problem: dict[str, Any] = json.loads(metadata[PROBLEM_METADATA_KEY])
+        return problem
+
+    def read(
+        self,
+        *,
+        columns: Iterable[str] | None = None,
+        filters: list[tuple[str, str, Any]] | None = None,
+    ) -> pd.DataFrame:
+        """Read the results of the run, along with its partition keys.
+
+        Args:
+            columns: The columns to read. Columns missing from this run are skipped.
+                If `None`, all columns are read.
+            filters: Filters in the `pyarrow.parquet` format, pushed down to the reader.
+
+        Returns:
+            The results of the run.
+
+        Raises:
+            ValueError: If a filter is on a column missing from this run.
+        """
+        if columns is not None or filters:
+            names = set(pq.read_schema(self.path).names)
+            if columns is not None:
+                columns = [c for c in columns if c in names]
+
+            if filters:
+                missing = {c for c, _, _ in filters if c not in names}
+                if missing:
+                    raise ValueError(
+                        f"Can not filter {self.path} by {sorted(missing)}, it has no such columns."
+                    )
+
+        df = pq.read_table(self.path, columns=columns, filters=filters).to_pandas()
+        return df.assign(benchmark=self.benchmark, optimizer=self.optimizer, seed=self.seed)
+
+
+class RunArchive:
+    """A directory of archived runs, partitioned by benchmark, optimizer and seed.
+
+    ```python
+    archive = RunArchive("results/")
+    df = run_glue(optimizer=..., benchmark=..., seed=0)
+    archive.write(df, problem=problem, seed=0)
+
+    df = archive.read(benchmarks=["ackley"], budget=(0, 50))
+    ```
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        """Create an archive rooted at a directory.
+
+        Args:
+            root: The directory of the archive. It is created on the first write.
+        """
+        self.root = Path(root)
+
+    def path_of(self, problem: Problem, seed: int) -> Path:
+        """The path a run of `problem` with `seed` is archived at."""
+        return (
+            self.root
+            / _partition("benchmark", problem.benchmark.name)
+            / _partition("optimizer", problem.optimizer.name)
+            / _partition("seed", seed)
+            / f"{problem.content_hash()}.parquet"
+        )
+
+    def write(
+        self,
+        results: pd.DataFrame | ResultStore,
+        *,
+        problem: Problem,
+        seed: int,
+    ) -> Path:
+        """Archive the results of a run, replacing any previous run of the same problem and seed.
+
+        Args:
+            results: The results of the run, either the frame returned by `run_glue` or
+                a [`ResultStore`][hpoglue.result_store.ResultStore].
+            problem: The problem that was run.
+            seed: The seed of the run.
+
+        Returns:
+            The path of the written file.
+        """
+        match results:
+            case ResultStore():
+                table = results.to_arrow(configs=True)
+            case pd.DataFrame():
+                df = results
+                if any(c in df.columns for c in _NESTED_COLUMNS):
+                    df = flatten_results(df)
+                table = pa.Table.from_pandas(df, preserve_index=False)
+            case _:
+                raise TypeError(f"Cannot archive results of type {type(results)}")
+
+        # NOTE: The partition keys are part of the path already.
+        table = table.select([c for c in table.column_names if c not in PARTITION_KEYS])
+        table = table.replace_schema_metadata(
+            {
+                **(table.schema.metadata or {}),
+                PROBLEM_METADATA_KEY: json.dumps(problem.to_dict(), default=str).encode(),
+                SEED_METADATA_KEY: str(seed).encode(),
+            }
+        )
+
+        path = self.path_of(problem, seed)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so that readers never see a partial file
+        tmp = path.with_name(f".{path.name}.tmp")
+        pq.write_table(table, tmp, row_group_size=ROW_GROUP_SIZE)
+        tmp.replace(path)
+        logger.debug(f"Archived {table.num_rows} results to {path}")
+        return path
+
+    def files(
+        self,
+        *,
+        benchmarks: Iterable[str] | None = None,
+        optimizers: Iterable[str] | None = None,
+        seeds: Iterable[int] | None = None,
+    ) -> list[ArchiveFile]:
+        """List the archived runs, only visiting the matching partitions.
+
+        Args:
+            benchmarks: The benchmarks to select. If `None`, all are selected.
+            optimizers: The optimizers to select. If `None`, all are selected.
+            seeds: The seeds to select. If `None`, all are selected.
+
+        Returns:
+            The selected runs.
+        """
+        wanted = [
+            None if benchmarks is None else {str(b) for b in benchmarks},
+            None if optimizers is None else {str(o) for o in optimizers},
+            None if seeds is None else {str(s) for s in seeds},
+        ]
+        return [
+            ArchiveFile(path=path, benchmark=benchmark, optimizer=optimizer, seed=int(seed))
+            for path, (benchmark, optimizer, seed) in self._walk(self.root, wanted, ())
+        ]
+
+    def read(
+        self,
+        *,
+        benchmarks: Iterable[str] | None = None,
+        optimizers: Iterable[str] | None = None,
+        seeds: Iterable[int] | None = None,
+        budget: tuple[float | None, float | None] | None = None,
+        budget_column: str = "budget_used_total",
+        columns: Iterable[str] | None = None,
+    ) -> pd.DataFrame:
+        """Read the results of the selected runs into a single frame.
+
+        Args:
+            benchmarks: The benchmarks to select. If `None`, all are selected.
+            optimizers: The optimizers to select. If `None`, all are selected.
+            seeds: The seeds to select. If `None`, all are selected.
+            budget: An inclusive `(low, high)` range of `budget_column` to select rows by.
+                Either bound may be `None`.
+            budget_column: The column the `budget` range applies to.
+            columns: The columns to read, the partition keys are always included.
+                If `None`, all columns are read.
+
+        Returns:
+            The results of all selected runs, with a `benchmark`, `optimizer` and
+            `seed` column.
+
+        Raises:
+            ValueError: If a `budget` is given and a selected run has no `budget_column`.
+        """
+        filters: list[tuple[str, str, Any]] = []
+        if budget is not None:
+            low, high = budget
+            if low is not None:
+                filters.append((budget_column, ">=", low))
+            if high is not None:
+                filters.append((budget_column, "<=", high))
+
+        if columns is not None:
+            columns = list(columns)
+            if filters and budget_column not in columns:
+                columns.append(budget_column)
+
+        frames = [
+            f.read(columns=columns, filters=filters or None)
+            for f in self.files(benchmarks=benchmarks, optimizers=optimizers, seeds=seeds)
+        ]
+        if not frames:
+            return pd.DataFrame(columns=[*(columns or []), *PARTITION_KEYS])
+
+        return pd.concat(frames, ignore_index=True)
+
+    def _walk(
+        self,
+        directory: Path,
+        wanted: list[set[str] | None],
+        keys: tuple[str, ...],
+    ) -> Iterator[tuple[Path, tuple[str, ...]]]:
+        level = len(keys)
+        if level == len(PARTITION_KEYS):
+            for path in sorted(directory.glob("*.parquet")):
+                yield path, keys
+            return
+
+        if not directory.is_dir():
+            return
+
+        prefix = f"{PARTITION_KEYS[level]}="
+        with os.scandir(directory) as entries:
+            names = sorted(e.name for e in entries if e.is_dir() and e.name.startswith(prefix))
+
+        for name in names:
+            value = unquote(name[len(prefix) :])
+            selected = wanted[level]
+            if selected is not None and value not in selected:
+                continue
+
+            yield from self._walk(directory / name, wanted, (*keys, value))
+
+
+def _partition(key: str, value: Any) -> str:
+    return f"{key}={quote(str(value), safe='')}"
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from hpoglue.benchmark import Benchmark
+    from hpoglue.query import Query
+    from hpoglue.result import Result
+
+logger = logging.getLogger(__name__)
+
+_Request: TypeAlias = tuple["Query", "Future[Result]"]
+
+
+class BatchingBenchmark:
+    """A front-end to a loaded benchmark that batches queries from concurrent callers.
+
+    When several runs are executed in threads against the same benchmark, each of them
+    queries it one at a time. A `BatchingBenchmark` collects the queries of all callers
+    over a short window, or until `max_batch_size` queries have arrived, and evaluates them
+    with a single call to the benchmark's `query_batch`. Each caller blocks until its own
+    result is available. If a batch fails, its queries are retried one at a time, so that
+    only the callers whose own query fails get the error.
+
+    ```python
+    with BatchingBenchmark(BENCHMARK_CACHE.load(desc), max_wait_s=0.002) as benchmark:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            histories = list(pool.map(
+                lambda seed: _run(problem, seed, loaded_benchmark=benchmark), range(8)
+            ))
+    ```
+    """
+
+    def __init__(
+        self,
+        benchmark: Benchmark,
+        *,
+        max_batch_size: int = 64,
+        max_wait_s: float = 0.001,
+        query_batch: Callable[[list[Query]], list[Result]] | None = None,
+    ) -> None:
+        """Wrap a loaded benchmark and start the dispatching thread.
+
+        Args:
+            benchmark: The loaded benchmark to query.
+
+            max_batch_size: The maximum number of queries to evaluate in one batch.
+
+            max_wait_s: How long to wait for more queries to arrive after the first
+                query of a batch, in seconds. This is the latency added to every query
+                in exchange for larger batches.
+
+            query_batch: The function to evaluate a batch of queries with.
+                Defaults to the benchmark's own `query_batch` if it has one, otherwise
+                the queries of a batch are evaluated one by one.
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"{max_batch_size=} must be >= 1")
+
+        if max_wait_s < 0:
+            raise ValueError(f"{max_wait_s=} must be >= 0")
+
+        self.benchmark = benchmark
+        self.desc = benchmark.desc
+        self.name = benchmark.name
+        self.config_space = benchmark.config_space
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_s
+
+        if query_batch is None:
+            query_batch = getattr(benchmark, "query_batch", None)
+        if query_batch is None:
+            query_batch = self._query_one_by_one
+        self.query_batch = query_batch
+
+        self.n_batches = 0
+        """The number of batches dispatched so far."""
+
+        self.n_queries = 0
+        """The number of queries dispatched so far."""
+
+        self._queue: queue.SimpleQueue[_Request | None] = queue.SimpleQueue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._dispatch_loop,
+            name=f"BatchingBenchmark-{self.name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def query(self, query: Query) -> Result:
+        """Query the benchmark, blocking until the batch containing the query is evaluated."""
+        future: Future[Result] = Future()
+        # NOTE: Checked under the lock, so no query can be put after the closing `None`.
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"BatchingBenchmark for {self.name} is closed.")
+
+            self._queue.put((query, future))
+
+        return future.result()
+
+    def trajectory(
+        self,
+        *,
+        query: Query,
+        frm: int | float | None = None,
+        to: int | float | None = None,
+    ) -> pd.DataFrame:
+        """Query the wrapped benchmark for a trajectory, without batching."""
+        return self.benchmark.trajectory(query=query, frm=frm, to=to)
+
+    @property
+    def mean_batch_size(self) -> float:
+        """The average number of queries per dispatched batch."""
+        return self.n_queries / self.n_batches if self.n_batches > 0 else 0.0
+
+    def close(self) -> None:
+        """Evaluate any outstanding queries and stop the dispatching thread."""
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._queue.put(None)
+
+        self._thread.join()
+
+    def __enter__(self) -> BatchingBenchmark:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _query_one_by_one(self, queries: list[Query]) -> list[Result]:
+        return [self.benchmark.query(query) for query in queries]
+
+    def _dispatch_loop(self) -> None:
+        closing = False
+        while not closing:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            batch = [request]
+            deadline = time.monotonic() + self.max_wait_s
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    request = (
+                        self._queue.get(timeout=timeout)
+                        if timeout > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+
+                if request is None:
+                    closing = True
+                    break
+
+                batch.append(request)
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list[_Request]) -> None:
+        queries = [query for query, _ in batch]
+        try:
+            results = self.query_batch(queries)
+            if len(results) != len(queries):
+                raise ValueError(
+                    f"`query_batch` of {self.name} returned {len(results)} results"
+                    f" for {len(queries)} queries."
+                )
+        except Exception as e:  # noqa: BLE001
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+
+            # NOTE: Only the callers whose own query fails should see an error.
+            logger.debug(
+                f"Batch of {len(queries)} queries to {self.name} failed, retrying them"
+                f" one at a time: {e}"
+            )
+            for request in batch:
+                self._dispatch([request])
+            return
+
+        self.n_batches += 1
+        self.n_queries += len(queries)
+        for (_, future), result in zip(batch, results, strict=True):
+            future.set_result(result)
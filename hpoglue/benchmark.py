@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import logging
+import threading
+from collections import OrderedDict
 from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
 from functools import partial
@@ -8,7 +10,7 @@ from typing import TYPE_CHECKING, Any, Protocol, TypeAlias
 
 import pandas as pd
 
-from hpoglue.config import Config
+from hpoglue.config import CompactConfig, Config, ConfigSchema
 from hpoglue.env import Env
 from hpoglue.optimizer import Optimizer
 from hpoglue.result import Result
@@ -137,6 +139,14 @@ class SurrogateBenchmark:
     If not provided, the query will be called repeatedly to generate this.
     """
 
+    query_batch: Callable[[list[Query]], list[Result]] | None = None
+    """A function to query the benchmark for many results at once, if one exists.
+
+    Surrogate models are usually much faster per query when predicting on a batch.
+    It should return the results in the same order as the queries.
+    This is used by [`BatchingBenchmark`][hpoglue.batching.BatchingBenchmark].
+    """
+
     def __post_init__(self) -> None:
         self.name = self.desc.name
 
@@ -150,36 +160,58 @@ class SurrogateBenchmark:
         if self.trajectory_f is not None:
             return self.trajectory_f(query=query, frm=frm, to=to)
 
-        assert isinstance(query.fidelity, tuple)
-        assert self.desc.fidelities is not None
-
-        fid_name, fid_value = query.fidelity
-        fid = self.desc.fidelities[fid_name]
-        frm = frm if frm is not None else fid.min
-        to = to if to is not None else fid_value
-
-        index: list[int] | list[float] = []
-        results: list[Result] = []
-        for val in iter(fid):
-            if val < frm:
-                continue
-
-            if val > to:
-                break
-
-            index.append(val)
-            result = self.query(query.with_fidelity((fid_name, val)))
-            results.append(result)
-
-        # Return in trajectory format
-        # fid_name    **results
-        # 0         | . | . | ...
-        # 1         | . | . | ...
-        # ...
-        return pd.DataFrame.from_records(
-            [result.values for result in results],
-            index=pd.Index(index, name=fid_name),
-        )
+        return _trajectory_by_querying(self, query=query, frm=frm, to=to)
+
+
+def _trajectory_by_querying(
+    benchmark: SurrogateBenchmark | FunctionalBenchmark,
+    *,
+    query: Query,
+    frm: int | float | None = None,
+    to: int | float | None = None,
+) -> pd.DataFrame:
+    assert isinstance(query.fidelity, tuple)
+    assert benchmark.desc.fidelities is not None
+
+    fid_name, fid_value = query.fidelity
+    fid = benchmark.desc.fidelities[fid_name]
+    frm = frm if frm is not None else fid.min
+    to = to if to is not None else fid_value
+
+    index: list[int] | list[float] = []
+    results: list[Result] = []
+    for val in iter(fid):
+        if val < frm:
+            continue
+
+        if val > to:
+            break
+
+        index.append(val)
+        result = benchmark.query(query.with_fidelity((fid_name, val)))
+        results.append(result)
+
+    # Return in trajectory format
+    # fid_name    **results
+    # 0         | . | . | ...
+    # 1         | . | . | ...
+    # ...
+    return pd.DataFrame.from_records(
+        [result.values for result in results],
+        index=pd.Index(index, name=fid_name),
+    )
+
+
+def _python_type(dtype: Any) -> type:
+    match dtype.kind:
+        case "f":
+            return float
+        case "i" | "u":
+            return int
+        case "b":
+            return bool
+        case _:
+            return object
 
 
 class TabularBenchmark:
@@ -313,15 +345,24 @@ class TabularBenchmark:
         table: pd.DataFrame,
         config_keys: list[str],
     ) -> list[Config]:
-        """Get the configuration space from the table."""
+        """Get the configuration space from the table.
+
+        All of the configs share a single [`ConfigSchema`][hpoglue.config.ConfigSchema]
+        and only store their values, which keeps large tables cheap to hold in memory.
+        """
+        configs = (
+            table[config_keys]
+            .drop_duplicates()
+            .sort_values(by=config_keys)  # Sorting to ensure table config order is consistent
+        )
+        schema = ConfigSchema(
+            names=tuple(config_keys),
+            types=tuple(_python_type(dtype) for dtype in configs.dtypes),
+        )
+        columns = [configs[key].tolist() for key in config_keys]
         return [
-            Config(config_id=str(i), values=config)  # enforcing str for id
-            for i, config in enumerate(
-                table[config_keys]
-                .drop_duplicates()
-                .sort_values(by=config_keys)  # Sorting to ensure table config order is consistent
-                .to_dict(orient="records"),
-            )
+            CompactConfig(str(i), values, schema=schema)  # enforcing str for id
+            for i, values in enumerate(zip(*columns, strict=True))
         ]
 
 
@@ -417,7 +458,9 @@ class TabularBenchmark:
         # 0         | . | . | ...
         # 1         | . | . | ...
         # ...
-        return self.table[self.result_keys].loc[query.config_id, frm:to].droplevel(0).sort_index()
+        # NOTE: `.loc[config_id, frm:to]` would slice the columns, not the fidelity level.
+        curve = self.table[self.result_keys].xs(query.config_id, level=0).sort_index()
+        return curve.loc[frm:to]
 
 
 class FunctionalBenchmark:
@@ -467,7 +510,7 @@ class FunctionalBenchmark:
         config_space: ConfigurationSpace | list[Config] | None = None,
         env: Env | None = None,
         mem_req_mb: int = 1024,
-        predefined_points: Mapping[str, tuple[Config, str]] | None = None,
+        predefined_points: Mapping[str, Config] | None = None,
         extra: Mapping[str, Any] = {},
     ):
         """Create a functional benchmark.
@@ -491,8 +534,7 @@ class FunctionalBenchmark:
 
             mem_req_mb: The memory requirement of the benchmark in mb.
 
-            predefined_points: Predefined points for the benchmark with their names and
-                                descriptions.
+            predefined_points: Predefined points for the benchmark, by name.
 
             extra: Extra information about the benchmark.
 
@@ -536,9 +578,131 @@ class FunctionalBenchmark:
         if self.trajectory_f is not None:
             return self.trajectory_f(query=query, frm=frm, to=to)
 
-        raise NotImplementedError("Trajectory not implemented for this benchmark.")
+        return _trajectory_by_querying(self, query=query, frm=frm, to=to)
 
 
 # NOTE(eddiebergman): Not using a base class as we really don't expect to need
 # more than just these two types of benchmarks.
 Benchmark: TypeAlias = TabularBenchmark | SurrogateBenchmark | FunctionalBenchmark
+
+
+class BenchmarkCache:
+    """A process-wide cache of loaded benchmarks.
+
+    Loading a benchmark, i.e. calling `desc.load(desc)`, can mean reading in a large table
+    or surrogate model. The cache keeps loaded benchmarks around so that repeated runs on
+    the same benchmark in one process, e.g. looping over seeds or optimizers, only load it
+    once.
+
+    Benchmarks are keyed by the name of their
+    [`BenchmarkDescription`][hpoglue.benchmark.BenchmarkDescription], which is unique,
+    and a cached benchmark is only reused if its description is equal to the requested one.
+
+    The cache uses a least-recently-used eviction policy, bounded by the sum of the
+    `mem_req_mb` of the cached benchmarks. A benchmark which alone exceeds the bound
+    is loaded but not cached.
+
+    Loading is only serialized per benchmark name, such that a slow load does not block
+    the loading of, or lookups for, other benchmarks.
+    """
+
+    def __init__(self, max_mem_mb: int | None = 8192) -> None:
+        """Create a benchmark cache.
+
+        Args:
+            max_mem_mb: The maximum total `mem_req_mb` of the cached benchmarks.
+                If `None`, the cache is unbounded.
+        """
+        self.max_mem_mb = max_mem_mb
+        self._entries: OrderedDict[str, tuple[BenchmarkDescription, Benchmark]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks: dict[str, threading.Lock] = {}
+
+    @property
+    def mem_mb(self) -> int:
+        """The total `mem_req_mb` of the currently cached benchmarks."""
+        with self._lock:
+            return sum(desc.mem_req_mb for desc, _ in self._entries.values())
+
+    def load(self, desc: BenchmarkDescription) -> Benchmark:
+        """Get the loaded benchmark for a description, loading it if not cached.
+
+        Args:
+            desc: The description of the benchmark.
+
+        Returns:
+            The loaded benchmark.
+        """
+        with self._lock:
+            benchmark = self._get(desc)
+            if benchmark is not None:
+                return benchmark
+
+            load_lock = self._load_locks.setdefault(desc.name, threading.Lock())
+
+        with load_lock:
+            # NOTE: Another thread may have loaded it while we waited for the lock.
+            with self._lock:
+                benchmark = self._get(desc)
+            if benchmark is not None:
+                return benchmark
+
+            benchmark = desc.load(desc)
+            with self._lock:
+                self._put(desc, benchmark)
+
+        return benchmark
+
+    def evict(self, name: str) -> None:
+        """Remove the benchmark with the given name from the cache, if present."""
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def clear(self) -> None:
+        """Remove all benchmarks from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, desc: BenchmarkDescription) -> Benchmark | None:
+        entry = self._entries.get(desc.name)
+        if entry is None:
+            return None
+
+        cached_desc, benchmark = entry
+        if cached_desc is desc or cached_desc == desc:
+            self._entries.move_to_end(desc.name)
+            return benchmark
+
+        logger.debug(f"Description of benchmark {desc.name} changed, reloading it.")
+        del self._entries[desc.name]
+        return None
+
+    def _put(self, desc: BenchmarkDescription, benchmark: Benchmark) -> None:
+        if self.max_mem_mb is not None:
+            if desc.mem_req_mb > self.max_mem_mb:
+                logger.debug(
+                    f"Not caching benchmark {desc.name} as its {desc.mem_req_mb=}"
+                    f" exceeds the cache's {self.max_mem_mb=}."
+                )
+                return
+
+            self._evict_until(self.max_mem_mb - desc.mem_req_mb)
+
+        self._entries[desc.name] = (desc, benchmark)
+
+    def _evict_until(self, mem_mb: int) -> None:
+        while self._entries and self.mem_mb > mem_mb:
+            name, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted benchmark {name} from the benchmark cache.")
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+BENCHMARK_CACHE = BenchmarkCache()
+"""The process-wide cache of loaded benchmarks used by `run_glue(cache_benchmark=True)`."""
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from hpoglue.measure import Measure
+    from hpoglue.problem import Problem
+    from hpoglue.query import Query
+    from hpoglue.result import Result
+
+logger = logging.getLogger(__name__)
+
+
+class Callback:
+    """Hooks into the run loop, e.g. to monitor a run while it is going.
+
+    Subclass it and override any of the hooks, all of which do nothing by default.
+    Only the overridden hooks of a callback are called by the run loop, so a run without
+    callbacks, or with callbacks only overriding some of the hooks, does no extra work
+    for the others.
+
+    Hooks are called in the loop itself, they should return quickly and must not
+    modify the queries and results they are given.
+
+    ```python
+    class PrintIncumbent(Callback):
+        def on_result(self, result: Result) -> None:
+            print(result.budget_used_total, result.values)
+
+    run_glue(optimizer=..., benchmark=..., callbacks=[PrintIncumbent()])
+    ```
+    """
+
+    def on_start(self, *, problem: Problem, seed: int, run_name: str) -> None:
+        """Called once before the first query of a run."""
+
+    def on_ask(self, query: Query) -> None:
+        """Called with every query the optimizer asks for, before it is evaluated."""
+
+    def on_result(self, result: Result) -> None:
+        """Called with every result, after it was told to the optimizer."""
+
+    def on_budget_exhausted(self, *, used_budget: float, budget_total: float) -> None:
+        """Called once when the run stops because its budget is used up."""
+
+    def on_error(self, error: Exception, *, query: Query | None) -> None:
+        """Called when the run loop fails, with the query being evaluated, if any."""
+
+
+def bound_hooks(callbacks: Sequence[Callback], name: str) -> list[Callable[..., None]]:
+    """Get the bound hook `name` of every callback that overrides it.
+
+    Args:
+        callbacks: The callbacks.
+        name: The name of a hook of [`Callback`][hpoglue.callbacks.Callback].
+
+    Returns:
+        The hooks to call, empty if no callback overrides the hook.
+    """
+    default = getattr(Callback, name)
+    return [getattr(cb, name) for cb in callbacks if getattr(type(cb), name) is not default]
+
+
+class LiveMetricsCallback(Callback):
+    """Keeps a json file with the live metrics of a run up to date.
+
+    The file holds the progress of the budget, the throughput in results per second and
+    the best value seen so far of every objective of the run. It is rewritten at most
+    once every `interval_s` seconds, and once more when the run ends, by writing to a
+    temporary file and replacing the previous one, so readers never see a partial file.
+
+    Between writes, a result only costs comparing its objectives to the incumbents.
+
+    ```python
+    run_glue(..., callbacks=[LiveMetricsCallback("live.json", interval_s=5)])
+    ```
+    """
+
+    def __init__(self, path: str | Path, *, interval_s: float = 1.0) -> None:
+        """Create the callback.
+
+        Args:
+            path: The path of the json file to write.
+            interval_s: The minimum number of seconds between two writes.
+        """
+        self.path = Path(path)
+        self.interval_s = interval_s
+
+        self._metrics: dict[str, Any] = {}
+        self._objectives: list[tuple[str, bool]] = []
+        self._best: dict[str, float] = {}
+        self._budget_total: float | None = None
+        self._n_results = 0
+        self._budget_used = 0.0
+        self._started = 0.0
+        self._last_write = -np.inf
+
+    def on_start(self, *, problem: Problem, seed: int, run_name: str) -> None:  # noqa: D102
+        objectives: Mapping[str, Measure]
+        match problem.objectives:
+            case (name, measure):
+                objectives = {name: measure}
+            case Mapping():
+                objectives = problem.objectives
+            case _:
+                raise TypeError("Objectives must be a tuple (name, measure) or a mapping")
+
+        self._objectives = [(name, measure.minimize) for name, measure in objectives.items()]
+        self._best = {}
+        self._budget_total = getattr(problem.budget, "total", None)
+        self._n_results = 0
+        self._budget_used = 0.0
+        self._started = time.monotonic()
+        self._last_write = -np.inf
+        self._metrics = {
+            "run_name": run_name,
+            "problem": problem.name,
+            "seed": seed,
+            "status": "running",
+        }
+        self._write(self._started)
+
+    def on_result(self, result: Result) -> None:  # noqa: D102
+        self._n_results += 1
+        self._budget_used = result.budget_used_total
+        for name, minimize in self._objectives:
+            value = result.values.get(name)
+            # NOTE: A failed trial, e.g. `NaN`, never becomes the incumbent.
+            if value is None or not np.isfinite(value):
+                continue
+
+            best = self._best.get(name)
+            if best is None or (value < best if minimize else value > best):
+                self._best[name] = value
+
+        now = time.monotonic()
+        if now - self._last_write >= self.interval_s:
+            self._write(now)
+
+    def on_budget_exhausted(self, *, used_budget: float, budget_total: float) -> None:  # noqa: D102
+        self._budget_used = min(used_budget, budget_total)
+        self._budget_total = budget_total
+        self._metrics["status"] = "finished"
+        self._write(time.monotonic())
+
+    def on_error(self, error: Exception, *, query: Query | None) -> None:  # noqa: D102, ARG002
+        self._metrics["status"] = "failed"
+        self._metrics["error"] = repr(error)
+        self._write(time.monotonic())
+
+    def _write(self, now: float) -> None:
+        elapsed = now - self._started
+        metrics = {
+            **self._metrics,
+            "n_results": self._n_results,
+            "budget_used": self._budget_used,
+            "budget_total": self._budget_total,
+            "progress": (
+                self._budget_used / self._budget_total if self._budget_total else None
+            ),
+            "elapsed_s": elapsed,
+            "results_per_s": self._n_results / elapsed if elapsed > 0 else None,
+            "incumbent": {name: float(value) for name, value in self._best.items()},
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            tmp.write_text(json.dumps(metrics, default=str))
+            tmp.replace(self.path)
+        except OSError as e:
+            # NOTE: Monitoring should never bring down the run itself.
+            logger.warning(f"Could not write live metrics to {self.path}: {e}")
+
+        self._last_write = now
@@ -1,16 +1,41 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
-from dataclasses import dataclass
-from typing import Any
+import contextlib
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
+from ConfigSpace.hyperparameters import Constant, FloatHyperparameter, IntegerHyperparameter
+
+from hpoglue.hashing import content_hash
+
+if TYPE_CHECKING:
+    from ConfigSpace import ConfigurationSpace
 
 PRECISION = 12
 """The default precision to use for floats in configurations."""
 
 
-@dataclass
+class _RoundedTuple(tuple):
+    """The rounded values of a config, which only computes its hash once."""
+
+    _hash: int
+
+    def __new__(cls, values: Any) -> _RoundedTuple:
+        self = super().__new__(cls, values)
+        self._hash = tuple.__hash__(self)
+        return self
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # NOTE: The hash of strings differs between processes, recompute it on unpickling.
+        return (_RoundedTuple, (tuple(self),))
+
+
+@dataclass(slots=True)
 class Config(Mapping[str, Any]):
     """A configuration to evaluate."""
 
@@ -26,6 +51,12 @@ class Config(Mapping[str, Any]):
     description: str | None = None
     """A description of the configuration."""
 
+    _rounded: tuple[Any, dict[int, tuple], dict[int, str]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    """Cache of the rounded tuples of `values` and their content hashes, per precision,
+    along with the values they were computed from.
+    """
 
     def to_dict(self) -> dict[str, Any]:
         """Convert the configuration values to a dictionary.
@@ -40,6 +71,9 @@ class Config(Mapping[str, Any]):
     def to_tuple(self, precision: int | None = None) -> tuple:
         """Convert the configuration values to a tuple with specified precision.
 
+        The tuple, and its hash, are computed once per precision and cached until
+        `values` is replaced.
+
         Args:
             precision: The precision to round the float values to.
                 If `None`, the default
@@ -51,8 +85,62 @@ class Config(Mapping[str, Any]):
         if precision is None:
             precision = PRECISION
 
+        cache = self._cache()
+        if (rounded := cache[1].get(precision)) is not None:
+            return rounded
+
+        rounded = _RoundedTuple(self._rounded_values(precision))
+        cache[1][precision] = rounded
+        return rounded
+
+    def content_hash(self, precision: int | None = None) -> str:
+        """A stable hash of the configuration values, independent of the `config_id`.
+
+        Two configs with the same values, once rounded to `precision`, have the same hash,
+        in any process. The hash is computed once per precision and cached until `values`
+        is replaced.
+
+        Args:
+            precision: The precision to round the float values to.
+                If `None`, the default
+                [`PRECISION`][hpoglue.config.PRECISION] is used.
+                Use the `precision` of the [`Problem`][hpoglue.problem.Problem]
+                to match how continuations identify configs.
+
+        Returns:
+            The hash as a hex string.
+        """
+        if precision is None:
+            precision = PRECISION
+
+        cache = self._cache()
+        if (h := cache[2].get(precision)) is not None:
+            return h
+
+        h = content_hash(sorted(zip(self, self.to_tuple(precision), strict=True)))
+        cache[2][precision] = h
+        return h
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # NOTE: The cache of rounded tuples is rebuilt in the unpickling process.
+        return (type(self), (self.config_id, self.values, self.description))
+
+    def _cache(self) -> tuple[Any, dict[int, tuple], dict[int, str]]:
+        # NOTE: Replacing the values invalidates the cache. Editing the `values`
+        # dictionary in place is not detected.
+        source = self._rounding_source()
+        cache = self._rounded
+        if cache is None or cache[0] is not source:
+            cache = (source, {}, {})
+            self._rounded = cache
+        return cache
+
+    def _rounding_source(self) -> Any:
+        return self.values
+
+    def _rounded_values(self, precision: int) -> Iterator[Any]:
         assert self.values is not None
-        return tuple(self.set_precision(self.values, precision).values())
+        return iter(self.set_precision(self.values, precision).values())
 
     @staticmethod
     def set_precision(values: dict, precision: int) -> dict[str, Any]:
@@ -78,4 +166,281 @@ class Config(Mapping[str, Any]):
 
     def __len__(self) -> int:
         assert self.values is not None
-        return len(self.values)
\ No newline at end of file
+        return len(self.values)
+
+class _Missing:
+    """Marks a hyperparameter that is not part of a config, e.g. an inactive one."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+    def __reduce__(self) -> str:
+        return "MISSING"
+
+
+MISSING = _Missing()
+"""The value stored in a [`CompactConfig`][hpoglue.config.CompactConfig] for a
+hyperparameter which is not set in it, e.g. an inactive conditional hyperparameter."""
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigSchema:
+    """The names, order and types of the hyperparameters shared by many configs.
+
+    A schema is created once per config space and shared by all of the
+    [`CompactConfig`][hpoglue.config.CompactConfig]s created from it, which then
+    only need to store their values in a tuple, in the order of `names`.
+
+    ```python
+    schema = ConfigSchema.from_configspace(config_space)
+    config = schema.make("1", dict(config_space.sample_configuration()))
+    ```
+    """
+
+    names: tuple[str, ...]
+    """The names of the hyperparameters, in the order their values are stored."""
+
+    types: tuple[type, ...] | None = None
+    """The python types of the hyperparameter values, if known.
+
+    `object` is used where the type can vary, e.g. for categorical hyperparameters.
+    """
+
+    index: dict[str, int] = field(init=False, repr=False, compare=False)
+    """The position of each hyperparameter in `names`."""
+
+    def __post_init__(self) -> None:
+        index = {name: i for i, name in enumerate(self.names)}
+        if len(index) != len(self.names):
+            raise ValueError(f"Duplicate hyperparameter names in {self.names=}")
+
+        if self.types is not None and len(self.types) != len(self.names):
+            raise ValueError(
+                f"Got {len(self.types)} types for {len(self.names)} hyperparameters."
+            )
+
+        object.__setattr__(self, "index", index)
+
+    @classmethod
+    def from_configspace(cls, config_space: ConfigurationSpace) -> ConfigSchema:
+        """Create the schema of a `ConfigurationSpace`.
+
+        Args:
+            config_space: The configuration space.
+
+        Returns:
+            The schema, with hyperparameters in the order of the space.
+        """
+        names: list[str] = []
+        types: list[type] = []
+        for hp in config_space.values():
+            names.append(hp.name)
+            match hp:
+                case FloatHyperparameter():
+                    types.append(float)
+                case IntegerHyperparameter():
+                    types.append(int)
+                case Constant():
+                    types.append(type(hp.value))
+                case _:
+                    types.append(object)
+
+        return cls(names=tuple(names), types=tuple(types))
+
+    @classmethod
+    def from_values(cls, values: Mapping[str, Any]) -> ConfigSchema:
+        """Create a schema from the keys and value types of a single config."""
+        return cls(names=tuple(values), types=tuple(type(v) for v in values.values()))
+
+    def to_array(self, values: Mapping[str, Any]) -> tuple[Any, ...]:
+        """Lay out the values of a config in the order of the schema.
+
+        Args:
+            values: The config values. Hyperparameters of the schema that are not
+                present are stored as [`MISSING`][hpoglue.config.MISSING].
+
+        Returns:
+            The values in the order of `names`.
+        """
+        if len(values) > len(self.names) or any(k not in self.index for k in values):
+            unknown = set(values).difference(self.index)
+            raise KeyError(f"Hyperparameters {unknown} are not part of the schema {self.names}")
+
+        get = values.get
+        return tuple(get(name, MISSING) for name in self.names)
+
+    def make(
+        self,
+        config_id: str,
+        values: Mapping[str, Any] | Sequence[Any],
+        description: str | None = None,
+    ) -> CompactConfig:
+        """Create a config sharing this schema.
+
+        Args:
+            config_id: The unique identifier of the config.
+            values: The config values, either as a mapping or as a sequence
+                already in the order of `names`.
+            description: A description of the configuration.
+
+        Returns:
+            The compact config.
+        """
+        return CompactConfig(config_id, values, description, schema=self)
+
+
+class CompactConfig(Config):
+    """A [`Config`][hpoglue.config.Config] storing only its values, laid out by a
+    shared [`ConfigSchema`][hpoglue.config.ConfigSchema].
+
+    It behaves as a `Mapping[str, Any]` of the hyperparameter values, exactly as a
+    `Config`. The `values` dictionary is only built on its first access and then kept,
+    so configs that are never evaluated, e.g. the rows of a large table, stay compact.
+    Editing `values` in place is not supported, assign new values instead.
+
+    `dataclasses.replace()` works as for a `Config`, but as it can not pass on the
+    schema, the new config gets its own. Use
+    [`with_values()`][hpoglue.config.CompactConfig.with_values] to keep sharing it.
+    """
+
+    __slots__ = ("_array", "schema")
+
+    _array: tuple[Any, ...]
+    schema: ConfigSchema
+
+    def __init__(
+        self,
+        config_id: str,
+        values: Mapping[str, Any] | Sequence[Any],
+        description: str | None = None,
+        *,
+        schema: ConfigSchema | None = None,
+    ) -> None:
+        """Create a compact config.
+
+        Args:
+            config_id: The unique identifier of the config.
+            values: The config values, either as a mapping or as a sequence
+                already in the order of `schema.names`.
+            description: A description of the configuration.
+            schema: The schema shared by the configs of the same space. If `None`,
+                it is created from `values`, which must then be a mapping.
+        """
+        if schema is None:
+            if not isinstance(values, Mapping):
+                raise TypeError("Values given as a sequence require a `schema`.")
+            schema = ConfigSchema.from_values(values)
+
+        self.config_id = config_id
+        self.description = description
+        self.schema = schema
+        self._rounded = None
+        self._set_array(values)
+
+    def with_values(self, values: Mapping[str, Any] | Sequence[Any]) -> CompactConfig:
+        """A copy of this config with other values, sharing its schema."""
+        return CompactConfig(self.config_id, values, self.description, schema=self.schema)
+
+    def _set_array(self, values: Mapping[str, Any] | Sequence[Any]) -> None:
+        match values:
+            case Mapping():
+                array = self.schema.to_array(values)
+            case Sequence() if not isinstance(values, str):
+                array = tuple(values)
+                if len(array) != len(self.schema.names):
+                    raise ValueError(
+                        f"Got {len(array)} values for {len(self.schema.names)} hyperparameters."
+                    )
+            case _:
+                raise TypeError(f"Expected a Mapping or a Sequence of values, got {type(values)}")
+
+        object.__setattr__(self, "_array", array)
+        # NOTE: Unset the `values` slot, it is rebuilt from the array on its next access.
+        with contextlib.suppress(AttributeError):
+            object.__delattr__(self, "values")
+
+    def __getattr__(self, name: str) -> dict[str, Any]:
+        # NOTE: Only called while the `values` slot is unset, afterwards it is a plain
+        # attribute as for a `Config`.
+        if name != "values":
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        values = {
+            name: v
+            for name, v in zip(self.schema.names, self._array, strict=True)
+            if v is not MISSING
+        }
+        object.__setattr__(self, "values", values)
+        return values
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "values":
+            if value is None:
+                raise TypeError("The values of a CompactConfig can not be None.")
+            self._set_array(value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def _rounding_source(self) -> Any:
+        return self._array
+
+    def _rounded_values(self, precision: int) -> Iterator[Any]:
+        return (
+            np.round(v, precision) if isinstance(v, float) else v
+            for v in self._array
+            if v is not MISSING
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        v = self._array[self.schema.index[key]]
+        if v is MISSING:
+            raise KeyError(key)
+        return v
+
+    def __contains__(self, key: object) -> bool:
+        i = self.schema.index.get(key)  # type: ignore[call-overload]
+        return i is not None and self._array[i] is not MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return (
+            name
+            for name, v in zip(self.schema.names, self._array, strict=True)
+            if v is not MISSING
+        )
+
+    def __len__(self) -> int:
+        return sum(v is not MISSING for v in self._array)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Config):
+            return NotImplemented
+
+        # NOTE: Compared as mappings, such that comparing does not build `values`.
+        other_values = dict(other) if isinstance(other, CompactConfig) else other.values
+        return (self.config_id, dict(self), self.description) == (
+            other.config_id,
+            other_values,
+            other.description,
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(config_id={self.config_id!r}, values={self.values!r},"
+            f" description={self.description!r})"
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_make_compact, (self.config_id, self._array, self.description, self.schema))
+
+
+def _make_compact(
+    config_id: str,
+    array: tuple[Any, ...],
+    description: str | None,
+    schema: ConfigSchema,
+) -> CompactConfig:
+    return CompactConfig(config_id, array, description, schema=schema)
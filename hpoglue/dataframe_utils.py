@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import logging
 import warnings
-from collections.abc import Container
-from typing import TypeAlias, TypeVar
+from collections.abc import Container, Mapping, Sequence
+from typing import Any, TypeAlias, TypeVar
 
 import numpy as np
 import pandas as pd
@@ -13,6 +13,10 @@ logger = logging.getLogger(__name__)
 DataContainer: TypeAlias = np.ndarray | (pd.DataFrame | pd.Series)
 D = TypeVar("D", bound=DataContainer)
 
+RUN_KEYS = ("benchmark", "optimizer", "optimizer_hps", "seed")
+"""The columns of a results frame that identify a single run, see
+[`inc_traces()`][hpoglue.dataframe_utils.inc_traces]."""
+
 
 def _inc_trace(
     df: pd.DataFrame,
@@ -24,38 +28,240 @@ def _inc_trace(
     test_y_col: str,
 ) -> pd.Series:
     # We now have each individual std group to plot, i.e. the fold
-    _start = df[x_start_col].min()
-    _x = (df[x_col] - _start).dt.total_seconds()
-
-    ind = pd.Index(_x, name="time (s)")
-    _df = (
-        df[[y_col, test_y_col]]
-        .rename(columns={y_col: "y", test_y_col: "test_y"})
-        .set_index(ind)
-        .sort_index()
-        .dropna()
-    )
-
-    # Transform everything
-    match minimize:
-        case True:
-            _df["cumulative"] = _df["y"].cummin()
-        case False:
-            _df["cumulative"] = _df["y"].cummax()
-
-    _df = _df.drop_duplicates(subset="cumulative", keep="first").drop(
-        columns="cumulative",
+    traces = inc_traces(
+        df,
+        y_col=y_col,
+        x_col=x_col,
+        test_y_col=test_y_col,
+        minimize=minimize,
+        by=(),
+        x_start_col=x_start_col,
     )
-
     return pd.Series(
         # We do this concat operation so that data is contiguous for later opertions
-        data=np.concatenate(
-            [_df["y"].to_numpy(), _df["test_y"].to_numpy()],
+        data=np.concatenate([traces["y"].to_numpy(), traces["test_y"].to_numpy()]),
+        index=pd.MultiIndex.from_product(
+            [["val", "test"], pd.Index(traces[x_col], name="time (s)")]
         ),
-        index=pd.MultiIndex.from_product([["val", "test"], _df.index]),
     )
 
 
+def _fidelity_to_dict(fidelity: Any) -> dict[str, Any]:
+    match fidelity:
+        case None:
+            return {}
+        case (name, value):
+            return {name: value}
+        case Mapping():
+            return dict(fidelity)
+        case _:
+            raise TypeError(f"Unexpected fidelity type {type(fidelity)}")
+
+
+def flatten_results(df: pd.DataFrame) -> pd.DataFrame:
+    """Flatten the nested columns of a results frame, as returned by `run_glue`.
+
+    * `config` is expanded to a `config.<hyperparameter>` column per hyperparameter.
+    * `results` is expanded to a `results.<key>` column per value of the benchmark.
+    * `fidelity` is expanded to a `fidelity.<name>` column per fidelity.
+
+    Any other column is kept as is, in the same order.
+
+    Args:
+        df: The frame to flatten.
+
+    Returns:
+        The flattened frame.
+    """
+    nested = {
+        "config": lambda v: v if v is not None else {},
+        "results": lambda v: v if v is not None else {},
+        "fidelity": _fidelity_to_dict,
+    }
+    parts: list[pd.DataFrame] = []
+    for col in df.columns:
+        if col not in nested:
+            parts.append(df[[col]])
+            continue
+
+        expanded = pd.DataFrame.from_records(
+            [nested[col](v) for v in df[col]],
+            index=df.index,
+        )
+        parts.append(expanded.add_prefix(f"{col}."))
+
+    return pd.concat(parts, axis=1)
+
+
+METADATA_COLUMNS = (
+    "optimizer",
+    "optimizer_hps",
+    "benchmark",
+    "objectives",
+    "fidelities",
+    "costs",
+)
+"""The columns of a `run_glue` frame describing the run, repeated on every row."""
+
+
+def compact_results(df: pd.DataFrame) -> pd.DataFrame:
+    """Get a compact, flat version of a results frame, as returned by `run_glue`.
+
+    * The nested `config`, `results` and `fidelity` columns are flattened with
+        [`flatten_results()`][hpoglue.dataframe_utils.flatten_results], giving a typed
+        `config.<hyperparameter>`, `results.<key>` and `fidelity.<name>` column for each.
+    * The [`METADATA_COLUMNS`][hpoglue.dataframe_utils.METADATA_COLUMNS] and string
+        valued `config.<hyperparameter>` columns are stored as categoricals. Lists of
+        names, such as multiple objectives, are joined by `","`.
+
+    Numeric columns keep their dtype, in particular no float precision is lost,
+    unlike with [`reduce_dtypes()`][hpoglue.dataframe_utils.reduce_dtypes].
+
+    Args:
+        df: The results frame.
+
+    Returns:
+        The compact frame.
+    """
+    df = flatten_results(df).infer_objects()
+    columns = {}
+    for col in df.columns:
+        if col in METADATA_COLUMNS:
+            values = [",".join(v) if isinstance(v, list | tuple) else v for v in df[col]]
+            columns[col] = pd.Categorical(values)
+        elif col.startswith("config.") and df[col].dtype == object:
+            if all(isinstance(v, str) for v in df[col] if v is not None):
+                columns[col] = df[col].astype("category")
+
+    return df.assign(**columns)
+
+
+def result_column(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Get the values of a benchmark result key from a results frame.
+
+    Works for both the nested frame returned by `run_glue`, where every row holds a
+    `results` dictionary, and for flat frames with a `results.<name>` column, such as
+    from [`flatten_results()`][hpoglue.dataframe_utils.flatten_results], or a plain
+    `<name>` column.
+
+    Args:
+        df: The results frame.
+        name: The key of the value in the results of the benchmark.
+
+    Returns:
+        The values, as a numpy array.
+    """
+    for column in (f"results.{name}", name):
+        if column in df.columns:
+            values: np.ndarray = df[column].to_numpy()
+            return values
+
+    if "results" in df.columns:
+        return np.array([r.get(name, np.nan) for r in df["results"]])
+
+    raise KeyError(f"No column for {name!r} in the results frame, got {list(df.columns)}")
+
+
+def inc_traces(
+    df: pd.DataFrame,
+    *,
+    y_col: str,
+    x_col: str = "budget_used_total",
+    test_y_col: str | None = None,
+    minimize: bool = True,
+    by: Sequence[str] | None = None,
+    x_start_col: str | None = None,
+) -> pd.DataFrame:
+    """Compute the incumbent trace of every run in a results frame at once.
+
+    A row is part of the trace of its run if its `y_col` value strictly improves on
+    every earlier row of the same run, ordered by `x_col`. Rows where `y_col` or
+    `test_y_col` is missing are dropped, as are rows without an `x_col` value.
+
+    All runs are handled in a single pass: the rows are sorted by run and `x_col`, and
+    the incumbents are found with one segmented cumulative minimum over the sorted arrays,
+    instead of grouping and processing the runs one by one.
+
+    If `x_col` holds datetimes, it is converted to the seconds elapsed since the
+    earliest `x_start_col` value (`x_col` itself if not given) of each run.
+
+    ```python
+    df = pd.concat([run_glue(...) for seed in range(10)])
+    traces = inc_traces(df, y_col="value", test_y_col="test_value")
+    ```
+
+    Args:
+        df: The results frame, nested as returned by `run_glue` or flat, see
+            [`result_column()`][hpoglue.dataframe_utils.result_column].
+        y_col: The result key the incumbent is chosen by.
+        x_col: The column to order the results of a run by.
+        test_y_col: An optional result key, e.g. a test score, to report alongside
+            the incumbents.
+        minimize: Whether lower values of `y_col` are better.
+        by: The columns identifying a run. If `None`, the columns of
+            [`RUN_KEYS`][hpoglue.dataframe_utils.RUN_KEYS] present in `df` are used.
+        x_start_col: The column holding the start time of the results, if `x_col`
+            holds datetimes.
+
+    Returns:
+        A long-format frame with a row per incumbent, sorted by run and `x_col`, with
+        the `by` columns, `x_col`, `y` and, if `test_y_col` is given, `test_y`.
+    """
+    by = [c for c in RUN_KEYS if c in df.columns] if by is None else list(by)
+
+    y = result_column(df, y_col).astype(np.float64)
+    test_y = None if test_y_col is None else result_column(df, test_y_col).astype(np.float64)
+    x = result_column(df, x_col)
+    x_is_datetime = np.issubdtype(x.dtype, np.datetime64)
+
+    if by:
+        group = df.groupby(by, sort=True, observed=True, dropna=False).ngroup().to_numpy()
+    else:
+        group = np.zeros(len(df), dtype=np.int64)
+
+    # NOTE: A run starts at its earliest row, including the rows dropped below.
+    if x_is_datetime:
+        starts = x if x_start_col is None else result_column(df, x_start_col)
+        starts = starts.astype("datetime64[ns]")
+        has_start = ~pd.isna(starts)
+        run_starts = np.full(group.max(initial=-1) + 1, np.iinfo(np.int64).max)
+        np.minimum.at(run_starts, group[has_start], starts[has_start].astype(np.int64))
+
+    keep = ~np.isnan(y) & ~pd.isna(x)
+    if test_y is not None:
+        keep &= ~np.isnan(test_y)
+
+    rows = np.flatnonzero(keep)
+    order = rows[np.lexsort((x[rows], group[rows]))]
+    group = group[order]
+    y = y[order]
+    x = x[order]
+    if len(order) == 0:
+        columns = [*by, x_col, "y"] if test_y is None else [*by, x_col, "y", "test_y"]
+        return pd.DataFrame(columns=columns)
+
+    if x_is_datetime:
+        x = (x.astype("datetime64[ns]").astype(np.int64) - run_starts[group]) / 1e9
+
+    # NOTE: Rank the values so that every run can be offset into its own range of
+    # integers, with later runs in lower ranges. A single cumulative minimum then
+    # restarts at the first row of every run, without comparing floats across runs.
+    _, rank = np.unique(y if minimize else -y, return_inverse=True)
+    n_ranks = rank.max(initial=0) + 1
+    key = (group.max(initial=0) - group) * n_ranks + rank
+    cummin = np.minimum.accumulate(key)
+    improved = np.r_[True, cummin[1:] < cummin[:-1]]
+
+    incumbents = order[improved]
+    traces = df.iloc[incumbents][by].reset_index(drop=True)
+    traces[x_col] = x[improved]
+    traces["y"] = y[improved]
+    if test_y is not None:
+        traces["test_y"] = test_y[incumbents]
+
+    return traces
+
+
 def reduce_floating_precision(x: D) -> D:
     """Reduce the floating point precision of the data.
 
@@ -182,3 +388,464 @@ def reduce_dtypes(
         x[cat_cols] = x[cat_cols].astype("category")
 
     return x
+
+
+def make_grid(
+    traces: pd.DataFrame,
+    grid: int | np.ndarray,
+    *,
+    x_col: str = "budget_used_total",
+) -> np.ndarray:
+    """The grid to resample traces onto with
+    [`align_to_grid()`][hpoglue.dataframe_utils.align_to_grid].
+
+    Args:
+        traces: The traces, as returned by
+            [`inc_traces()`][hpoglue.dataframe_utils.inc_traces].
+        grid: The points of the grid, in increasing order, or the number of evenly spaced
+            points between the lowest and highest `x_col` value of the traces.
+        x_col: The column of `traces` the grid applies to.
+
+    Returns:
+        The points of the grid as a float array.
+    """
+    if isinstance(grid, int):
+        x = traces[x_col].to_numpy(dtype=np.float64)
+        if len(x) == 0:
+            return np.zeros(grid)
+
+        return np.linspace(x.min(), x.max(), grid)
+
+    return np.asarray(grid, dtype=np.float64)
+
+
+def align_to_grid(
+    traces: pd.DataFrame,
+    grid: np.ndarray,
+    *,
+    x_col: str = "budget_used_total",
+    y_col: str = "y",
+    by: Sequence[str] | None = None,
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """Resample the incumbent traces of many runs onto a common grid.
+
+    The value of a run at a grid point is the value of its last incumbent at or before
+    that point, or `NaN` if the run has no incumbent yet. All runs are aligned with a
+    single `searchsorted` over the sorted traces, without looping over the runs.
+
+    Args:
+        traces: The traces, as returned by
+            [`inc_traces()`][hpoglue.dataframe_utils.inc_traces].
+        grid: The points to resample the traces at, in increasing order.
+        x_col: The column of `traces` the grid applies to.
+        y_col: The column of `traces` holding the values to resample.
+        by: The columns identifying a run. If `None`, the columns of
+            [`RUN_KEYS`][hpoglue.dataframe_utils.RUN_KEYS] present in `traces` are used.
+
+    Returns:
+        A frame with the `by` columns of every run, and an array of shape
+        `(n_runs, len(grid))` with the resampled values of the runs in the same order.
+    """
+    by = [c for c in RUN_KEYS if c in traces.columns] if by is None else list(by)
+    grid = np.asarray(grid, dtype=np.float64)
+    if np.any(np.diff(grid) < 0):
+        raise ValueError("The grid must be sorted in increasing order.")
+
+    if by:
+        run = traces.groupby(by, sort=True, observed=True, dropna=False).ngroup().to_numpy()
+    else:
+        run = np.zeros(len(traces), dtype=np.int64)
+
+    x = traces[x_col].to_numpy(dtype=np.float64)
+    order = np.lexsort((x, run))
+    run, x = run[order], x[order]
+    y = traces[y_col].to_numpy(dtype=np.float64)[order]
+
+    n_runs = run.max(initial=-1) + 1
+    run_bounds = np.searchsorted(run, np.arange(n_runs))
+    runs = traces.iloc[order[run_bounds]][by].reset_index(drop=True)
+
+    # NOTE: Rank the trace and grid points together so that every run can be offset
+    # into its own range of integers. One `searchsorted` of every (run, grid point)
+    # pair into the offset trace points then finds the last incumbent of each pair.
+    points, rank = np.unique(np.concatenate([x, grid]), return_inverse=True)
+    x_rank, grid_rank = rank[: len(x)], rank[len(x) :]
+    offsets = np.arange(n_runs)[:, None] * len(points)
+    found = np.searchsorted(run * len(points) + x_rank, offsets + grid_rank, side="right") - 1
+
+    values = np.full((n_runs, len(grid)), np.nan)
+    valid = found >= run_bounds[:, None]
+    values[valid] = y[found[valid]]
+    return runs, values
+
+
+def anytime_performance(
+    df: pd.DataFrame,
+    *,
+    y_col: str,
+    grid: int | np.ndarray = 100,
+    x_col: str = "budget_used_total",
+    minimize: bool = True,
+    by: Sequence[str] | None = None,
+    run_by: Sequence[str] | None = None,
+    quantiles: Sequence[float] = (0.25, 0.5, 0.75),
+) -> pd.DataFrame:
+    """Aggregate the incumbent value of many runs over a common budget grid.
+
+    The incumbent trace of every run is resampled onto the grid with
+    [`align_to_grid()`][hpoglue.dataframe_utils.align_to_grid] and the runs of each group,
+    e.g. the seeds of an optimizer on a benchmark, are aggregated at every grid point.
+    Runs without an incumbent at a grid point yet are not counted for it.
+
+    ```python
+    df = pd.concat([run_glue(optimizer=o, benchmark=b, seed=s) for o, b, s in ...])
+    perf = anytime_performance(df, y_col="value", grid=np.arange(1, 101))
+    ```
+
+    Args:
+        df: The results frame, nested as returned by `run_glue` or flat.
+        y_col: The result key the incumbent is chosen by.
+        grid: The points to aggregate at, in increasing order, or the number of evenly
+            spaced points between the lowest and highest `x_col` value of the results.
+        x_col: The column to order the results of a run by, e.g. `budget_used_total`.
+        minimize: Whether lower values of `y_col` are better.
+        by: The columns to aggregate the runs by. If `None`, the columns of
+            [`RUN_KEYS`][hpoglue.dataframe_utils.RUN_KEYS] present in `df`, other
+            than `seed`, are used.
+        run_by: The columns identifying a run. If `None`, the columns of
+            [`RUN_KEYS`][hpoglue.dataframe_utils.RUN_KEYS] present in `df` are used.
+        quantiles: The quantiles of the incumbent values to compute.
+
+    Returns:
+        A long-format frame with a row per group and grid point, holding the `by`
+        columns, `x_col`, the number of runs `n`, the `mean`, its standard error `sem`,
+        and a `q<quantile>` column per quantile.
+    """
+    run_by = [c for c in RUN_KEYS if c in df.columns] if run_by is None else list(run_by)
+    by = [c for c in run_by if c != "seed"] if by is None else list(by)
+    if not set(by) <= set(run_by):
+        raise ValueError(f"The columns to aggregate by {by} must be part of {run_by=}.")
+
+    traces = inc_traces(df, y_col=y_col, x_col=x_col, minimize=minimize, by=run_by)
+    grid = make_grid(traces, grid, x_col=x_col)
+    runs, values = align_to_grid(traces, grid, x_col=x_col, by=run_by)
+
+    # Sort the runs by group and pad every group to the same number of runs, so that
+    # all groups are aggregated at once along the run axis.
+    if by:
+        group = runs.groupby(by, sort=True, observed=True, dropna=False).ngroup().to_numpy()
+    else:
+        group = np.zeros(len(runs), dtype=np.int64)
+
+    order = np.argsort(group, kind="stable")
+    group = group[order]
+    n_groups = group.max(initial=-1) + 1
+    group_bounds = np.searchsorted(group, np.arange(n_groups))
+    position = np.arange(len(group)) - group_bounds[group]
+
+    padded = np.full((n_groups, position.max(initial=-1) + 1, len(grid)), np.nan)
+    padded[group, position] = values[order]
+
+    n = np.sum(~np.isnan(padded), axis=1)
+    with warnings.catch_warnings():
+        # Grid points where no run of a group has an incumbent yet are all `NaN`
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(padded, axis=1)
+        sem = np.nanstd(padded, axis=1, ddof=1) / np.sqrt(n)
+        qs: np.ndarray | list[np.ndarray] = (
+            np.nanquantile(padded, quantiles, axis=1) if len(quantiles) else []
+        )
+
+    keys = runs.iloc[order[group_bounds]][by].reset_index(drop=True)
+    perf = keys.loc[keys.index.repeat(len(grid))].reset_index(drop=True)
+    perf[x_col] = np.tile(grid, n_groups)
+    perf["n"] = n.ravel()
+    perf["mean"] = mean.ravel()
+    perf["sem"] = sem.ravel()
+    for q, values_q in zip(quantiles, qs, strict=True):
+        perf[f"q{q:g}"] = values_q.ravel()
+
+    return perf
+
+
+def rank_over_budget(
+    df: pd.DataFrame,
+    *,
+    y_col: str,
+    grid: int | np.ndarray = 100,
+    x_col: str = "budget_used_total",
+    minimize: bool = True,
+    within: Sequence[str] = ("benchmark", "seed"),
+    average_by: Sequence[str] = (),
+) -> pd.DataFrame:
+    """Rank the incumbents of optimizers against each other over a common budget grid.
+
+    The incumbent traces of all runs are resampled onto the grid with
+    [`align_to_grid()`][hpoglue.dataframe_utils.align_to_grid]. At every grid point, the
+    optimizers are ranked within each group of `within`, e.g. per benchmark and seed,
+    where `1` is the best and ties get their average rank. A run without an incumbent
+    yet ranks behind all runs that have one. The ranks are then averaged over the groups.
+
+    All groups are ranked at once, by padding them to the same number of optimizers and
+    sorting the incumbents of each group at every grid point, without looping over groups
+    or runs.
+
+    ```python
+    ranks = rank_over_budget(df, y_col="value", grid=np.arange(1, 101))
+    ```
+
+    Args:
+        df: The results frame, nested as returned by `run_glue` or flat.
+        y_col: The result key the incumbent is chosen by.
+        grid: The points to rank at, in increasing order, or the number of evenly spaced
+            points between the lowest and highest `x_col` value of the results.
+        x_col: The column to order the results of a run by, e.g. `budget_used_total`.
+        minimize: Whether lower values of `y_col` are better.
+        within: The columns of the groups to rank the optimizers within. Every
+            optimizer may have at most one run per group.
+        average_by: Columns of `within` to keep apart when averaging the ranks, e.g.
+            `("benchmark",)` for the average rank over seeds on each benchmark.
+
+    Returns:
+        A long-format frame with a row per optimizer, `average_by` group and grid point,
+        holding the `average_by` columns, `optimizer` (and `optimizer_hps`), `x_col`, the
+        number of ranked groups `n`, the mean `rank` and its standard error `sem`.
+    """
+    within, average_by = list(within), list(average_by)
+    if not set(average_by) <= set(within):
+        raise ValueError(f"The columns to average by {average_by} must be part of {within=}.")
+
+    optimizer_by = [c for c in ("optimizer", "optimizer_hps") if c in df.columns]
+    run_by = [*within, *optimizer_by]
+
+    traces = inc_traces(df, y_col=y_col, x_col=x_col, minimize=minimize, by=run_by)
+    grid = make_grid(traces, grid, x_col=x_col)
+    runs, values = align_to_grid(traces, grid, x_col=x_col, by=run_by)
+
+    group = runs.groupby(within, sort=True, observed=True).ngroup().to_numpy()
+    optimizer = runs.groupby(optimizer_by, sort=True, observed=True).ngroup().to_numpy()
+    n_groups, n_optimizers = group.max(initial=-1) + 1, optimizer.max(initial=-1) + 1
+
+    present = np.zeros((n_groups, n_optimizers), dtype=bool)
+    present[group, optimizer] = True
+    if present.sum() != len(runs):
+        raise ValueError(f"Every optimizer may only have one run per group of {within=}.")
+
+    # NOTE: Oriented to minimize, with runs that have no incumbent yet ranking last.
+    v = np.full((n_groups, n_optimizers, len(grid)), np.inf)
+    v[group, optimizer] = np.nan_to_num(values if minimize else -values, nan=np.inf)
+
+    ranks = _rank(v, present)
+
+    if average_by:
+        group_keys = runs.drop_duplicates(within).sort_values(within)[average_by]
+        average = group_keys.groupby(average_by, sort=True, observed=True).ngroup().to_numpy()
+        average_keys = group_keys.drop_duplicates().reset_index(drop=True)
+    else:
+        average = np.zeros(n_groups, dtype=np.int64)
+        average_keys = pd.DataFrame(index=[0])
+
+    n_average = len(average_keys)
+    shape = (n_average, n_optimizers, len(grid))
+    n, total, total_sq = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    weight = present[:, :, None].astype(np.float64)
+    np.add.at(n, average, np.broadcast_to(weight, ranks.shape))
+    np.add.at(total, average, ranks * weight)
+    np.add.at(total_sq, average, ranks**2 * weight)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / n
+        var = (total_sq - n * mean**2) / (n - 1)
+        sem = np.sqrt(np.maximum(var, 0)) / np.sqrt(n)
+
+    optimizer_keys = runs.drop_duplicates(optimizer_by).sort_values(optimizer_by)[optimizer_by]
+    a, o, x = (
+        index.ravel()
+        for index in np.meshgrid(
+            np.arange(n_average), np.arange(n_optimizers), np.arange(len(grid)), indexing="ij"
+        )
+    )
+    keep = n.ravel() > 0
+
+    result = pd.concat(
+        [
+            average_keys.iloc[a[keep]].reset_index(drop=True)[average_by],
+            optimizer_keys.iloc[o[keep]].reset_index(drop=True),
+        ],
+        axis=1,
+    )
+    result[x_col] = grid[x[keep]]
+    result["n"] = n.ravel()[keep].astype(np.int64)
+    result["rank"] = mean.ravel()[keep]
+    result["sem"] = sem.ravel()[keep]
+    return result
+
+
+def _rank(v: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """Rank `v` of shape `(groups, optimizers, grid)` along the optimizers, ties averaged.
+
+    Optimizers that are not `present` in a group do not take part in its ranking.
+    """
+    n_optimizers = v.shape[1]
+    v = np.where(present[:, :, None], v, np.nan)
+
+    # NOTE: Padded optimizers are `nan`, which sorts after every run of the group.
+    order = np.argsort(v, axis=1, kind="stable")
+    ranked = np.take_along_axis(v, order, axis=1)
+
+    # Ties get the mean of the first and last position of their run of equal values
+    position = np.broadcast_to(np.arange(n_optimizers)[None, :, None], ranked.shape)
+    starts = np.ones(ranked.shape, dtype=bool)
+    starts[:, 1:] = ranked[:, 1:] != ranked[:, :-1]
+    ends = np.ones(ranked.shape, dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    first = np.maximum.accumulate(np.where(starts, position, 0), axis=1)
+    last = np.minimum.accumulate(np.where(ends, position, n_optimizers)[:, ::-1], axis=1)[:, ::-1]
+
+    ranks = np.empty(v.shape)
+    np.put_along_axis(ranks, order, 1 + (first + last) / 2, axis=1)
+    return ranks
+
+
+def change_points(
+    traces: pd.DataFrame,
+    *,
+    y_col: str = "y",
+    x_col: str = "budget_used_total",
+    by: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """Reduce step-wise traces, such as incumbent traces, to the rows where they change.
+
+    Keeps the first and last row of every run and every row whose `y_col` value differs
+    from the previous row of its run, which is all that is needed to draw the steps.
+    Works on any frame with one row per step, e.g. the incumbent value after every result
+    or the output of [`inc_traces()`][hpoglue.dataframe_utils.inc_traces].
+
+    Args:
+        traces: The traces, nested or flat, see
+            [`result_column()`][hpoglue.dataframe_utils.result_column].
+        y_col: The column of the value of the traces.
+        x_col: The column to order the rows of a run by.
+        by: The columns identifying a run. If `None`, the columns of
+            [`RUN_KEYS`][hpoglue.dataframe_utils.RUN_KEYS] present in `traces` are used.
+
+    Returns:
+        The kept rows of `traces`, sorted by run and `x_col`.
+    """
+    by = [c for c in RUN_KEYS if c in traces.columns] if by is None else list(by)
+    order, run = _sort_runs(traces, x_col=x_col, by=by)
+    if len(order) == 0:
+        return traces.iloc[order]
+
+    y = result_column(traces, y_col)[order]
+    new_run = np.r_[True, run[1:] != run[:-1]]
+    last_of_run = np.r_[new_run[1:], True]
+
+    # NOTE: `NaN`s compare unequal to themselves, treat consecutive ones as no change.
+    same = (y[1:] == y[:-1]) | (pd.isna(y[1:]) & pd.isna(y[:-1]))
+    keep = new_run | last_of_run | np.r_[True, ~same]
+    return traces.iloc[order[keep]]
+
+
+def downsample_lttb(
+    df: pd.DataFrame,
+    *,
+    y_col: str,
+    n_points: int,
+    x_col: str = "budget_used_total",
+    by: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """Downsample the raw traces of many runs to at most `n_points` rows per run.
+
+    Uses a vectorized variant of Largest-Triangle-Three-Buckets (LTTB): the first and
+    last row of a run are kept, the rows in between are split into `n_points - 2` buckets
+    of consecutive rows, and from each bucket the row forming the largest triangle with
+    the means of the two neighbouring buckets is kept. Unlike the original LTTB, which
+    uses the previously selected row instead of the mean of the previous bucket, all
+    buckets of all runs are then reduced at once, without looping over them.
+
+    Rows without a `y_col` value are dropped, runs with at most `n_points` rows are
+    kept entirely.
+
+    Args:
+        df: The results frame, nested or flat, see
+            [`result_column()`][hpoglue.dataframe_utils.result_column].
+        y_col: The column, or result key, of the values to preserve the shape of.
+        n_points: The maximum number of rows to keep per run, at least 3.
+        x_col: The column to order the rows of a run by.
+        by: The columns identifying a run. If `None`, the columns of
+            [`RUN_KEYS`][hpoglue.dataframe_utils.RUN_KEYS] present in `df` are used.
+
+    Returns:
+        The kept rows of `df`, sorted by run and `x_col`.
+    """
+    if n_points < 3:  # noqa: PLR2004
+        raise ValueError(f"{n_points=} must be at least 3")
+
+    by = [c for c in RUN_KEYS if c in df.columns] if by is None else list(by)
+    y = result_column(df, y_col).astype(np.float64)
+    order, run = _sort_runs(df, x_col=x_col, by=by, rows=np.flatnonzero(~np.isnan(y)))
+    if len(order) == 0:
+        return df.iloc[order]
+
+    x = result_column(df, x_col).astype(np.float64)[order]
+    y = y[order]
+
+    starts = np.flatnonzero(np.r_[True, run[1:] != run[:-1]])
+    lengths = np.diff(np.r_[starts, len(order)])
+    position = np.arange(len(order)) - np.repeat(starts, lengths)
+    length = np.repeat(lengths, lengths)
+
+    n_buckets = n_points - 2
+    interior = (length > n_points) & (position > 0) & (position < length - 1)
+    keep = ~interior
+
+    if interior.any():
+        rows = np.flatnonzero(interior)
+        first, last = rows - position[rows], rows - position[rows] + length[rows] - 1
+
+        # Buckets of consecutive interior rows, numbered across all runs
+        bucket_offset = np.cumsum(np.r_[0, np.where(lengths > n_points, n_buckets, 0)[:-1]])
+        local = (position[rows] - 1) * n_buckets // (length[rows] - 2)
+        bucket = np.repeat(bucket_offset, lengths)[rows] + local
+
+        total = bucket_offset[-1] + (n_buckets if lengths[-1] > n_points else 0)
+        count = np.bincount(bucket, minlength=total)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_x = np.bincount(bucket, weights=x[rows], minlength=total) / count
+            mean_y = np.bincount(bucket, weights=y[rows], minlength=total) / count
+
+        # The neighbours of the first and last bucket of a run are its first and last row
+        is_first, is_last = local == 0, local == n_buckets - 1
+        prev_x = np.where(is_first, x[first], mean_x[np.maximum(bucket - 1, 0)])
+        prev_y = np.where(is_first, y[first], mean_y[np.maximum(bucket - 1, 0)])
+        next_x = np.where(is_last, x[last], mean_x[np.minimum(bucket + 1, total - 1)])
+        next_y = np.where(is_last, y[last], mean_y[np.minimum(bucket + 1, total - 1)])
+
+        area = np.abs(
+            (prev_x - next_x) * (y[rows] - prev_y) - (prev_x - x[rows]) * (next_y - prev_y)
+        )
+        by_area = np.lexsort((-area, bucket))
+        best = by_area[np.r_[True, bucket[by_area][1:] != bucket[by_area][:-1]]]
+        keep[rows[best]] = True
+
+    return df.iloc[order[keep]]
+
+
+def _sort_runs(
+    df: pd.DataFrame,
+    *,
+    x_col: str,
+    by: list[str],
+    rows: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    # The positions of `rows` (default all) sorted by run and `x_col`, and their run codes
+    if by:
+        run = df.groupby(by, sort=True, observed=True, dropna=False).ngroup().to_numpy()
+    else:
+        run = np.zeros(len(df), dtype=np.int64)
+
+    rows = np.arange(len(df)) if rows is None else rows
+    x = result_column(df, x_col)
+    order = rows[np.lexsort((x[rows], run[rows]))]
+    return order, run[order]
@@ -166,7 +166,7 @@ class RangeFidelity(Fidelity, Sized, Generic[T]):
         yield self.min
         while current < self.max:
             current += self.stepsize
-            yield max(current, self.max)  # type: ignore
+            yield min(current, self.max)  # type: ignore
 
     @property
     def n_values(self) -> int:
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from enum import Enum
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+
+HASH_DIGEST_SIZE = 16
+"""The size in bytes of the content hashes, which are given as hex strings of twice the size."""
+
+
+def _to_json(o: Any) -> Any:  # noqa: PLR0911
+    match o:
+        case np.generic():
+            return o.item()
+        case np.ndarray():
+            return o.tolist()
+        case set() | frozenset():
+            return sorted(o, key=repr)
+        case Mapping():
+            return dict(o)
+        case Enum():
+            return f"{type(o).__module__}.{type(o).__qualname__}.{o.name}"
+        case _ if callable(o) and hasattr(o, "__qualname__") and _is_unbound(o):
+            # NOTE: Classes and functions by name, their `repr()` may hold a memory address.
+            return f"{o.__module__}.{o.__qualname__}"
+        case os.PathLike():
+            return os.fspath(o)
+        case _:
+            raise TypeError(
+                f"Can not encode {o!r} of type {type(o)} for a content hash, as it has no"
+                " representation that is stable across processes."
+            )
+
+
+def _is_unbound(o: Any) -> bool:
+    # NOTE: Methods depend on the object they are bound to, builtins are bound to a module.
+    bound_to = getattr(o, "__self__", None)
+    return bound_to is None or isinstance(bound_to, ModuleType)
+
+
+def canonical_json(obj: Any) -> str:
+    """Encode an object as json that does not depend on the order of mapping keys.
+
+    Floats are written with their shortest round-trip representation and numpy scalars
+    are converted to their python equivalent, so the same content always gives the
+    same string, regardless of the process it was encoded in. Classes, functions and
+    enum members are encoded by their qualified name.
+
+    Raises:
+        TypeError: If `obj` holds a value with no such stable encoding.
+    """
+    return json.dumps(
+        obj,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=_to_json,
+        allow_nan=True,
+    )
+
+
+def content_hash(obj: Any) -> str:
+    """A stable hash of the content of an object, as a hex string.
+
+    Unlike `hash()`, the hash is the same across processes and python versions.
+
+    Args:
+        obj: Anything that can be encoded with
+            [`canonical_json()`][hpoglue.hashing.canonical_json].
+
+    Returns:
+        The hex digest of the hash.
+    """
+    return hash_str(canonical_json(obj))
+
+
+def hash_str(s: str) -> str:
+    """A stable hash of a string, as a hex string."""
+    return hashlib.blake2b(s.encode(), digest_size=HASH_DIGEST_SIZE).hexdigest()
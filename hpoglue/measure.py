@@ -2,9 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import TYPE_CHECKING, Literal
 
 import numpy as np
 
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
+
 
 class OutOfBoundsError(ValueError):
     """Raised when a value is outside of the bounds of a measure."""
@@ -119,3 +123,83 @@ class Measure:
                 return -float(value)
             case False:
                 return float(value)
+
+    def as_minimize_array(self, values: ArrayLike) -> np.ndarray:
+        """Convert raw values into values that should be minimized.
+
+        Args:
+            values: The raw values, e.g. a column of a results frame.
+
+        Returns:
+            A new float array of the values to minimize.
+        """
+        array = np.array(values, dtype=np.float64)
+        if not self.minimize:
+            np.negative(array, out=array)
+        return array
+
+    def as_maximize_array(self, values: ArrayLike) -> np.ndarray:
+        """Convert raw values into values that should be maximized.
+
+        Args:
+            values: The raw values, e.g. a column of a results frame.
+
+        Returns:
+            A new float array of the values to maximize.
+        """
+        array = np.array(values, dtype=np.float64)
+        if self.minimize:
+            np.negative(array, out=array)
+        return array
+
+    def normalize(
+        self,
+        values: ArrayLike,
+        *,
+        infinite_bounds: Literal["raise", "observed"] = "raise",
+    ) -> np.ndarray:
+        """Normalize raw values by the bounds of the measure, such that lower is better.
+
+        The optimum of the measure maps to `0` and the opposite bound to `1`, for both
+        minimized and maximized measures. Values outside of the bounds fall outside of
+        `[0, 1]` and `NaN`s are kept.
+
+        Args:
+            values: The raw values, e.g. a column of a results frame.
+            infinite_bounds: What to do when a bound is infinite.
+
+                * `"raise"`: Raise a `ValueError`.
+                * `"observed"`: Use the lowest/highest finite value in `values` instead.
+
+        Returns:
+            A new float array of the normalized values.
+        """
+        array = np.array(values, dtype=np.float64)
+        lower, upper = self.bounds
+        if not (np.isfinite(lower) and np.isfinite(upper)):
+            match infinite_bounds:
+                case "raise":
+                    raise ValueError(
+                        f"Can not normalize by the infinite bounds {self.bounds}."
+                        " Use `infinite_bounds='observed'` to use the observed range instead."
+                    )
+                case "observed":
+                    finite = array[np.isfinite(array)]
+                    if len(finite) == 0:
+                        return np.full_like(array, np.nan)
+                    lower = lower if np.isfinite(lower) else finite.min()
+                    upper = upper if np.isfinite(upper) else finite.max()
+                case _:
+                    raise ValueError(f"Unknown {infinite_bounds=}")
+
+        span = upper - lower
+        if span <= 0:
+            # NOTE: Only possible for observed bounds, where all values are the same.
+            return np.where(np.isnan(array), np.nan, 0.0)
+
+        if self.minimize:
+            array -= lower
+        else:
+            np.subtract(upper, array, out=array)
+        array /= span
+        return array
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from hpoglue.dataframe_utils import RUN_KEYS, result_column
+
+if TYPE_CHECKING:
+    from hpoglue.measure import Measure
+    from hpoglue.problem import Problem
+    from hpoglue.result import Result
+
+logger = logging.getLogger(__name__)
+
+
+class ParetoArchive:
+    """The non-dominated results of a multi-objective run, updated one result at a time.
+
+    Every added point is oriented such that all objectives are minimized, using the
+    [`Measure`][hpoglue.measure.Measure] of each objective. A point only enters the
+    archive if no point in it is at least as good in all objectives, in which case all
+    points it dominates are removed.
+
+    The hypervolume dominated by the archive, up to a reference point, is kept up to
+    date with every added point:
+
+    * For 2 objectives, the front is kept sorted by the first objective and only the
+        part of the hypervolume between the neighbours of a new point is recomputed.
+    * For 3 or more objectives, the hypervolume is recomputed whenever the front changes.
+
+    ```python
+    archive = ParetoArchive.from_problem(problem)
+    for result in history:
+        archive.add_result(result)
+
+    trace = archive.trace()
+    ```
+    """
+
+    def __init__(
+        self,
+        objectives: Mapping[str, Measure],
+        *,
+        reference_point: Sequence[float] | None = None,
+    ) -> None:
+        """Create an empty archive.
+
+        Args:
+            objectives: The objectives, by their name in the results of a benchmark.
+            reference_point: The reference point of the hypervolume, in the raw values of
+                the objectives. If `None`, the worst bound of each objective is used.
+
+        Raises:
+            ValueError: If no reference point is given and an objective has no finite
+                worst bound.
+        """
+        if len(objectives) < 1:
+            raise ValueError("At least one objective is required.")
+
+        self.objectives = dict(objectives)
+        """The objectives of the archive, by name."""
+
+        measures = list(self.objectives.values())
+        if reference_point is None:
+            reference_point = [m.bounds[1] if m.minimize else m.bounds[0] for m in measures]
+            if not np.all(np.isfinite(reference_point)):
+                raise ValueError(
+                    f"Can not infer a finite reference point from the bounds of {objectives=}."
+                    " Please provide a `reference_point`."
+                )
+        elif len(reference_point) != len(measures):
+            raise ValueError(
+                f"Expected a reference point with {len(measures)} values, got {reference_point}"
+            )
+
+        self.reference_point = np.array(
+            [m.as_minimize(v) for m, v in zip(measures, reference_point, strict=True)]
+        )
+        """The reference point of the hypervolume, oriented such that all are minimized."""
+
+        self.hypervolume: float = 0.0
+        """The hypervolume dominated by the archive."""
+
+        self._minimize = np.array([m.minimize for m in measures])
+        self._points: list[np.ndarray] = []
+        self._items: list[Any] = []
+        self._trace_budget: list[float] = []
+        self._trace_hypervolume: list[float] = []
+
+    @classmethod
+    def from_problem(
+        cls,
+        problem: Problem,
+        *,
+        reference_point: Sequence[float] | None = None,
+    ) -> ParetoArchive:
+        """Create an empty archive for the objectives of a problem.
+
+        Args:
+            problem: The problem whose objectives to track.
+            reference_point: The reference point of the hypervolume, in the raw values of
+                the objectives, in the order of
+                [`get_objectives()`][hpoglue.problem.Problem.get_objectives].
+                If `None`, the worst bound of each objective is used.
+
+        Returns:
+            The archive.
+        """
+        match problem.objectives:
+            case (name, measure):
+                objectives = {name: measure}
+            case Mapping():
+                objectives = dict(problem.objectives)
+            case _:
+                raise TypeError("Objectives must be a tuple (name, measure) or a mapping")
+
+        return cls(objectives, reference_point=reference_point)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    @property
+    def points(self) -> np.ndarray:
+        """The non-dominated points, oriented such that all objectives are minimized.
+
+        For 2 objectives, the points are sorted by the first objective.
+        """
+        if not self._points:
+            return np.empty((0, len(self.objectives)))
+        return np.array(self._points)
+
+    @property
+    def items(self) -> list[Any]:
+        """The items of the non-dominated points, e.g. their results, in the same order."""
+        return list(self._items)
+
+    def add(
+        self, values: Sequence[float], *, budget: float | None = None, item: Any = None
+    ) -> bool:
+        """Add a point to the archive, given by the raw values of its objectives.
+
+        Args:
+            values: The raw value of every objective, in the order of `objectives`.
+            budget: The budget used when the point was found, recorded in the
+                [`trace()`][hpoglue.pareto.ParetoArchive.trace]. If `None`, the
+                number of points added so far is used.
+            item: Anything to keep alongside the point while it is non-dominated.
+
+        Returns:
+            Whether the point entered the archive.
+        """
+        point = np.array(values, dtype=np.float64)
+        if point.shape != self.reference_point.shape:
+            raise ValueError(f"Expected {len(self.objectives)} values, got {values}")
+
+        np.negative(point, out=point, where=~self._minimize)
+        if np.isnan(point).any():
+            added = False
+        elif len(self.objectives) == 2:  # noqa: PLR2004
+            added = self._add_2d(point, item)
+        else:
+            added = self._add_nd(point, item)
+
+        self._trace_budget.append(
+            float(budget) if budget is not None else float(len(self._trace_budget) + 1)
+        )
+        self._trace_hypervolume.append(self.hypervolume)
+        return added
+
+    def add_result(self, result: Result) -> bool:
+        """Add the objectives of a result to the archive, keeping the result as its item.
+
+        The budget of the result in the trace is its `budget_used_total`.
+        """
+        return self.add(
+            [result.values[name] for name in self.objectives],
+            budget=result.budget_used_total,
+            item=result,
+        )
+
+    def trace(self) -> pd.DataFrame:
+        """The hypervolume after every added point.
+
+        Returns:
+            A frame with a row per added point, holding the `budget_used_total` when it
+            was added and the `hypervolume` of the archive after adding it.
+        """
+        return pd.DataFrame(
+            {
+                "budget_used_total": np.array(self._trace_budget),
+                "hypervolume": np.array(self._trace_hypervolume),
+            }
+        )
+
+    def _add_2d(self, point: np.ndarray, item: Any) -> bool:
+        points = self._points
+        x, y = point
+
+        # The front is sorted by increasing x, and so by decreasing y.
+        i = bisect_left(points, x, key=lambda p: p[0])
+        if i > 0 and points[i - 1][1] <= y:
+            return False
+        if i < len(points) and points[i][0] == x and points[i][1] <= y:
+            return False
+
+        # The points dominated by the new one directly follow it.
+        j = i
+        while j < len(points) and points[j][1] >= y:
+            j += 1
+
+        # NOTE: Only the hypervolume between the new point and its next non-dominated
+        # neighbour changes, recompute that strip before and after inserting it.
+        rx, ry = self.reference_point
+        end = min(points[j][0], rx) if j < len(points) else rx
+        start = min(x, rx)
+        ceiling = min(points[i - 1][1], ry) if i > 0 else ry
+
+        before = 0.0
+        left = start
+        for k in range(i, j):
+            px = min(points[k][0], rx)
+            before += (px - left) * (ry - ceiling)
+            left, ceiling = px, min(points[k][1], ry)
+        before += (end - left) * (ry - ceiling)
+        after = (end - start) * (ry - min(y, ry))
+
+        self.hypervolume += after - before
+        points[i:j] = [point]
+        self._items[i:j] = [item]
+        return True
+
+    def _add_nd(self, point: np.ndarray, item: Any) -> bool:
+        if self._points:
+            front = np.array(self._points)
+            if np.any(np.all(front <= point, axis=1)):
+                return False
+
+            keep = ~np.all(point <= front, axis=1)
+            self._points = [p for p, k in zip(self._points, keep, strict=True) if k]
+            self._items = [it for it, k in zip(self._items, keep, strict=True) if k]
+
+        self._points.append(point)
+        self._items.append(item)
+        self.hypervolume = hypervolume(np.array(self._points), self.reference_point)
+        return True
+
+
+def hypervolume(points: np.ndarray, reference_point: np.ndarray) -> float:
+    """The hypervolume dominated by a set of points, all of whose objectives are minimized.
+
+    Computed by sweeping over the last objective and recursing on the slices, which is
+    fast for 2 and 3 objectives but exponential in the number of objectives.
+
+    Args:
+        points: A `(n_points, n_objectives)` array of points to minimize.
+        reference_point: The point bounding the hypervolume, with `n_objectives` values.
+
+    Returns:
+        The hypervolume, only counting the part of the points below the reference point.
+    """
+    points = np.minimum(np.asarray(points, dtype=np.float64), reference_point)
+    if len(points) == 0:
+        return 0.0
+
+    if points.shape[1] == 1:
+        return float(reference_point[0] - points[:, 0].min())
+
+    if points.shape[1] == 2:  # noqa: PLR2004
+        points = points[np.lexsort((points[:, 1], points[:, 0]))]
+        ceilings = np.minimum.accumulate(points[:, 1])
+        widths = np.diff(np.r_[points[:, 0], reference_point[0]])
+        return float(np.sum(widths * (reference_point[1] - ceilings)))
+
+    points = points[np.argsort(points[:, -1], kind="stable")]
+    depths = np.diff(np.r_[points[:, -1], reference_point[-1]])
+    return float(
+        sum(
+            depth * hypervolume(points[: k + 1, :-1], reference_point[:-1])
+            for k, depth in enumerate(depths)
+            if depth > 0
+        )
+    )
+
+
+def hypervolume_traces(
+    df: pd.DataFrame,
+    problem: Problem,
+    *,
+    reference_point: Sequence[float] | None = None,
+    x_col: str = "budget_used_total",
+    by: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """Compute the hypervolume over budget of every run in a results frame.
+
+    Args:
+        df: The results frame, nested as returned by `run_glue` or flat.
+        problem: The problem of the runs, giving the objectives and their measures.
+        reference_point: The reference point of the hypervolume, see
+            [`ParetoArchive.from_problem()`][hpoglue.pareto.ParetoArchive.from_problem].
+        x_col: The column to order the results of a run by.
+        by: The columns identifying a run. If `None`, the columns of
+            [`RUN_KEYS`][hpoglue.dataframe_utils.RUN_KEYS] present in `df` are used.
+
+    Returns:
+        A long-format frame with the `by` columns, `x_col` and the `hypervolume` after
+        every result of each run.
+    """
+    by = [c for c in RUN_KEYS if c in df.columns] if by is None else list(by)
+    objectives = ParetoArchive.from_problem(problem, reference_point=reference_point).objectives
+
+    values = np.column_stack([result_column(df, name) for name in objectives])
+    x = df[x_col].to_numpy(dtype=np.float64)
+
+    traces = []
+    groups = df.groupby(by, sort=True, observed=True).indices if by else {(): np.arange(len(df))}
+    for key, rows in groups.items():
+        archive = ParetoArchive(objectives, reference_point=reference_point)
+        for row in rows[np.argsort(x[rows], kind="stable")]:
+            archive.add(values[row], budget=x[row])
+
+        trace = archive.trace().rename(columns={"budget_used_total": x_col})
+        keys = key if isinstance(key, tuple) else (key,)
+        traces.append(trace.assign(**dict(zip(by, keys, strict=True))))
+
+    if not traces:
+        return pd.DataFrame(columns=[*by, x_col, "hypervolume"])
+
+    return pd.concat(traces, ignore_index=True)[[*by, x_col, "hypervolume"]]
@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import logging
 import warnings
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Literal, TypeAlias
 
+import numpy as np
+
 from hpoglue.budget import CostBudget, TrialBudget
 from hpoglue.config import PRECISION, Config
+from hpoglue.dataframe_utils import result_column
 from hpoglue.fidelity import ContinuousFidelity, Fidelity, ListFidelity, RangeFidelity
+from hpoglue.hashing import content_hash
 from hpoglue.measure import Measure
 from hpoglue.optimizer import Optimizer
 from hpoglue.query import Query
@@ -16,6 +20,7 @@ from hpoglue.result import Result
 from hpoglue.utils import configpriors_to_dict, dict_to_configpriors, first, first_n, mix_n
 
 if TYPE_CHECKING:
+    import pandas as pd
     from ConfigSpace import ConfigurationSpace
 
     from hpoglue.benchmark import BenchmarkDescription
@@ -114,7 +119,7 @@ class Problem:
     continuations: bool = field(default=True)
     """Whether the problem supports continuations."""
 
-    priors: tuple[str, Mapping[str, Config]] = field(default_factory=dict)
+    priors: tuple[str, Mapping[str, Config]] | None = None
     """Priors to use for the problem's objectives.
         Format: (unique_prior_id, {objective_name: prior Config})
     """
@@ -213,7 +218,7 @@ class Problem:
                     raise ValueError("Single cost should be a tuple, not a mapping")
 
     @classmethod
-    def problem(  # noqa: C901, PLR0912, PLR0913, PLR0915
+    def problem(  # noqa: PLR0913
         cls,
         *,
         optimizer: type[Optimizer],
@@ -262,204 +267,16 @@ class Problem:
 
             priors: Priors to use for the problem's objectives.
         """
-        _minimum_normalized_fid = None
-        _fid: tuple[str, Fidelity] | Mapping[str, Fidelity] | None
-        match fidelities:
-            case int() if fidelities < 0:
-                raise ValueError(f"{fidelities=} must be >= 0")
-            case 0:
-                _fid = None
-            case None:
-                _fid = None
-            case 1:
-                if benchmark.fidelities is None:
-                    raise ValueError(
-                        (
-                            f"Benchmark {benchmark.name} has no fidelities but {fidelities=} "
-                            "was requested"
-                        ),
-                    )
-                _fid = first(benchmark.fidelities)
-                _minimum_normalized_fid = float(_fid[1].min / _fid[1].max)
-            case int():
-                if benchmark.fidelities is None:
-                    raise ValueError(
-                        (
-                            f"Benchmark {benchmark.name} has no fidelities but {fidelities=} "
-                            "was requested"
-                        ),
-                    )
-
-                if fidelities > len(benchmark.fidelities):
-                    raise ValueError(
-                        f"{fidelities=} is greater than the number of fidelities"
-                        f" in benchmark {benchmark.name} which has "
-                        f"{len(benchmark.fidelities)} fidelities",
-                    )
-
-                _fid = first_n(fidelities, benchmark.fidelities)
-                _minimum_normalized_fid = minimum_normalized_fidelity_value
-            case str():
-                if benchmark.fidelities is None:
-                    raise ValueError(
-                        (
-                            f"Benchmark {benchmark.name} has no fidelities but {fidelities=} "
-                            "was requested"
-                        ),
-                    )
-                if fidelities not in benchmark.fidelities:
-                    raise ValueError(
-                        f"{fidelities=} not found in benchmark {benchmark.name} fidelities",
-                    )
-                _fid = (fidelities, benchmark.fidelities[fidelities])
-                _minimum_normalized_fid = float(_fid[1].min / _fid[1].max)
-            case list():
-                if benchmark.fidelities is None:
-                    raise ValueError(
-                        (
-                            f"Benchmark {benchmark.name} has no fidelities but {fidelities=} "
-                            "was requested"
-                        ),
-                    )
-                if len(fidelities) > len(benchmark.fidelities):
-                    raise ValueError(
-                        f"{fidelities=} is greater than the number of fidelities"
-                        f" in benchmark {benchmark.name} which has "
-                        f"{len(benchmark.fidelities)} fidelities",
-                    )
-                _fid = {name: benchmark.fidelities[name] for name in fidelities}
-                _minimum_normalized_fid = minimum_normalized_fidelity_value
-            case _:
-                raise TypeError(f"{fidelities=} not supported")
-
-        _obj: tuple[str, Measure] | Mapping[str, Measure]
-        match objectives, multi_objective_generation:
-            # single objective
-            case int(), _ if objectives < 0:  # type: ignore
-                raise ValueError(f"{objectives=} must be >= 0")
-            case _, str() if multi_objective_generation not in {"mix_metric_cost", "metric_only"}:
-                raise ValueError(
-                    f"{multi_objective_generation=} not supported, must be one"
-                    " of 'mix_metric_cost', 'metric_only'",
-                )
-            case 1, _:
-                _obj = first(benchmark.metrics)
-            case int(), "metric_only":
-                if objectives > len(benchmark.metrics):  # type: ignore
-                    raise ValueError(
-                        f"{objectives=} is greater than the number of metrics"
-                        f" in benchmark {benchmark.name} which has {len(benchmark.metrics)} metrics"
-                    )
-                _obj = first_n(objectives, benchmark.metrics)  # type: ignore
-            case int(), "mix_metric_cost":
-                n_costs = 0 if benchmark.costs is None else len(benchmark.costs)
-                n_available = len(benchmark.metrics) + n_costs
-                if objectives > n_available:  # type: ignore
-                    raise ValueError(
-                        f"{objectives=} is greater than the number of metrics and costs"
-                        f" in benchmark {benchmark.name} which has {n_available} objectives"
-                        " when combining metrics and costs",
-                    )
-                if benchmark.costs is None:
-                    _obj = first_n(objectives, benchmark.metrics)  # type: ignore
-                else:
-                    _obj = mix_n(objectives, benchmark.metrics, benchmark.costs)  # type: ignore
-            case str(), _:
-                if objectives not in benchmark.metrics:
-                    raise ValueError(
-                        f"{objectives=} not found in benchmark {benchmark.name} metrics",
-                    )
-                _obj = (objectives, benchmark.metrics[objectives])  # type: ignore
-            case list(), "metric_only":
-                if len(objectives) > len(benchmark.metrics):  # type: ignore
-                    raise ValueError(
-                        f"{objectives=} is greater than the number of metrics"
-                        f" in benchmark {benchmark.name} which has {len(benchmark.metrics)} metrics"
-                    )
-                _obj = {name: benchmark.metrics[name] for name in objectives}  # type: ignore
-            case list(), "mix_metric_cost":
-                n_costs = 0 if benchmark.costs is None else len(benchmark.costs)
-                n_available = len(benchmark.metrics) + n_costs
-                if len(objectives) > n_available:  # type: ignore
-                    raise ValueError(
-                        f"{objectives=} is greater than the number of metrics and costs"
-                        f" in benchmark {benchmark.name} which has {n_available} objectives"
-                        " when combining metrics and costs",
-                    )
-                if benchmark.costs is None:
-                    for obj in objectives:  # type: ignore
-                        if obj not in benchmark.metrics:
-                            raise ValueError(
-                                f"{obj=} not found in benchmark {benchmark.name} metrics",
-                            )
-                    _obj = {name: benchmark.metrics[name] for name in objectives}  # type: ignore
-                else:
-                    _obj = {}
-                    for obj in objectives:  # type: ignore
-                        if obj in benchmark.metrics:
-                            _obj[obj] = benchmark.metrics[obj]
-                        elif obj in benchmark.costs:
-                            _obj[obj] = benchmark.costs[obj]
-                        else:
-                            raise ValueError(
-                                f"{obj=} not found in benchmark {benchmark.name} metrics or costs",
-                            )
-            case _, _:
-                raise RuntimeError(
-                    f"Unexpected case with {objectives=}, {multi_objective_generation=}",
-                )
-
-        _cost: tuple[str, Measure] | Mapping[str, Measure] | None
-        match costs:
-            case int() if costs < 0:
-                raise ValueError(f"{costs=} must be >= 0")
-            case 0:
-                _cost = None
-            case None:
-                _cost = None
-            case 1:
-                if benchmark.costs is None:
-                    raise ValueError(
-                        f"Benchmark {benchmark.name} has no costs but {costs=} was requested",
-                    )
-                _cost = first(benchmark.costs)
-            case int():
-                if benchmark.costs is None:
-                    raise ValueError(
-                        f"Benchmark {benchmark.name} has no costs but {costs=} was requested",
-                    )
-                _cost = first_n(costs, benchmark.costs)
-            case _:
-                raise TypeError(f"{costs=} not supported")
-
-        _budget: BudgetType
-        match budget:
-            case int() if budget < 0:
-                raise ValueError(f"{budget=} must be >= 0")
-            case int():
-                _minimum_normalized_fid = (
-                    minimum_normalized_fidelity_value or _minimum_normalized_fid or 0.01
-                )
-                _budget = TrialBudget(budget, _minimum_normalized_fid)
-            case float():
-                _budget = CostBudget(budget)
-            case TrialBudget():
-                _budget = budget
-            case CostBudget():
-                raise NotImplementedError("Cost budgets are not yet supported")
-            case _:
-                raise TypeError(f"Unexpected type for `{budget=}`: {type(budget)}")
-
+        _fid, _minimum_normalized_fid = _resolve_fidelities(
+            benchmark, fidelities, minimum_normalized_fidelity_value
+        )
+        _obj = _resolve_objectives(benchmark, objectives, multi_objective_generation)
+        _cost = _resolve_costs(benchmark, costs)
+        _budget = _resolve_budget(
+            budget, minimum_normalized_fidelity_value, _minimum_normalized_fid
+        )
         _opt = optimizer[0] if isinstance(optimizer, tuple) else optimizer
 
-        match priors:
-            case None:
-                pass
-            case tuple():
-                priors = dict_to_configpriors(priors)
-            case _:
-                raise TypeError(f"Unexpected type for priors: {type(priors)}")
-
         problem = Problem(
             optimizer=optimizer,
             optimizer_hyperparameters=optimizer_hyperparameters,
@@ -470,7 +287,7 @@ class Problem:
             costs=_cost,
             precision=precision if precision is not None else PRECISION,
             continuations=continuations,
-            priors=priors,
+            priors=_resolve_priors(priors),
         )
 
         support: Problem.Support = _opt.support
@@ -478,6 +295,137 @@ class Problem:
 
         return problem
 
+    @classmethod
+    def grid(  # noqa: C901, PLR0913
+        cls,
+        *,
+        optimizers: Sequence[type[Optimizer] | OptWithHps],
+        benchmarks: Sequence[BenchmarkDescription],
+        budgets: Sequence[BudgetType | int | float],
+        minimum_normalized_fidelity_value: float | None = None,
+        fidelities: int | str | list[str] | None = None,
+        objectives: int | str | list[str] = 1,
+        costs: int = 0,
+        multi_objective_generation: Literal["mix_metric_cost", "metric_only"] = "mix_metric_cost",
+        precision: int | None = None,
+        continuations: bool = True,
+        priors: tuple[str, Mapping[str, Config] | Mapping[str, dict[str, Any]]] | None = None,
+        on_unsupported: Literal["raise", "skip"] = "raise",
+    ) -> list[Problem]:
+        """Generate the problems of every optimizer on every benchmark for every budget.
+
+        Gives the same problems as calling [`problem()`][hpoglue.problem.Problem.problem]
+        for every combination, but resolves the fidelities, objectives and costs of a
+        benchmark only once, and checks the support of an optimizer only once per shape
+        of problem, i.e. its kinds of fidelities, objectives and costs, whether it is
+        tabular and whether it uses priors and continuations. Warnings of the support
+        check are therefore only issued for the first problem of a shape.
+
+        Problems of the same optimizer and hyperparameters with the same
+        [`group_for_optimizer_comparison()`][hpoglue.problem.Problem.group_for_optimizer_comparison]
+        key, e.g. from a benchmark or budget given twice, are only generated once.
+
+        Args:
+            optimizers: The optimizers, or `(optimizer, hyperparameters)` pairs.
+            benchmarks: The benchmarks.
+            budgets: The budgets.
+            minimum_normalized_fidelity_value: See
+                [`problem()`][hpoglue.problem.Problem.problem].
+            fidelities: See [`problem()`][hpoglue.problem.Problem.problem].
+            objectives: See [`problem()`][hpoglue.problem.Problem.problem].
+            costs: See [`problem()`][hpoglue.problem.Problem.problem].
+            multi_objective_generation: See [`problem()`][hpoglue.problem.Problem.problem].
+            precision: See [`problem()`][hpoglue.problem.Problem.problem].
+            continuations: See [`problem()`][hpoglue.problem.Problem.problem].
+            priors: See [`problem()`][hpoglue.problem.Problem.problem].
+            on_unsupported: What to do when an optimizer does not support a problem.
+
+                * `"raise"`: Raise the `ValueError` of the support check.
+                * `"skip"`: Log a warning and leave out its problems of that shape.
+
+        Returns:
+            The problems, ordered by optimizer, then benchmark, then budget.
+        """
+        _priors = _resolve_priors(priors)
+        _precision = precision if precision is not None else PRECISION
+
+        resolved = []
+        for benchmark in benchmarks:
+            _fid, _minimum_normalized_fid = _resolve_fidelities(
+                benchmark, fidelities, minimum_normalized_fidelity_value
+            )
+            _obj = _resolve_objectives(benchmark, objectives, multi_objective_generation)
+            _cost = _resolve_costs(benchmark, costs)
+            _budgets = [
+                _resolve_budget(b, minimum_normalized_fidelity_value, _minimum_normalized_fid)
+                for b in budgets
+            ]
+            shape = _support_key(
+                benchmark,
+                _fid,
+                _obj,
+                _cost,
+                priors=bool(_priors),
+                continuations=continuations,
+            )
+            resolved.append((benchmark, _fid, _obj, _cost, _budgets, shape))
+
+        # (optimizer, shape) -> (error, whether priors are kept, continuations)
+        checked: dict[tuple[type[Optimizer], tuple], tuple[ValueError | None, bool, bool]] = {}
+        seen: set[tuple] = set()
+        problems: list[Problem] = []
+        for entry in optimizers:
+            opt, hps = entry if isinstance(entry, tuple) else (entry, {})
+            for benchmark, _fid, _obj, _cost, _budgets, shape in resolved:
+                outcome = checked.get((opt, shape))
+                if outcome is not None and outcome[0] is not None:
+                    continue
+
+                for _budget in _budgets:
+                    problem = Problem(
+                        optimizer=opt,
+                        optimizer_hyperparameters=hps,
+                        benchmark=benchmark,
+                        budget=_budget,
+                        fidelities=_fid,
+                        objectives=_obj,
+                        costs=_cost,
+                        precision=_precision,
+                        continuations=continuations if outcome is None else outcome[2],
+                        priors=_priors if outcome is None or outcome[1] else None,
+                    )
+                    if outcome is None:
+                        support: Problem.Support = opt.support
+                        try:
+                            support.check_opt_support(who=opt.name, problem=problem)
+                        except ValueError as e:
+                            outcome = (e, False, False)
+                        else:
+                            outcome = (None, bool(problem.priors), problem.continuations)
+                        checked[(opt, shape)] = outcome
+
+                    if outcome[0] is not None:
+                        if on_unsupported == "raise":
+                            raise outcome[0]
+                        logger.warning(f"Skipping unsupported problems: {outcome[0]}")
+                        break
+
+                    key = (
+                        opt.name,
+                        content_hash(hps),
+                        problem.priors[0] if problem.priors else None,
+                        problem.continuations,
+                        problem.group_for_optimizer_comparison(),
+                    )
+                    if key in seen:
+                        logger.debug(f"Skipping duplicate problem {problem.name}")
+                        continue
+
+                    seen.add(key)
+                    problems.append(problem)
+
+        return problems
+
     def get_objectives(self) -> str | list[str]:
         """Retrieve the objectives of the problem.
 
@@ -518,6 +466,45 @@ class Problem:
             else self.costs[0]
         )
 
+    def minimization_matrix(
+        self,
+        df: pd.DataFrame,
+        *,
+        normalize: bool = False,
+        infinite_bounds: Literal["raise", "observed"] = "raise",
+    ) -> np.ndarray:
+        """Get the objectives of a results frame as a matrix of values to minimize.
+
+        Args:
+            df: The results frame, either nested as returned by `run_glue` or flattened,
+                see [`result_column()`][hpoglue.dataframe_utils.result_column].
+            normalize: Whether to normalize every objective by the bounds of its measure,
+                see [`Measure.normalize()`][hpoglue.measure.Measure.normalize].
+            infinite_bounds: How to normalize objectives with infinite bounds.
+
+        Returns:
+            A `(n_results, n_objectives)` float array, with columns in the order of
+            [`get_objectives()`][hpoglue.problem.Problem.get_objectives].
+        """
+        match self.objectives:
+            case (name, measure):
+                objectives = [(name, measure)]
+            case Mapping():
+                objectives = list(self.objectives.items())
+            case _:
+                raise TypeError("Objectives must be a tuple (name, measure) or a mapping")
+
+        matrix = np.empty((len(df), len(objectives)), dtype=np.float64)
+        for i, (name, measure) in enumerate(objectives):
+            values = result_column(df, name)
+            matrix[:, i] = (
+                measure.normalize(values, infinite_bounds=infinite_bounds)
+                if normalize
+                else measure.as_minimize_array(values)
+            )
+
+        return matrix
+
     def group_for_optimizer_comparison(
         self,
     ) -> tuple[
@@ -576,6 +563,15 @@ class Problem:
             "priors": configpriors_to_dict(self.priors) if self.priors else None,
         }
 
+    def content_hash(self) -> str:
+        """A stable hash of the problem, derived from its
+        [`to_dict()`][hpoglue.problem.Problem.to_dict].
+
+        Unlike `name`, it covers everything that defines the problem and has a fixed
+        length, which makes it suitable as a key for caches and file names.
+        """
+        return content_hash(self.to_dict())
+
     @classmethod
     def from_dict(  # noqa: C901, PLR0912, PLR0915
         cls,
@@ -801,3 +797,258 @@ class Problem:
                             stacklevel=2,
                         )
                         problem.continuations = False
+
+
+def _resolve_fidelities(  # noqa: C901, PLR0912
+    benchmark: BenchmarkDescription,
+    fidelities: int | str | list[str] | None,
+    minimum_normalized_fidelity_value: float | None,
+) -> tuple[tuple[str, Fidelity] | Mapping[str, Fidelity] | None, float | None]:
+    # The fidelities of a problem and their default minimum normalized fidelity value
+    _minimum_normalized_fid = None
+    _fid: tuple[str, Fidelity] | Mapping[str, Fidelity] | None
+    match fidelities:
+        case int() if fidelities < 0:
+            raise ValueError(f"{fidelities=} must be >= 0")
+        case 0:
+            _fid = None
+        case None:
+            _fid = None
+        case 1:
+            if benchmark.fidelities is None:
+                raise ValueError(
+                    (
+                        f"Benchmark {benchmark.name} has no fidelities but {fidelities=} "
+                        "was requested"
+                    ),
+                )
+            _fid = first(benchmark.fidelities)
+            _minimum_normalized_fid = float(_fid[1].min / _fid[1].max)
+        case int():
+            if benchmark.fidelities is None:
+                raise ValueError(
+                    (
+                        f"Benchmark {benchmark.name} has no fidelities but {fidelities=} "
+                        "was requested"
+                    ),
+                )
+
+            if fidelities > len(benchmark.fidelities):
+                raise ValueError(
+                    f"{fidelities=} is greater than the number of fidelities"
+                    f" in benchmark {benchmark.name} which has "
+                    f"{len(benchmark.fidelities)} fidelities",
+                )
+
+            _fid = first_n(fidelities, benchmark.fidelities)
+            _minimum_normalized_fid = minimum_normalized_fidelity_value
+        case str():
+            if benchmark.fidelities is None:
+                raise ValueError(
+                    (
+                        f"Benchmark {benchmark.name} has no fidelities but {fidelities=} "
+                        "was requested"
+                    ),
+                )
+            if fidelities not in benchmark.fidelities:
+                raise ValueError(
+                    f"{fidelities=} not found in benchmark {benchmark.name} fidelities",
+                )
+            _fid = (fidelities, benchmark.fidelities[fidelities])
+            _minimum_normalized_fid = float(_fid[1].min / _fid[1].max)
+        case list():
+            if benchmark.fidelities is None:
+                raise ValueError(
+                    (
+                        f"Benchmark {benchmark.name} has no fidelities but {fidelities=} "
+                        "was requested"
+                    ),
+                )
+            if len(fidelities) > len(benchmark.fidelities):
+                raise ValueError(
+                    f"{fidelities=} is greater than the number of fidelities"
+                    f" in benchmark {benchmark.name} which has "
+                    f"{len(benchmark.fidelities)} fidelities",
+                )
+            _fid = {name: benchmark.fidelities[name] for name in fidelities}
+            _minimum_normalized_fid = minimum_normalized_fidelity_value
+        case _:
+            raise TypeError(f"{fidelities=} not supported")
+
+    return _fid, _minimum_normalized_fid
+
+
+def _resolve_objectives(  # noqa: C901, PLR0912
+    benchmark: BenchmarkDescription,
+    objectives: int | str | list[str],
+    multi_objective_generation: Literal["mix_metric_cost", "metric_only"],
+) -> tuple[str, Measure] | Mapping[str, Measure]:
+    _obj: tuple[str, Measure] | Mapping[str, Measure]
+    match objectives, multi_objective_generation:
+        # single objective
+        case int(), _ if objectives < 0:  # type: ignore
+            raise ValueError(f"{objectives=} must be >= 0")
+        case _, str() if multi_objective_generation not in {"mix_metric_cost", "metric_only"}:
+            raise ValueError(
+                f"{multi_objective_generation=} not supported, must be one"
+                " of 'mix_metric_cost', 'metric_only'",
+            )
+        case 1, _:
+            _obj = first(benchmark.metrics)
+        case int(), "metric_only":
+            if objectives > len(benchmark.metrics):  # type: ignore
+                raise ValueError(
+                    f"{objectives=} is greater than the number of metrics"
+                    f" in benchmark {benchmark.name} which has {len(benchmark.metrics)} metrics"
+                )
+            _obj = first_n(objectives, benchmark.metrics)  # type: ignore
+        case int(), "mix_metric_cost":
+            n_costs = 0 if benchmark.costs is None else len(benchmark.costs)
+            n_available = len(benchmark.metrics) + n_costs
+            if objectives > n_available:  # type: ignore
+                raise ValueError(
+                    f"{objectives=} is greater than the number of metrics and costs"
+                    f" in benchmark {benchmark.name} which has {n_available} objectives"
+                    " when combining metrics and costs",
+                )
+            if benchmark.costs is None:
+                _obj = first_n(objectives, benchmark.metrics)  # type: ignore
+            else:
+                _obj = mix_n(objectives, benchmark.metrics, benchmark.costs)  # type: ignore
+        case str(), _:
+            if objectives not in benchmark.metrics:
+                raise ValueError(
+                    f"{objectives=} not found in benchmark {benchmark.name} metrics",
+                )
+            _obj = (objectives, benchmark.metrics[objectives])  # type: ignore
+        case list(), "metric_only":
+            if len(objectives) > len(benchmark.metrics):  # type: ignore
+                raise ValueError(
+                    f"{objectives=} is greater than the number of metrics"
+                    f" in benchmark {benchmark.name} which has {len(benchmark.metrics)} metrics"
+                )
+            _obj = {name: benchmark.metrics[name] for name in objectives}  # type: ignore
+        case list(), "mix_metric_cost":
+            n_costs = 0 if benchmark.costs is None else len(benchmark.costs)
+            n_available = len(benchmark.metrics) + n_costs
+            if len(objectives) > n_available:  # type: ignore
+                raise ValueError(
+                    f"{objectives=} is greater than the number of metrics and costs"
+                    f" in benchmark {benchmark.name} which has {n_available} objectives"
+                    " when combining metrics and costs",
+                )
+            if benchmark.costs is None:
+                for obj in objectives:  # type: ignore
+                    if obj not in benchmark.metrics:
+                        raise ValueError(
+                            f"{obj=} not found in benchmark {benchmark.name} metrics",
+                        )
+                _obj = {name: benchmark.metrics[name] for name in objectives}  # type: ignore
+            else:
+                _obj = {}
+                for obj in objectives:  # type: ignore
+                    if obj in benchmark.metrics:
+                        _obj[obj] = benchmark.metrics[obj]
+                    elif obj in benchmark.costs:
+                        _obj[obj] = benchmark.costs[obj]
+                    else:
+                        raise ValueError(
+                            f"{obj=} not found in benchmark {benchmark.name} metrics or costs",
+                        )
+        case _, _:
+            raise RuntimeError(
+                f"Unexpected case with {objectives=}, {multi_objective_generation=}",
+            )
+
+    return _obj
+
+
+def _resolve_costs(
+    benchmark: BenchmarkDescription,
+    costs: int | None,
+) -> tuple[str, Measure] | Mapping[str, Measure] | None:
+    _cost: tuple[str, Measure] | Mapping[str, Measure] | None
+    match costs:
+        case int() if costs < 0:
+            raise ValueError(f"{costs=} must be >= 0")
+        case 0:
+            _cost = None
+        case None:
+            _cost = None
+        case 1:
+            if benchmark.costs is None:
+                raise ValueError(
+                    f"Benchmark {benchmark.name} has no costs but {costs=} was requested",
+                )
+            _cost = first(benchmark.costs)
+        case int():
+            if benchmark.costs is None:
+                raise ValueError(
+                    f"Benchmark {benchmark.name} has no costs but {costs=} was requested",
+                )
+            _cost = first_n(costs, benchmark.costs)
+        case _:
+            raise TypeError(f"{costs=} not supported")
+
+    return _cost
+
+
+def _resolve_budget(
+    budget: BudgetType | int | float,
+    minimum_normalized_fidelity_value: float | None,
+    default_minimum_normalized_fid: float | None,
+) -> BudgetType:
+    _budget: BudgetType
+    match budget:
+        case int() if budget < 0:
+            raise ValueError(f"{budget=} must be >= 0")
+        case int():
+            _minimum_normalized_fid = (
+                minimum_normalized_fidelity_value or default_minimum_normalized_fid or 0.01
+            )
+            _budget = TrialBudget(budget, _minimum_normalized_fid)
+        case float():
+            _budget = CostBudget(budget)
+        case TrialBudget():
+            _budget = budget
+        case CostBudget():
+            raise NotImplementedError("Cost budgets are not yet supported")
+        case _:
+            raise TypeError(f"Unexpected type for `{budget=}`: {type(budget)}")
+
+    return _budget
+
+
+def _resolve_priors(
+    priors: tuple[str, Mapping[str, Config] | Mapping[str, dict[str, Any]]] | None,
+) -> tuple[str, Mapping[str, Config]] | None:
+    match priors:
+        case None:
+            return None
+        case tuple():
+            return dict_to_configpriors(priors)
+        case _:
+            raise TypeError(f"Unexpected type for priors: {type(priors)}")
+
+
+def _support_key(
+    benchmark: BenchmarkDescription,
+    fidelities: tuple[str, Fidelity] | Mapping[str, Fidelity] | None,
+    objectives: tuple[str, Measure] | Mapping[str, Measure],
+    costs: tuple[str, Measure] | Mapping[str, Measure] | None,
+    *,
+    priors: bool,
+    continuations: bool,
+) -> tuple:
+    # Everything about a problem that `Problem.Support.check_opt_support()` depends on
+    def kind(x: tuple | Mapping | None) -> str | None:
+        return None if x is None else "many" if isinstance(x, Mapping) else "single"
+
+    return (
+        kind(fidelities),
+        kind(objectives),
+        kind(costs),
+        benchmark.is_tabular,
+        priors,
+        continuations,
+    )
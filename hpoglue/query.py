@@ -4,13 +4,14 @@ from collections.abc import Mapping
 from dataclasses import dataclass, field, replace
 from typing import TYPE_CHECKING, Any
 
+from hpoglue.hashing import content_hash
 from hpoglue.result import Result
 
 if TYPE_CHECKING:
     from hpoglue.config import Config
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Query:
     """A query to a benchmark."""
 
@@ -29,23 +30,12 @@ class Query:
     If a specific range is requested, then a tuple can be provided.
     """
 
-    query_id: str = field(init=False)
-    """The id of the query.
-
-    This includes information about the config id and fidelity.
-    """
+    _query_id: str | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         match self.fidelity:
-            case None:
-                self.query_id = self.config.config_id
-            case (name, value):
-                self.query_id = f"{self.config.config_id}-{name}={value}"
-            case Mapping():
-                self.query_id = (
-                    f"{self.config.config_id}-"
-                    f"{'-'.join(f'{k}={v}' for k, v in self.fidelity.items())}"
-                )
+            case None | (_, _) | Mapping():
+                pass
             case _:
                 raise NotImplementedError("Unexpected fidelity type")
 
@@ -60,11 +50,46 @@ class Query:
                         "Learning curve requested but more than a single fidelity provided"
                     )
 
+    @property
+    def query_id(self) -> str:
+        """The id of the query.
+
+        This includes information about the config id and fidelity.
+        It is only formatted once, when first accessed.
+        """
+        if self._query_id is None:
+            match self.fidelity:
+                case None:
+                    self._query_id = self.config.config_id
+                case (name, value):
+                    self._query_id = f"{self.config.config_id}-{name}={value}"
+                case Mapping():
+                    self._query_id = (
+                        f"{self.config.config_id}-"
+                        f"{'-'.join(f'{k}={v}' for k, v in self.fidelity.items())}"
+                    )
+                case _:
+                    raise NotImplementedError("Unexpected fidelity type")
+
+        return self._query_id
+
     @property
     def config_id(self) -> str:
         """The id of the config."""
         return self.config.config_id
 
+    def content_hash(self, precision: int | None = None) -> str:
+        """A stable hash of the config values and fidelity of the query.
+
+        Args:
+            precision: The precision to round the float values of the config to,
+                see [`Config.content_hash()`][hpoglue.config.Config.content_hash].
+
+        Returns:
+            The hash as a hex string.
+        """
+        return content_hash((self.config.content_hash(precision), self.fidelity))
+
     def with_fidelity(
         self,
         fidelity: tuple[str, int | float] | Mapping[str, int | float] | None,
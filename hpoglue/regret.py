@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+import pandas as pd
+
+from hpoglue.benchmark import BENCHMARK_CACHE, FunctionalBenchmark
+from hpoglue.dataframe_utils import result_column
+from hpoglue.query import Query
+
+if TYPE_CHECKING:
+    from hpoglue.benchmark import BenchmarkDescription
+    from hpoglue.measure import Measure
+
+logger = logging.getLogger(__name__)
+
+Oracle = Callable[["BenchmarkDescription", str], float | None]
+"""A function giving the optimum of an objective of a benchmark, or `None` if unknown."""
+
+
+class OptimumResolver:
+    """Resolves and caches the optimal value of the objectives of benchmarks.
+
+    The optimum of an objective is resolved from the first of these sources that has one:
+
+    1. The `oracle`, if given, e.g. a lookup of the known optima of a benchmark suite.
+    2. The [`Measure.optimum`][hpoglue.measure.Measure.optimum] of the objective, if finite.
+    3. The best value of the objective over the
+        [`predefined_points`][hpoglue.benchmark.BenchmarkDescription.predefined_points]
+        of the benchmark, queried at the highest fidelities. The benchmark is loaded
+        through the [`BENCHMARK_CACHE`][hpoglue.benchmark.BENCHMARK_CACHE].
+
+    Resolved optima are cached by benchmark name and objective.
+    """
+
+    def __init__(
+        self,
+        oracle: Oracle | Mapping[tuple[str, str], float] | None = None,
+        *,
+        predefined_points: bool = True,
+    ) -> None:
+        """Create a resolver.
+
+        Args:
+            oracle: A function `(benchmark, objective) -> optimum | None`, or a mapping
+                from `(benchmark_name, objective)` to the optimum.
+            predefined_points: Whether to query the predefined points of a benchmark
+                when no other source has an optimum.
+        """
+        if isinstance(oracle, Mapping):
+            known = dict(oracle)
+            oracle = lambda desc, objective: known.get((desc.name, objective))
+
+        self.oracle = oracle
+        self.predefined_points = predefined_points
+        self._optima: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def optimum(self, desc: BenchmarkDescription, objective: str) -> float:
+        """Get the optimal raw value of an objective of a benchmark.
+
+        Args:
+            desc: The benchmark.
+            objective: The name of a metric, test metric or cost of the benchmark.
+
+        Returns:
+            The optimum, in the raw values of the objective.
+
+        Raises:
+            ValueError: If no source has an optimum for the objective.
+        """
+        key = (desc.name, objective)
+        with self._lock:
+            optimum = self._optima.get(key)
+            if optimum is None:
+                optimum = self._resolve(desc, objective)
+                self._optima[key] = optimum
+
+        return optimum
+
+    def clear(self) -> None:
+        """Forget all resolved optima."""
+        with self._lock:
+            self._optima.clear()
+
+    def _resolve(self, desc: BenchmarkDescription, objective: str) -> float:
+        measure = objective_measure(desc, objective)
+        if self.oracle is not None and (optimum := self.oracle(desc, objective)) is not None:
+            return float(optimum)
+
+        if np.isfinite(measure.optimum):
+            return float(measure.optimum)
+
+        if self.predefined_points and desc.predefined_points:
+            values = _query_predefined_points(desc, objective)
+            if len(values) > 0:
+                best = min(values, key=measure.as_minimize)
+                logger.debug(f"Resolved {objective} of {desc.name} to {best} by its points.")
+                return best
+
+        raise ValueError(
+            f"Can not resolve the optimum of {objective=} of benchmark {desc.name}, its"
+            f" measure has bounds {measure.bounds} and no predefined point has a value."
+            " Please provide an `oracle`."
+        )
+
+
+OPTIMA = OptimumResolver()
+"""The resolver of optima used by [`regret()`][hpoglue.regret.regret] by default."""
+
+
+def objective_measure(desc: BenchmarkDescription, objective: str) -> Measure:
+    """Get the measure of a metric, test metric or cost of a benchmark."""
+    measure = _find_measure(desc, objective)
+    if measure is None:
+        raise KeyError(f"{objective=} is not a metric, test metric or cost of {desc.name}")
+
+    return measure
+
+
+def _find_measure(desc: BenchmarkDescription, objective: str) -> Measure | None:
+    for measures in (desc.metrics, desc.test_metrics, desc.costs):
+        if measures is not None and objective in measures:
+            return measures[objective]
+
+    return None
+
+
+def regret(
+    df: pd.DataFrame,
+    benchmarks: Iterable[BenchmarkDescription | FunctionalBenchmark]
+    | Mapping[str, BenchmarkDescription | FunctionalBenchmark],
+    objectives: str | Sequence[str],
+    *,
+    resolver: OptimumResolver | None = None,
+    normalize: bool = True,
+    infinite_bounds: Literal["raise", "observed"] = "observed",
+) -> pd.DataFrame:
+    """Add the regret of every result of a results frame for some objectives.
+
+    The simple regret of a result is the distance of its value to the optimum of the
+    objective on its benchmark, such that `0` is optimal and larger is worse, for both
+    minimized and maximized objectives.
+
+    The normalized regret divides it by the distance between the optimum and the worst
+    value, given by the opposite bound of the [`Measure`][hpoglue.measure.Measure].
+
+    The optimum of each benchmark and objective is resolved once, the regret of all rows
+    is then computed at once by looking up the optimum of the benchmark of each row.
+
+    ```python
+    df = regret(df, [BENCHMARKS["branin"]], "y")
+    traces = inc_traces(df, y_col="regret.y")
+    ```
+
+    Args:
+        df: The results frame, nested as returned by `run_glue` or flat, with a
+            `benchmark` column.
+        benchmarks: The descriptions of the benchmarks in the frame.
+        objectives: The objectives to compute the regret of. Rows of benchmarks without
+            an objective get a `NaN` regret for it.
+        resolver: The resolver of the optima, defaults to the shared
+            [`OPTIMA`][hpoglue.regret.OPTIMA].
+        normalize: Whether to also add the normalized regret.
+        infinite_bounds: What to do when the worst bound of an objective is infinite
+            when normalizing.
+
+            * `"raise"`: Raise a `ValueError`.
+            * `"observed"`: Use the worst value of the objective observed on the
+                benchmark in `df` instead.
+
+    Returns:
+        A copy of `df` with a `regret.<objective>` and, if `normalize`, a
+        `normalized_regret.<objective>` column per objective.
+    """
+    resolver = resolver if resolver is not None else OPTIMA
+    objectives = [objectives] if isinstance(objectives, str) else list(objectives)
+    if not isinstance(benchmarks, Mapping):
+        benchmarks = {b.name: b for b in benchmarks}
+    benchmarks = {
+        name: b.desc if isinstance(b, FunctionalBenchmark) else b for name, b in benchmarks.items()
+    }
+
+    codes, names = pd.factorize(df["benchmark"], sort=False)
+    missing = [name for name in names if name not in benchmarks]
+    if missing:
+        raise KeyError(f"No benchmark description given for {missing} in the results frame.")
+
+    descs = [benchmarks[name] for name in names]
+    columns = {}
+    for objective in objectives:
+        # NOTE: Rows of benchmarks without the objective get a `NaN` regret.
+        measures = [_find_measure(desc, objective) for desc in descs]
+        if all(m is None for m in measures):
+            raise KeyError(f"{objective=} is not an objective of any of the benchmarks {names}")
+
+        sign = np.array([np.nan if m is None else 1.0 if m.minimize else -1.0 for m in measures])
+        optima = np.array(
+            [
+                np.nan if m is None else m.as_minimize(resolver.optimum(d, objective))
+                for d, m in zip(descs, measures, strict=True)
+            ]
+        )
+
+        values = result_column(df, objective).astype(np.float64) * sign[codes]
+        simple = values - optima[codes]
+        columns[f"regret.{objective}"] = simple
+        if not normalize:
+            continue
+
+        worst = np.array(
+            [
+                np.nan if m is None else m.as_minimize(m.bounds[1] if m.minimize else m.bounds[0])
+                for m in measures
+            ]
+        )
+        if np.isinf(worst).any():
+            match infinite_bounds:
+                case "raise":
+                    raise ValueError(
+                        f"Can not normalize the regret of {objective=} by infinite bounds."
+                        " Use `infinite_bounds='observed'` to use the observed worst instead."
+                    )
+                case "observed":
+                    observed = np.full(len(names), -np.inf)
+                    finite = np.isfinite(values)
+                    np.fmax.at(observed, codes[finite], values[finite])
+                    worst = np.where(np.isinf(worst), observed, worst)
+                case _:
+                    raise ValueError(f"Unknown {infinite_bounds=}")
+
+        span = worst - optima
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalized = np.where(span[codes] > 0, simple / span[codes], 0.0)
+        columns[f"normalized_regret.{objective}"] = np.where(np.isnan(simple), np.nan, normalized)
+
+    return df.assign(**columns)
+
+
+def _query_predefined_points(desc: BenchmarkDescription, objective: str) -> list[float]:
+    fidelity: tuple[str, int | float] | Mapping[str, int | float] | None
+    match desc.fidelities:
+        case None:
+            fidelity = None
+        case Mapping() if len(desc.fidelities) == 1:
+            ((name, fid),) = desc.fidelities.items()
+            fidelity = (name, fid.max)
+        case Mapping():
+            fidelity = {name: fid.max for name, fid in desc.fidelities.items()}
+        case _:
+            raise TypeError(f"Unexpected fidelities {desc.fidelities}")
+
+    benchmark = BENCHMARK_CACHE.load(desc)
+    values = []
+    assert desc.predefined_points is not None
+    for config in desc.predefined_points.values():
+        result = benchmark.query(Query(config=config, fidelity=fidelity))
+        value = result.values.get(objective)
+        if value is not None and np.isfinite(value):
+            values.append(float(value))
+
+    return values
@@ -5,15 +5,15 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
+import pandas as pd
 
 if TYPE_CHECKING:
-    import pandas as pd
-
     from hpoglue.config import Config
     from hpoglue.query import Query
+    from hpoglue.trajectory import TrajectoryView
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Result:
     """The result of a query from a benchmark."""
 
@@ -43,15 +43,17 @@ class Result:
     continuations_budget_used_total: float = np.nan
     """The amount of budget used in total if continuations is set to True."""
 
-    trajectory: pd.DataFrame | None = None
+    trajectory: TrajectoryView | pd.DataFrame | None = None
     """If given, the trajectory of the query up to the given fidelity.
 
     This will only provided if:
     * The problem says it should be provided.
     * There is only a single fidelity parameter.
 
-    It will be multi-indexed, with the multi indexing consiting of the
-    config id and the fidelity.
+    During a run, this is a [`TrajectoryView`][hpoglue.trajectory.TrajectoryView] into the
+    curves shared by all results of the run, use
+    [`trajectory_frame()`][hpoglue.result.Result.trajectory_frame] to get it as a
+    `DataFrame` indexed by the fidelity.
     """
 
     @property
@@ -59,18 +61,26 @@ class Result:
         """The config."""
         return self.query.config
 
+    def trajectory_frame(self) -> pd.DataFrame | None:
+        """The trajectory of the query as a `DataFrame`, if one was provided."""
+        match self.trajectory:
+            case None:
+                return None
+            case pd.DataFrame():
+                return self.trajectory
+            case _:
+                return self.trajectory.to_frame()
+
     def _to_dict(self) -> dict[str, Any]:
         """Convert the result to a dictionary."""
-        members = [
-            attr for attr in dir(self)
-            if not callable(getattr(self, attr)) and not attr.startswith("__")
-        ]
-        members.remove("query")
-        members.remove("config")
-        members.remove("trajectory")
-
-        _self_dict = {attr: getattr(self, attr) for attr in members}
-        _self_dict.update(self.query._to_dict())
-        _self_dict["results"] = _self_dict.pop("values")
-
-        return _self_dict
\ No newline at end of file
+        return {
+            "budget_cost": self.budget_cost,
+            "budget_used_total": self.budget_used_total,
+            "continuations_budget_cost": self.continuations_budget_cost,
+            "continuations_budget_used_total": self.continuations_budget_used_total,
+            "continuations_cost": self.continuations_cost,
+            "fidelity": self.query.fidelity,
+            "config_id": self.query.config_id,
+            "config": self.query.config.values,
+            "results": self.values,
+        }
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from numbers import Number
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from hpoglue.config import Config
+    from hpoglue.result import Result
+
+logger = logging.getLogger(__name__)
+
+BUDGET_COLUMNS = (
+    "budget_cost",
+    "budget_used_total",
+    "continuations_cost",
+    "continuations_budget_cost",
+    "continuations_budget_used_total",
+)
+"""The budget fields of a [`Result`][hpoglue.result.Result] stored for every result."""
+
+
+class ResultStore:
+    """A run history stored as typed column arrays instead of a list of results.
+
+    Every appended [`Result`][hpoglue.result.Result] is written into a set of columns,
+    which all grow together by doubling their capacity:
+
+    * `config_index`: The index of the result's config in
+        [`configs`][hpoglue.result_store.ResultStore.configs].
+    * `fidelity.<name>`: The value of each fidelity the query was made at.
+    * `results.<key>`: Every value returned by the benchmark, e.g. metrics and costs.
+    * The budget fields of the result, see [`BUDGET_COLUMNS`][hpoglue.result_store.BUDGET_COLUMNS].
+
+    Numeric values are stored as `float64`, with `NaN` where a result has no value for a
+    column, anything else in an `object` column with `None` as the missing value.
+    Columns are added as soon as a result with a new key is appended.
+
+    ```python
+    store = ResultStore()
+    _run(problem, seed=0, result_store=store)
+    df = store.to_pandas()
+    ```
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """Create an empty store.
+
+        Args:
+            capacity: The number of results to allocate space for up front.
+        """
+        if capacity < 1:
+            raise ValueError(f"{capacity=} must be >= 1")
+
+        self.configs: list[Config] = []
+        """The unique configs of the stored results, indexed by `config_index`."""
+
+        self._capacity = capacity
+        self._size = 0
+        self._config_index: dict[str, int] = {}
+        self._column_names: dict[tuple[str, str], str] = {}
+        self._columns: dict[str, np.ndarray] = {
+            "config_index": np.empty(capacity, dtype=np.int64),
+            **{name: np.full(capacity, np.nan) for name in BUDGET_COLUMNS},
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def columns(self) -> list[str]:
+        """The names of the stored columns."""
+        return list(self._columns)
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a view of a column, without copying it.
+
+        The view is only valid until the next result is appended, as the store may
+        need to reallocate its columns to grow.
+        """
+        return self._columns[name][: self._size]
+
+    def append(self, result: Result) -> None:
+        """Add a result to the store."""
+        if self._size == self._capacity:
+            self._grow(2 * self._capacity)
+
+        i = self._size
+        columns = self._columns
+
+        config = result.query.config
+        config_index = self._config_index.get(config.config_id)
+        if config_index is None:
+            config_index = len(self.configs)
+            self._config_index[config.config_id] = config_index
+            self.configs.append(config)
+
+        columns["config_index"][i] = config_index
+        columns["budget_cost"][i] = result.budget_cost
+        columns["budget_used_total"][i] = result.budget_used_total
+        columns["continuations_cost"][i] = result.continuations_cost
+        columns["continuations_budget_cost"][i] = result.continuations_budget_cost
+        columns["continuations_budget_used_total"][i] = result.continuations_budget_used_total
+
+        match result.query.fidelity:
+            case None:
+                pass
+            case (name, value):
+                self._set(self._column_name("fidelity", name), i, value)
+            case Mapping():
+                for name, value in result.query.fidelity.items():
+                    self._set(self._column_name("fidelity", name), i, value)
+            case _:
+                raise TypeError(f"Unexpected fidelity type {type(result.query.fidelity)}")
+
+        for key, value in result.values.items():
+            self._set(self._column_name("results", key), i, value)
+
+        self._size += 1
+
+    def extend(self, results: Iterable[Result]) -> None:
+        """Add many results to the store."""
+        for result in results:
+            self.append(result)
+
+    def to_numpy(self) -> dict[str, np.ndarray]:
+        """Get all the columns as numpy arrays, without copying them.
+
+        Returns:
+            A view of each column, valid until the next result is appended.
+        """
+        return {name: array[: self._size] for name, array in self._columns.items()}
+
+    def config_frame(self) -> pd.DataFrame:
+        """Get the unique configs of the results as a frame, indexed by `config_index`."""
+        return pd.DataFrame.from_records(
+            [config.values for config in self.configs],
+            index=pd.RangeIndex(len(self.configs), name="config_index"),
+        ).assign(config_id=[config.config_id for config in self.configs])
+
+    def to_pandas(self, *, configs: bool = False) -> pd.DataFrame:
+        """Get the stored results as a DataFrame.
+
+        Args:
+            configs: Whether to join the `config_id` and the `config.<hp>` values of the
+                configs onto every row. If `False`, the columns are not copied.
+
+        Returns:
+            A frame with a row per result.
+        """
+        df = pd.DataFrame(self.to_numpy(), copy=False)
+        if not configs:
+            return df
+
+        config_frame = self.config_frame()
+        config_frame = config_frame.rename(
+            columns={c: f"config.{c}" for c in config_frame.columns if c != "config_id"}
+        )
+        rows = config_frame.take(df["config_index"].to_numpy())
+        return pd.concat([df, rows.reset_index(drop=True)], axis=1)
+
+    def to_arrow(self, *, configs: bool = False) -> pa.Table:
+        """Get the stored results as a `pyarrow.Table`.
+
+        Numeric columns are wrapped without copying. Object columns holding values of
+        mixed types, e.g. strings and numbers, which arrow can not store in one column,
+        are exported as strings, with `None` kept as null.
+
+        Requires `pyarrow` to be installed, e.g. with `pip install hpoglue[arrow]`.
+
+        Args:
+            configs: Whether to add the `config_id` and the `config.<hp>` values of the
+                configs to every row, as in
+                [`to_pandas()`][hpoglue.result_store.ResultStore.to_pandas].
+
+        Returns:
+            A table with a row per result.
+        """
+        # NOTE: `pyarrow` is optional, only required when exporting.
+        try:
+            import pyarrow as pa  # noqa: PLC0415
+        except ImportError as e:
+            raise ImportError(
+                "`pyarrow` is required to export a ResultStore to arrow."
+                " Install it with `pip install hpoglue[arrow]`."
+            ) from e
+
+        columns = self.to_numpy()
+        if configs:
+            config_frame = self.config_frame().take(columns["config_index"])
+            columns.update(
+                {
+                    name if name == "config_id" else f"config.{name}": column.to_numpy()
+                    for name, column in config_frame.items()
+                }
+            )
+
+        arrays = {}
+        for name, array in columns.items():
+            if array.dtype != object:
+                arrays[name] = pa.array(array)
+                continue
+
+            values = array.tolist()
+            try:
+                arrays[name] = pa.array(values, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                logger.warning(f"Column {name} holds values of mixed types, exporting as strings.")
+                arrays[name] = pa.array([None if v is None else str(v) for v in values])
+
+        return pa.table(arrays)
+
+    def _column_name(self, group: str, key: str) -> str:
+        # NOTE: Avoids formatting a new column name string for every value appended.
+        name = self._column_names.get((group, key))
+        if name is None:
+            name = f"{group}.{key}"
+            self._column_names[(group, key)] = name
+        return name
+
+    def _grow(self, capacity: int) -> None:
+        for name, array in self._columns.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[: self._size] = array[: self._size]
+            grown[self._size :] = _missing(array.dtype)
+            self._columns[name] = grown
+
+        self._capacity = capacity
+
+    def _set(self, name: str, i: int, value: Any) -> None:
+        column = self._columns.get(name)
+        numeric = isinstance(value, Number) and not isinstance(value, complex)
+        if column is None:
+            dtype = np.float64 if numeric else object
+            column = np.full(self._capacity, _missing(dtype), dtype=dtype)
+            self._columns[name] = column
+        elif not numeric and column.dtype != object:
+            logger.debug(f"Column {name} received a non-numeric value, storing it as objects.")
+            # NOTE: `None` is the only missing value of object columns, also for the rows
+            # that were missing before the conversion.
+            missing = np.isnan(column)
+            column = column.astype(object)
+            column[missing] = None
+            self._columns[name] = column
+
+        column[i] = value
+
+
+def _missing(dtype: Any) -> Any:
+    match np.dtype(dtype).kind:
+        case "f":
+            return np.nan
+        case "i":
+            return -1
+        case _:
+            return None
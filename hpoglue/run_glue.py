@@ -1,17 +1,20 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import TYPE_CHECKING, Any
 
 import pandas as pd
 
 from hpoglue import Config, FunctionalBenchmark, Problem
 from hpoglue._run import _run
+from hpoglue.dataframe_utils import compact_results
 from hpoglue.utils import dict_to_configpriors
 
 if TYPE_CHECKING:
     from hpoglue.benchmark import BenchmarkDescription
     from hpoglue.budget import BudgetType
+    from hpoglue.callbacks import Callback
+    from hpoglue.env import Venv
     from hpoglue.optimizer import Optimizer
 
 
@@ -29,6 +32,10 @@ def run_glue(  # noqa: C901, PLR0912, PLR0913
     continuations: bool = True,
     use_continuations_as_budget: bool = False,
     priors: tuple[str, Mapping[str, Config | Mapping[str, Any]]] | None = None,
+    benchmark_venv: Venv | None = None,
+    cache_benchmark: bool = False,
+    compact: bool = False,
+    callbacks: Sequence[Callback] = (),
 ) -> pd.DataFrame:
     """Run the glue function using the specified optimizer, benchmark, and hyperparameters.
 
@@ -83,6 +90,20 @@ def run_glue(  # noqa: C901, PLR0912, PLR0913
                     over which the prior is defined + some unique identifier
                     (eg: value1_good_value2_bad).
 
+        benchmark_venv: If given, the benchmark is loaded once in a persistent worker
+            process running in this virtual environment and all queries are sent to it.
+            See [`BenchmarkWorker`][hpoglue.worker.BenchmarkWorker].
+
+        cache_benchmark: Whether to reuse the loaded benchmark across runs in this process.
+            Cached benchmarks stay in memory after the run, see
+            [`BENCHMARK_CACHE`][hpoglue.benchmark.BENCHMARK_CACHE].
+
+        compact: Whether to return a flat frame with categorical metadata columns.
+            See [`compact_results()`][hpoglue.dataframe_utils.compact_results].
+
+        callbacks: Callbacks to hook into the run loop, e.g. to monitor the run.
+            See [`Callback`][hpoglue.callbacks.Callback].
+
     Returns:
         The result of the _run function as a pandas DataFrame.
     """
@@ -111,38 +132,44 @@ def run_glue(  # noqa: C901, PLR0912, PLR0913
         problem=problem,
         seed=seed,
         use_continuations_as_budget=use_continuations_as_budget,
+        benchmark_venv=benchmark_venv,
+        cache_benchmark=cache_benchmark,
+        callbacks=callbacks,
     )
     _df = pd.DataFrame([res._to_dict() for res in history])
     fidelities = problem.get_fidelities()
+    _fidelities: list[str] | list[list[str]] | None
     match fidelities:
         case None:
             _fidelities = None
         case str():
             _fidelities = [fidelities] * len(_df)
         case list():
-            _fidelities = fidelities * len(_df)
+            _fidelities = [fidelities] * len(_df)
         case _:
             raise ValueError(f"Unsupported fidelities type: {type(fidelities)}")
 
     costs = problem.get_costs()
+    _costs: list[str] | list[list[str]] | None
     match costs:
         case None:
             _costs = None
         case str():
             _costs = [costs] * len(_df)
         case list():
-            _costs = costs * len(_df)
+            _costs = [costs] * len(_df)
         case _:
             raise ValueError(f"Unsupported costs type: {type(costs)}")
 
     objs = problem.get_objectives()
+    _objectives: list[str] | list[list[str]] | None
     match objs:
         case None:
             _objectives = None
         case str():
             _objectives = [objs] * len(_df)
         case list():
-            _objectives = objs * len(_df)
+            _objectives = [objs] * len(_df)
         case _:
             raise ValueError(f"Unsupported objectives type: {type(objs)}")
 
@@ -156,9 +183,13 @@ def run_glue(  # noqa: C901, PLR0912, PLR0913
         )
     else:
         _df["optimizer_hps"] = "default"
-    return _df.assign(
+    _df = _df.assign(
         benchmark=problem.benchmark.name,
         objectives=_objectives,
         fidelities=_fidelities,
         costs=_costs,
-    )
\ No newline at end of file
+    )
+    if compact:
+        return compact_results(_df)
+
+    return _df
\ No newline at end of file
@@ -0,0 +1,322 @@
+"""Bootstrap statistics to compare optimizers over benchmarks and seeds.
+
+The results are first reduced to a
+[`PerformanceMatrix`][hpoglue.stats.PerformanceMatrix], with one row per block, i.e. a
+benchmark and seed, and one column per optimizer, holding the final incumbent or the
+area under the incumbent curve of every run. Resampling then only works on this matrix:
+
+```python
+matrix = PerformanceMatrix.from_results(df, y_col="normalized_regret.value")
+stats = bootstrap(matrix, n_resamples=10_000, n_jobs=4)
+stats.intervals
+stats.pairs
+```
+
+As the optimizers are compared by their mean over all blocks, objectives of different
+scales should be normalized first, e.g. with [`regret()`][hpoglue.regret.regret].
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+from hpoglue.dataframe_utils import RUN_KEYS, align_to_grid, inc_traces, make_grid
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PerformanceMatrix:
+    """The performance of every optimizer on every block of benchmark and seed."""
+
+    values: np.ndarray
+    """A `(n_blocks, n_optimizers)` array of the performances, where lower is better."""
+
+    optimizers: list[str]
+    """The names of the optimizers, in the order of the columns of `values`.
+
+    An optimizer with non-default hyperparameters is named `<optimizer>:<optimizer_hps>`.
+    """
+
+    blocks: pd.DataFrame
+    """The keys of the blocks, e.g. their `benchmark` and `seed`, in the order of the rows."""
+
+    strata: np.ndarray
+    """The stratum of every block, e.g. its benchmark, which resampling stays within."""
+
+    @classmethod
+    def from_results(
+        cls,
+        df: pd.DataFrame,
+        *,
+        y_col: str,
+        measure: Literal["final", "auc"] = "final",
+        x_col: str = "budget_used_total",
+        minimize: bool = True,
+        grid: int | np.ndarray = 100,
+        blocks: Sequence[str] = ("benchmark", "seed"),
+        strata: Sequence[str] = ("benchmark",),
+    ) -> PerformanceMatrix:
+        """Build the matrix from a results frame, in a single pass over all runs.
+
+        Blocks where any of the optimizers has no run or no incumbent are dropped.
+
+        Args:
+            df: The results frame, nested as returned by `run_glue` or flat.
+            y_col: The result key the incumbent is chosen by.
+            measure: The performance of a run.
+
+                * `"final"`: The value of the final incumbent.
+                * `"auc"`: The mean incumbent value over `grid`, i.e. the normalized area
+                    under the incumbent curve. Before the first incumbent of a run, its
+                    first incumbent value is used.
+
+            x_col: The column to order the results of a run by.
+            minimize: Whether lower values of `y_col` are better.
+            grid: The grid for `"auc"`, in increasing order, or the number of evenly
+                spaced points between the lowest and highest `x_col` value of each
+                stratum, such that benchmarks with different budgets are all covered by
+                their own grid.
+            blocks: The columns identifying a block. Every optimizer may have at most
+                one run per block.
+            strata: Columns of `blocks` identifying the stratum of a block.
+
+        Returns:
+            The performance matrix, oriented such that lower is better.
+        """
+        blocks, strata = list(blocks), list(strata)
+        if not set(strata) <= set(blocks):
+            raise ValueError(f"The {strata=} columns must be part of {blocks=}.")
+
+        optimizer_by = [c for c in ("optimizer", "optimizer_hps") if c in df.columns]
+        # NOTE: Runs are kept apart by all their keys, such that several runs of an
+        # optimizer in one block are detected rather than merged.
+        run_by = [*blocks, *optimizer_by]
+        run_by += [c for c in RUN_KEYS if c in df.columns and c not in run_by]
+        traces = inc_traces(df, y_col=y_col, x_col=x_col, minimize=minimize, by=run_by)
+
+        match measure:
+            case "final":
+                last = traces.groupby(run_by, sort=True, observed=True).tail(1)
+                runs = last[run_by].reset_index(drop=True)
+                performance = last["y"].to_numpy(dtype=np.float64)
+            case "auc":
+                runs, values = _align_per_stratum(
+                    traces, grid, x_col=x_col, by=run_by, strata=strata
+                )
+                # NOTE: Only the start of a curve is missing, fill it with the first value.
+                first = np.argmax(~np.isnan(values), axis=1)
+                start = values[np.arange(len(values)), first]
+                values = np.where(np.isnan(values), start[:, None], values)
+                performance = values.mean(axis=1)
+            case _:
+                raise ValueError(f"Unknown {measure=}")
+
+        if not minimize:
+            performance = -performance
+
+        names = _optimizer_names(runs, optimizer_by)
+        optimizers = sorted(set(names))
+        block = runs.groupby(blocks, sort=True, observed=True).ngroup().to_numpy()
+        column = np.searchsorted(optimizers, names)
+
+        shape = (block.max(initial=-1) + 1, len(optimizers))
+        present = np.zeros(shape, dtype=bool)
+        present[block, column] = True
+        if present.sum() != len(runs):
+            raise ValueError(f"Every optimizer may only have one run per block of {blocks=}.")
+
+        matrix = np.full(shape, np.nan)
+        matrix[block, column] = performance
+        block_keys = runs.drop_duplicates(blocks).sort_values(blocks)[blocks]
+
+        complete = ~np.isnan(matrix).any(axis=1)
+        if not complete.all():
+            logger.warning(
+                f"Dropping {np.sum(~complete)} of {len(matrix)} blocks where not every"
+                " optimizer has a result."
+            )
+
+        block_keys = block_keys[complete].reset_index(drop=True)
+        stratum = (
+            block_keys.groupby(strata, sort=True, observed=True).ngroup().to_numpy()
+            if strata
+            else np.zeros(len(block_keys), dtype=np.int64)
+        )
+        return cls(
+            values=matrix[complete],
+            optimizers=optimizers,
+            blocks=block_keys,
+            strata=stratum,
+        )
+
+
+@dataclass(frozen=True)
+class BootstrapResult:
+    """The bootstrap statistics of a [`PerformanceMatrix`][hpoglue.stats.PerformanceMatrix]."""
+
+    means: np.ndarray
+    """A `(n_resamples, n_optimizers)` array of the mean performance in every resample."""
+
+    intervals: pd.DataFrame
+    """The `mean` performance of every `optimizer`, with the `lower` and `upper` bound of
+    its confidence interval."""
+
+    pairs: pd.DataFrame
+    """A row for every ordered pair of optimizers `a` and `b`, with:
+
+    * `mean_diff`: The mean performance of `a` minus that of `b`, lower means `a` is better.
+    * `lower`, `upper`: The confidence interval of `mean_diff`.
+    * `win_probability`: The fraction of resamples in which `a` has a better mean than `b`,
+        counting ties as half.
+    * `block_win_rate`: The fraction of blocks in which `a` beats `b`, counting ties as half.
+    """
+
+
+def bootstrap(
+    matrix: PerformanceMatrix,
+    *,
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int | np.random.SeedSequence = 0,
+    n_jobs: int = 1,
+    batch_size: int = 1_000,
+) -> BootstrapResult:
+    """Compute bootstrap confidence intervals and win probabilities of optimizers.
+
+    Every resample draws the blocks of each stratum with replacement, keeping the
+    performance of all optimizers on a block together, so that comparisons are paired.
+    The resamples are drawn in batches, each from its own child of `seed`, and the mean
+    performance of a whole batch is computed with a single matrix product. The results
+    are the same for any `n_jobs`.
+
+    Args:
+        matrix: The performance matrix.
+        n_resamples: The number of bootstrap resamples.
+        confidence: The confidence level of the intervals.
+        seed: The seed of the resampling.
+        n_jobs: The number of processes to draw the batches in. If `1`, they are drawn
+            in this process.
+        batch_size: The number of resamples in a batch.
+
+    Returns:
+        The bootstrap statistics.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(f"{confidence=} must be in (0, 1)")
+
+    values = matrix.values
+    strata = [np.flatnonzero(matrix.strata == s) for s in np.unique(matrix.strata)]
+    sizes = [min(batch_size, n_resamples - start) for start in range(0, n_resamples, batch_size)]
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    seeds = seed_seq.spawn(len(sizes))
+
+    if n_jobs == 1:
+        batches = [_resample_means(values, strata, n, s) for n, s in zip(sizes, seeds, strict=True)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            batches = list(
+                pool.map(
+                    _resample_means,
+                    [values] * len(sizes),
+                    [strata] * len(sizes),
+                    sizes,
+                    seeds,
+                )
+            )
+
+    means = np.concatenate(batches) if batches else np.empty((0, values.shape[1]))
+    alpha = (1 - confidence) / 2
+    quantiles = [alpha, 1 - alpha]
+
+    lower, upper = np.quantile(means, quantiles, axis=0)
+    intervals = pd.DataFrame(
+        {
+            "optimizer": matrix.optimizers,
+            "mean": values.mean(axis=0),
+            "lower": lower,
+            "upper": upper,
+        }
+    )
+
+    # Every ordered pair at once, as `(n_resamples, a, b)` and `(n_blocks, a, b)` arrays
+    diffs = means[:, :, None] - means[:, None, :]
+    block_diffs = values[:, :, None] - values[:, None, :]
+    diff_lower, diff_upper = np.quantile(diffs, quantiles, axis=0)
+    win_probability = np.mean(diffs < 0, axis=0) + np.mean(diffs == 0, axis=0) / 2
+    block_win_rate = np.mean(block_diffs < 0, axis=0) + np.mean(block_diffs == 0, axis=0) / 2
+
+    a, b = np.nonzero(~np.eye(len(matrix.optimizers), dtype=bool))
+    names = np.array(matrix.optimizers, dtype=object)
+    pairs = pd.DataFrame(
+        {
+            "a": names[a],
+            "b": names[b],
+            "mean_diff": block_diffs.mean(axis=0)[a, b],
+            "lower": diff_lower[a, b],
+            "upper": diff_upper[a, b],
+            "win_probability": win_probability[a, b],
+            "block_win_rate": block_win_rate[a, b],
+        }
+    )
+    return BootstrapResult(means=means, intervals=intervals, pairs=pairs)
+
+
+def _resample_means(
+    values: np.ndarray,
+    strata: list[np.ndarray],
+    n_resamples: int,
+    seed: np.random.SeedSequence,
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    totals = np.zeros((n_resamples, values.shape[1]))
+    for blocks in strata:
+        n = len(blocks)
+        draws = rng.integers(0, n, size=(n_resamples, n))
+
+        # How often every block is drawn in each resample, as a `(n_resamples, n)` array
+        flat = (draws + np.arange(n_resamples)[:, None] * n).ravel()
+        counts = np.bincount(flat, minlength=n_resamples * n).reshape(n_resamples, n)
+        totals += counts @ values[blocks]
+
+    return totals / len(values)
+
+
+def _align_per_stratum(
+    traces: pd.DataFrame,
+    grid: int | np.ndarray,
+    *,
+    x_col: str,
+    by: list[str],
+    strata: list[str],
+) -> tuple[pd.DataFrame, np.ndarray]:
+    # NOTE: Strata, e.g. benchmarks, can have very different budgets, so each gets its own
+    # grid. There are few strata, all runs within one are still aligned at once.
+    if not strata or not isinstance(grid, int):
+        return align_to_grid(traces, make_grid(traces, grid, x_col=x_col), x_col=x_col, by=by)
+
+    aligned = [
+        align_to_grid(stratum, make_grid(stratum, grid, x_col=x_col), x_col=x_col, by=by)
+        for _, stratum in traces.groupby(strata, sort=True, observed=True)
+    ]
+    if not aligned:
+        return align_to_grid(traces, np.zeros(grid), x_col=x_col, by=by)
+
+    runs = pd.concat([runs for runs, _ in aligned], ignore_index=True)
+    return runs, np.concatenate([values for _, values in aligned])
+
+
+def _optimizer_names(runs: pd.DataFrame, optimizer_by: list[str]) -> np.ndarray:
+    names: np.ndarray = runs["optimizer"].astype(str).to_numpy(dtype=object)
+    if "optimizer_hps" in optimizer_by:
+        hps = runs["optimizer_hps"].astype(str).to_numpy(dtype=object)
+        custom = hps != "default"
+        names[custom] = names[custom] + ":" + hps[custom]
+    return names
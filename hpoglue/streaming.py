@@ -0,0 +1,370 @@
+"""Aggregation of result collections too large to load into memory at once.
+
+The results are read chunk by chunk, e.g. from the parquet files of a
+[`RunArchive`][hpoglue.archive.RunArchive] or from csv files, and folded into a
+[`StreamingAggregator`][hpoglue.streaming.StreamingAggregator], which only keeps the
+incumbent traces and a small state per run:
+
+```python
+agg = aggregate_files(archive.files(benchmarks=["ackley"]), y_col="y")
+traces = agg.traces()
+ranks = agg.ranks()
+```
+
+Aggregators over disjoint sets of files can be built in parallel and combined with
+[`merge()`][hpoglue.streaming.StreamingAggregator.merge].
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from hpoglue.dataframe_utils import RUN_KEYS, inc_traces, result_column
+
+if TYPE_CHECKING:
+    from hpoglue.archive import ArchiveFile
+
+logger = logging.getLogger(__name__)
+
+_PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+class StreamingAggregator:
+    """Incrementally computes incumbent traces and final performance of many runs.
+
+    Chunks of results are added with [`update()`][hpoglue.streaming.StreamingAggregator.update].
+    Memory is bounded by the size of a chunk plus the incumbent traces, as only the
+    current incumbent, the number of results and the last `x_col` value of every run are
+    carried over from one chunk to the next.
+
+    The results of a run may be spread over any number of chunks, but must arrive in
+    increasing order of `x_col`, as written by `run_glue`.
+    """
+
+    def __init__(
+        self,
+        *,
+        y_col: str,
+        x_col: str = "budget_used_total",
+        test_y_col: str | None = None,
+        minimize: bool = True,
+        by: Sequence[str] = RUN_KEYS,
+    ) -> None:
+        """Create an empty aggregator.
+
+        Args:
+            y_col: The result key the incumbent is chosen by.
+            x_col: The numeric column to order the results of a run by.
+            test_y_col: An optional result key to report alongside the incumbents.
+            minimize: Whether lower values of `y_col` are better.
+            by: The columns identifying a run. Columns missing from the results are
+                ignored.
+        """
+        self.y_col = y_col
+        self.x_col = x_col
+        self.test_y_col = test_y_col
+        self.minimize = minimize
+        self.by = list(by)
+
+        self._by: list[str] | None = None
+        self._traces: list[pd.DataFrame] = []
+        self._state: pd.DataFrame | None = None
+
+    @property
+    def value_columns(self) -> list[str]:
+        """The columns of the traces holding the incumbent values."""
+        return ["y"] if self.test_y_col is None else ["y", "test_y"]
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold a chunk of results into the aggregates.
+
+        Args:
+            chunk: A chunk of results, flat or nested, with the `by` and `x_col` columns.
+
+        Raises:
+            ValueError: If a run in the chunk has results before the last result of
+                the run seen in an earlier chunk.
+        """
+        by = self._run_keys(chunk)
+        frame = self._reduce(chunk, by)
+        if len(frame) == 0:
+            return
+
+        counts = frame.groupby(by, sort=False, observed=True).agg(
+            n=(self.x_col, "size"),
+            last=(self.x_col, "max"),
+        )
+
+        state = self._state
+        carried = None
+        if state is not None and len(state) > 0:
+            carried = state.loc[state.index.intersection(counts.index)]
+            firsts = frame.groupby(by, sort=False, observed=True)[self.x_col].min()
+            late = firsts.loc[carried.index] < carried["last"]
+            if late.any():
+                raise ValueError(
+                    f"Results of the runs {late[late].index.tolist()} are not in increasing"
+                    f" order of {self.x_col} across chunks."
+                )
+
+            # Runs without any value so far have no incumbent to carry over.
+            carried = carried.dropna(subset=self.value_columns)
+
+        if carried is not None and len(carried) > 0:
+            # NOTE: The carried incumbents come first, so that they win ties with the
+            # chunk and are always the first row of their run in the new traces.
+            incumbents = carried[[self.x_col, *self.value_columns]].reset_index()
+            frame = pd.concat([incumbents, frame], ignore_index=True)
+
+        traces = inc_traces(
+            frame,
+            y_col="y",
+            x_col=self.x_col,
+            test_y_col=None if self.test_y_col is None else "test_y",
+            minimize=self.minimize,
+            by=by,
+        )
+        if carried is not None and len(carried) > 0:
+            is_first = ~traces.duplicated(subset=by, keep="first").to_numpy()
+            was_carried = pd.MultiIndex.from_frame(traces[by]).isin(
+                pd.MultiIndex.from_frame(carried.index.to_frame(index=False))
+            )
+            traces = traces[~(is_first & was_carried)].reset_index(drop=True)
+
+        self._traces.append(traces)
+        self._state = self._fold_state(state, counts, traces, by)
+
+    def merge(self, other: StreamingAggregator) -> None:
+        """Merge the aggregates of another aggregator into this one.
+
+        The aggregators may hold different chunks of the same runs, in which case the
+        incumbent traces of those runs are recomputed from both traces.
+
+        Args:
+            other: An aggregator with the same settings, over other chunks of results.
+        """
+        settings = ("y_col", "x_col", "test_y_col", "minimize", "by")
+        if any(getattr(self, s) != getattr(other, s) for s in settings):
+            raise ValueError("Can only merge aggregators with the same settings.")
+
+        if other._state is None:
+            return
+        if self._state is None:
+            self._by, self._traces, self._state = other._by, list(other._traces), other._state
+            return
+        if self._by != other._by:
+            raise ValueError(f"Can not merge runs keyed by {self._by} and {other._by}.")
+
+        by = self._run_keys(None)
+        traces = pd.concat([self.traces(), other.traces()], ignore_index=True)
+        traces = inc_traces(
+            traces,
+            y_col="y",
+            x_col=self.x_col,
+            test_y_col=None if self.test_y_col is None else "test_y",
+            minimize=self.minimize,
+            by=by,
+        )
+
+        counts = (
+            pd.concat([self._state, other._state])
+            .groupby(level=by, sort=False)
+            .agg(
+                n=("n", "sum"),
+                last=("last", "max"),
+            )
+        )
+        self._traces = [traces]
+        self._state = self._fold_state(None, counts, traces, by)
+
+    def traces(self) -> pd.DataFrame:
+        """The incumbent traces of all runs seen so far.
+
+        Returns:
+            A long-format frame as returned by
+            [`inc_traces()`][hpoglue.dataframe_utils.inc_traces].
+        """
+        if len(self._traces) != 1:
+            by = self._run_keys(None)
+            columns = [*by, self.x_col, *self.value_columns]
+            traces = pd.concat(self._traces, ignore_index=True) if self._traces else None
+            self._traces = [pd.DataFrame(columns=columns) if traces is None else traces]
+
+        return self._traces[0].sort_values(
+            [*self._run_keys(None), self.x_col], kind="stable", ignore_index=True
+        )
+
+    def final_performance(self) -> pd.DataFrame:
+        """The final incumbent of every run seen so far.
+
+        Returns:
+            A frame with a row per run, holding the `by` columns, the number of results
+            `n`, the last `x_col` value of the run, and the `y` (and `test_y`) of its
+            final incumbent.
+        """
+        by = self._run_keys(None)
+        if self._state is None:
+            return pd.DataFrame(columns=[*by, "n", self.x_col, *self.value_columns])
+
+        final = self._state.drop(columns=[self.x_col]).rename(columns={"last": self.x_col})
+        return final.reset_index()[[*by, "n", self.x_col, *self.value_columns]]
+
+    def ranks(self, within: Sequence[str] | None = None) -> pd.DataFrame:
+        """Rank the final incumbents of the runs against each other.
+
+        Args:
+            within: The columns of the groups to rank within, e.g. the benchmark and seed
+                to rank optimizers against each other. If `None`, all `by` columns other
+                than `optimizer` and `optimizer_hps` are used.
+
+        Returns:
+            The [`final_performance()`][hpoglue.streaming.StreamingAggregator.final_performance]
+            with a `rank` column, where `1` is the best and ties get their average rank.
+        """
+        final = self.final_performance()
+        by = self._run_keys(None)
+        if within is None:
+            within = [c for c in by if c not in ("optimizer", "optimizer_hps")]
+
+        ranker = (
+            final.groupby(list(within), sort=False, observed=True)["y"] if within else final["y"]
+        )
+        final["rank"] = ranker.rank(method="average", ascending=self.minimize)
+        return final
+
+    def _run_keys(self, chunk: pd.DataFrame | None) -> list[str]:
+        if self._by is None:
+            if chunk is None:
+                return self.by
+            self._by = [c for c in self.by if c in chunk.columns]
+        elif chunk is not None and (missing := [c for c in self._by if c not in chunk.columns]):
+            raise ValueError(f"The chunk is missing the run keys {missing}.")
+
+        return self._by
+
+    def _reduce(self, chunk: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+        x = result_column(chunk, self.x_col)
+        if np.issubdtype(x.dtype, np.datetime64):
+            raise TypeError(f"Can only aggregate a numeric {self.x_col=} across chunks.")
+
+        frame = chunk[by].reset_index(drop=True)
+        frame[self.x_col] = x
+        frame["y"] = result_column(chunk, self.y_col)
+        if self.test_y_col is not None:
+            frame["test_y"] = result_column(chunk, self.test_y_col)
+        return frame
+
+    def _fold_state(
+        self,
+        state: pd.DataFrame | None,
+        counts: pd.DataFrame,
+        traces: pd.DataFrame,
+        by: list[str],
+    ) -> pd.DataFrame:
+        incumbents = traces.groupby(by, sort=False, observed=True)[
+            [self.x_col, *self.value_columns]
+        ].last()
+        update = counts.join(incumbents, how="left")
+        if state is None or len(state) == 0:
+            return update
+
+        # Runs seen before keep their incumbent unless the chunk improved on it.
+        shared = state.index.intersection(update.index)
+        update.loc[shared, "n"] += state.loc[shared, "n"]
+        improved = update.loc[shared, "y"].notna()
+        kept = shared[~improved.to_numpy()]
+        update.loc[kept, [self.x_col, *self.value_columns]] = state.loc[
+            kept, [self.x_col, *self.value_columns]
+        ]
+        return pd.concat([state.drop(index=shared), update])
+
+
+def iter_chunks(
+    files: Iterable[str | Path | ArchiveFile],
+    *,
+    columns: Sequence[str] | None = None,
+    chunksize: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Iterate over the results stored in many files, chunk by chunk.
+
+    Args:
+        files: Parquet or csv files of flat results, or the
+            [`ArchiveFile`][hpoglue.archive.ArchiveFile]s of a run archive, whose partition
+            keys are added as columns.
+        columns: The columns to read. Columns missing from a file are skipped.
+            If `None`, all columns are read.
+        chunksize: The maximum number of rows of a chunk.
+
+    Yields:
+        The chunks of results, in the order of the files.
+    """
+    for file in files:
+        keys = {}
+        if not isinstance(file, str | Path):
+            keys = {"benchmark": file.benchmark, "optimizer": file.optimizer, "seed": file.seed}
+            file = file.path  # noqa: PLW2901
+
+        path = Path(file)
+        if path.suffix in _PARQUET_SUFFIXES:
+            import pyarrow.parquet as pq  # noqa: PLC0415
+
+            parquet = pq.ParquetFile(path)
+            names = parquet.schema_arrow.names
+            read = None if columns is None else [c for c in columns if c in names]
+            batches = (
+                b.to_pandas() for b in parquet.iter_batches(batch_size=chunksize, columns=read)
+            )
+        else:
+            names = pd.read_csv(path, nrows=0).columns
+            read = None if columns is None else [c for c in columns if c in names]
+            batches = pd.read_csv(path, usecols=read, chunksize=chunksize)
+
+        for chunk in batches:
+            yield chunk.assign(**keys) if keys else chunk
+
+
+def aggregate_files(
+    files: Iterable[str | Path | ArchiveFile],
+    *,
+    y_col: str,
+    x_col: str = "budget_used_total",
+    test_y_col: str | None = None,
+    minimize: bool = True,
+    by: Sequence[str] = RUN_KEYS,
+    chunksize: int = 100_000,
+) -> StreamingAggregator:
+    """Aggregate the results stored in many files, reading them chunk by chunk.
+
+    Only the `by`, `x_col` and result columns needed are read from the files.
+
+    Args:
+        files: The files to read, see [`iter_chunks()`][hpoglue.streaming.iter_chunks].
+        y_col: The result key the incumbent is chosen by.
+        x_col: The numeric column to order the results of a run by.
+        test_y_col: An optional result key to report alongside the incumbents.
+        minimize: Whether lower values of `y_col` are better.
+        by: The columns identifying a run.
+        chunksize: The maximum number of rows read at once.
+
+    Returns:
+        The aggregator holding the aggregates of all files.
+    """
+    aggregator = StreamingAggregator(
+        y_col=y_col,
+        x_col=x_col,
+        test_y_col=test_y_col,
+        minimize=minimize,
+        by=by,
+    )
+    keys = [y_col] if test_y_col is None else [y_col, test_y_col]
+    columns = [*by, x_col, *keys, *(f"results.{k}" for k in keys)]
+    for chunk in iter_chunks(files, columns=columns, chunksize=chunksize):
+        aggregator.update(chunk)
+
+    return aggregator
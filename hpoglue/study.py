@@ -0,0 +1,302 @@
+"""Incremental execution of studies, i.e. many problems each run with many seeds.
+
+Every finished run is recorded in a [`StudyManifest`][hpoglue.study.StudyManifest], a
+json lines file next to the archived results, keyed by the
+[`fingerprint()`][hpoglue.study.fingerprint] of its problem, seed and the installed
+version of hpoglue. Re-launching a study with
+[`run_study()`][hpoglue.study.run_study] only runs the combinations that are missing
+from the manifest, failed, or whose results file no longer exists:
+
+```python
+problems = Problem.grid(optimizers=[...], benchmarks=[...], budgets=[100])
+entries = run_study(problems, seeds=range(10), archive="results/")
+```
+
+The results of a run are written to its [`RunArchive`][hpoglue.archive.RunArchive]
+file before it is recorded in the manifest, so a recorded run always has its results.
+
+Requires `pyarrow`, e.g. with `pip install hpoglue[arrow]`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from hpoglue._run import _run
+from hpoglue.archive import RunArchive
+from hpoglue.hashing import content_hash
+from hpoglue.result_store import ResultStore
+
+if TYPE_CHECKING:
+    from hpoglue.callbacks import Callback
+    from hpoglue.problem import Problem
+
+logger = logging.getLogger(__name__)
+
+# NOTE: The installed version of hpoglue is part of the fingerprint of every run.
+try:
+    HPOGLUE_VERSION = version("hpoglue")
+except PackageNotFoundError:
+    HPOGLUE_VERSION = "unknown"
+
+MANIFEST_NAME = "manifest.jsonl"
+"""The file name of the manifest of a study, in the root of its archive."""
+
+
+def fingerprint(problem: Problem, seed: int, *, hpoglue_version: str = HPOGLUE_VERSION) -> str:
+    """A stable fingerprint of a run of `problem` with `seed`.
+
+    It covers the [`Problem.to_dict()`][hpoglue.problem.Problem.to_dict] of the problem,
+    the seed and the version of hpoglue, such that upgrading hpoglue invalidates
+    previous runs.
+    """
+    return content_hash(
+        {"problem": problem.to_dict(), "seed": seed, "hpoglue_version": hpoglue_version}
+    )
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """The record of a single run in a [`StudyManifest`][hpoglue.study.StudyManifest]."""
+
+    fingerprint: str
+    """The [`fingerprint()`][hpoglue.study.fingerprint] of the run."""
+
+    problem: str
+    """The name of the problem."""
+
+    seed: int
+    """The seed of the run."""
+
+    hpoglue_version: str
+    """The version of hpoglue the run was made with."""
+
+    status: Literal["completed", "failed"]
+    """Whether the run completed or failed."""
+
+    path: str | None = None
+    """The path of the results file, relative to the directory of the manifest."""
+
+    n_results: int = 0
+    """The number of results of the run."""
+
+    duration_s: float = 0.0
+    """The wall clock time of the run in seconds."""
+
+    finished_at: float = 0.0
+    """The unix time the run finished at."""
+
+    error: str | None = None
+    """The error of a failed run."""
+
+
+class StudyManifest:
+    """A json lines file with a [`ManifestEntry`][hpoglue.study.ManifestEntry] per run.
+
+    Entries are only ever appended, each as a single write of one line to the file
+    opened in append mode, so a crash leaves at most a truncated last line, which is
+    skipped when loading. If a run is recorded more than once, its last entry counts.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open a manifest, creating the file on the first append.
+
+        Args:
+            path: The path of the json lines file.
+        """
+        self.path = Path(path)
+        self._entries: dict[str, ManifestEntry] = {}
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> None:
+        """Reload the entries from the file."""
+        entries: dict[str, ManifestEntry] = {}
+        for entry in self._read():
+            entries[entry.fingerprint] = entry
+
+        with self._lock:
+            self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, fingerprint: object) -> bool:
+        return fingerprint in self._entries
+
+    def get(self, fingerprint: str) -> ManifestEntry | None:
+        """Get the last entry of a run, if any."""
+        return self._entries.get(fingerprint)
+
+    def entries(self) -> list[ManifestEntry]:
+        """The last entry of every run, in the order they were first recorded."""
+        return list(self._entries.values())
+
+    def is_valid(self, entry: ManifestEntry) -> bool:
+        """Whether an entry is a completed run whose results file still exists."""
+        return entry.status == "completed" and (
+            entry.path is None or (self.path.parent / entry.path).exists()
+        )
+
+    def completed(self, problem: Problem, seed: int) -> bool:
+        """Whether a run of `problem` with `seed` has a valid entry."""
+        entry = self._entries.get(fingerprint(problem, seed))
+        return entry is not None and self.is_valid(entry)
+
+    def append(self, entry: ManifestEntry) -> None:
+        """Record an entry, replacing any previous entry of the same run."""
+        line = (json.dumps(asdict(entry), sort_keys=True) + "\n").encode()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                # NOTE: Start a new line after a line truncated by a crash.
+                size = os.fstat(fd).st_size
+                if size > 0 and os.pread(fd, 1, size - 1) != b"\n":
+                    line = b"\n" + line
+                os.write(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+            self._entries[entry.fingerprint] = entry
+
+    def _read(self) -> Iterator[ManifestEntry]:
+        if not self.path.exists():
+            return
+
+        with self.path.open() as f:
+            for i, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield ManifestEntry(**json.loads(line))
+                except (json.JSONDecodeError, TypeError) as e:
+                    logger.warning(f"Skipping invalid line {i} of {self.path}: {e}")
+
+
+def run_study(
+    problems: Iterable[Problem],
+    seeds: Iterable[int],
+    *,
+    archive: RunArchive | str | Path,
+    manifest: StudyManifest | str | Path | None = None,
+    on_error: Literal["raise", "continue"] = "raise",
+    use_continuations_as_budget: bool = False,
+    cache_benchmark: bool = False,
+    callbacks: Sequence[Callback] = (),
+) -> list[ManifestEntry]:
+    """Run every problem with every seed, skipping the runs already completed.
+
+    A run is skipped if the manifest has a valid entry for it, see
+    [`StudyManifest.is_valid()`][hpoglue.study.StudyManifest.is_valid]. Any other run,
+    i.e. missing, failed, or whose results file was removed, is run, its results written
+    to the archive and then recorded in the manifest. Runs made with another version
+    of hpoglue have another fingerprint, and are therefore run again.
+
+    Args:
+        problems: The problems, e.g. from [`Problem.grid()`][hpoglue.problem.Problem.grid].
+        seeds: The seeds to run every problem with.
+        archive: The archive to write the results of the runs to, or its directory.
+        manifest: The manifest of the study, or its path. Defaults to
+            [`MANIFEST_NAME`][hpoglue.study.MANIFEST_NAME] in the root of the archive.
+        on_error: What to do when a run fails. Failed runs are recorded either way.
+
+            * `"raise"`: Raise the error.
+            * `"continue"`: Log it and continue with the next run.
+
+        use_continuations_as_budget: Whether to use continuations as budget.
+        cache_benchmark: Whether to reuse loaded benchmarks across runs, keeping them in
+            memory, see [`BENCHMARK_CACHE`][hpoglue.benchmark.BENCHMARK_CACHE].
+        callbacks: Callbacks to hook into the loop of every run.
+
+    Returns:
+        The entry of every run of the study, in the order of `problems` and `seeds`.
+    """
+    archive = archive if isinstance(archive, RunArchive) else RunArchive(archive)
+    match manifest:
+        case StudyManifest():
+            pass
+        case None:
+            manifest = StudyManifest(archive.root / MANIFEST_NAME)
+        case str() | Path():
+            manifest = StudyManifest(manifest)
+        case _:
+            raise TypeError(f"Unexpected type for `{manifest=}`: {type(manifest)}")
+
+    seeds = list(seeds)
+    runs = [(problem, seed, fingerprint(problem, seed)) for problem in problems for seed in seeds]
+    pending = [
+        (problem, seed, fp)
+        for problem, seed, fp in runs
+        if (entry := manifest.get(fp)) is None or not manifest.is_valid(entry)
+    ]
+    logger.info(
+        f"Running {len(pending)} of {len(runs)} runs, the others are completed in {manifest.path}"
+    )
+
+    for i, (problem, seed, fp) in enumerate(pending, start=1):
+        logger.info(f"[{i}/{len(pending)}] Running {problem.name} with {seed=}")
+        start = time.monotonic()
+        try:
+            store = _run(
+                problem=problem,
+                seed=seed,
+                use_continuations_as_budget=use_continuations_as_budget,
+                cache_benchmark=cache_benchmark,
+                result_store=ResultStore(),
+                callbacks=callbacks,
+            )
+            path = archive.write(store, problem=problem, seed=seed)
+        except Exception as e:
+            manifest.append(
+                _entry(
+                    problem,
+                    seed,
+                    fp,
+                    status="failed",
+                    duration_s=time.monotonic() - start,
+                    error=repr(e),
+                )
+            )
+            match on_error:
+                case "raise":
+                    raise e
+                case "continue":
+                    logger.error(f"Run of {problem.name} with {seed=} failed: {e}")
+                case _:
+                    raise RuntimeError(f"Invalid value for `on_error`: {on_error}") from e
+        else:
+            manifest.append(
+                _entry(
+                    problem,
+                    seed,
+                    fp,
+                    status="completed",
+                    duration_s=time.monotonic() - start,
+                    path=os.path.relpath(path, manifest.path.parent),
+                    n_results=len(store),
+                )
+            )
+
+    return [manifest.get(fp) for _, _, fp in runs]  # type: ignore
+
+
+def _entry(problem: Problem, seed: int, fp: str, **kwargs: Any) -> ManifestEntry:
+    return ManifestEntry(
+        fingerprint=fp,
+        problem=problem.name,
+        seed=seed,
+        hpoglue_version=HPOGLUE_VERSION,
+        finished_at=time.time(),
+        **kwargs,
+    )
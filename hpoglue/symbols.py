@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+
+class SymbolTable:
+    """Interns the strings that repeat across the results of a run.
+
+    The metric names in the values of results and the fidelity names of results are the
+    same for every result of a run, but every unpickled copy of them is a separate string
+    object. The [`BenchmarkWorker`][hpoglue.worker.BenchmarkWorker] interns the names of
+    the results it receives through a table, so that they share a single object per
+    distinct name. In-process benchmarks already share them and need no interning.
+
+    Unlike `sys.intern`, the strings are only kept alive as long as the table itself,
+    which is usually for the duration of a single run.
+
+    ```python
+    symbols = SymbolTable()
+    a = symbols.intern("".join(["val", "_loss"]))
+    b = symbols.intern("val_loss")
+    assert a is b
+    ```
+    """
+
+    __slots__ = ("_symbols",)
+
+    def __init__(self) -> None:
+        """Create an empty symbol table."""
+        self._symbols: dict[str, str] = {}
+
+    def intern(self, s: str) -> str:
+        """Get the shared instance of a string, registering it if it is new."""
+        return self._symbols.setdefault(s, s)
+
+    def intern_keys(self, values: dict[str, Any]) -> dict[str, Any]:
+        """Get a dictionary whose keys are all shared instances.
+
+        Args:
+            values: The dictionary to intern the keys of.
+
+        Returns:
+            `values` itself if its keys are already interned, otherwise a new dictionary
+            with the same items and interned keys.
+        """
+        symbols = self._symbols
+        if all(symbols.get(k) is k for k in values):
+            return values
+
+        setdefault = symbols.setdefault
+        return {setdefault(k, k): v for k, v in values.items()}
+
+    def intern_fidelity(
+        self,
+        fidelity: tuple[str, int | float] | Mapping[str, int | float] | None,
+    ) -> tuple[str, int | float] | Mapping[str, int | float] | None:
+        """Intern the fidelity name(s) of a query or result."""
+        match fidelity:
+            case None:
+                return None
+            case (name, value):
+                interned = self.intern(name)
+                return fidelity if interned is name else (interned, value)
+            case Mapping():
+                return self.intern_keys(
+                    fidelity if isinstance(fidelity, dict) else dict(fidelity)
+                )
+            case _:
+                raise TypeError(f"Unexpected fidelity type {type(fidelity)}")
+
+    def __contains__(self, s: object) -> bool:
+        return s in self._symbols
+
+    def __len__(self) -> int:
+        return len(self._symbols)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from hpoglue.batching import BatchingBenchmark
+    from hpoglue.benchmark import Benchmark
+    from hpoglue.query import Query
+    from hpoglue.worker import BenchmarkWorker
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _Curve:
+    fid_name: str
+    index: np.ndarray
+    columns: dict[str, np.ndarray]
+    spans: list[tuple[float, float]]
+    """The disjoint, sorted and inclusive fidelity ranges fetched so far."""
+
+    def missing(self, frm: float, to: float) -> list[tuple[float, float]]:
+        # NOTE: The gaps are inclusive, so they overlap the held ranges next to them
+        # by their bounds, which are fetched again and deduplicated when merging.
+        gaps = []
+        lo = frm
+        for a, b in self.spans:
+            if b < lo:
+                continue
+            if a > to:
+                break
+            if a > lo:
+                gaps.append((lo, a))
+            lo = b
+            if lo >= to:
+                return gaps
+
+        gaps.append((lo, to))
+        return gaps
+
+    def add_span(self, frm: float, to: float) -> None:
+        spans = []
+        for a, b in self.spans:
+            if b < frm or a > to:
+                spans.append((a, b))
+            else:
+                frm, to = min(a, frm), max(b, to)
+
+        spans.append((frm, to))
+        self.spans = sorted(spans)
+
+    @classmethod
+    def from_frame(cls, fid_name: str, df: pd.DataFrame, frm: float, to: float) -> _Curve:
+        df = df.sort_index()
+        return cls(
+            fid_name=fid_name,
+            index=df.index.to_numpy(),
+            columns={name: df[name].to_numpy() for name in df.columns},
+            spans=[(frm, to)],
+        )
+
+    def merge(self, df: pd.DataFrame) -> None:
+        index = np.concatenate([self.index, df.index.to_numpy()])
+        index, first = np.unique(index, return_index=True)
+        columns = {}
+        for name in dict.fromkeys([*self.columns, *df.columns]):
+            old = self.columns.get(name)
+            if old is None:
+                old = np.full(len(self.index), np.nan)
+            new = df[name].to_numpy() if name in df.columns else np.full(len(df), np.nan)
+            columns[name] = np.concatenate([old, new])[first]
+
+        self.index = index
+        self.columns = columns
+
+
+class TrajectoryBuffer:
+    """The learning curves fetched during a run, stored once per config.
+
+    Optimizers relying on learning curves request the trajectory of a config up to the
+    fidelity of every query. Consecutive requests for the same config mostly overlap,
+    so instead of keeping a full `DataFrame` per result, the buffer keeps a single curve
+    per config, only fetches the part of a requested range it does not hold yet, and
+    hands out [`TrajectoryView`][hpoglue.trajectory.TrajectoryView]s into it.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty buffer."""
+        self._curves: dict[Hashable, _Curve] = {}
+
+    def __len__(self) -> int:
+        return len(self._curves)
+
+    def fetch(
+        self,
+        benchmark: Benchmark | BatchingBenchmark | BenchmarkWorker,
+        *,
+        key: Hashable,
+        query: Query,
+        frm: int | float,
+        to: int | float,
+    ) -> TrajectoryView:
+        """Get a view of the trajectory of a query, fetching what is missing from the benchmark.
+
+        Args:
+            benchmark: The benchmark to fetch missing parts of the curve from.
+            key: The key identifying the config of the query, e.g. its rounded values.
+            query: The query to get the trajectory of, with a single fidelity.
+            frm: The lowest fidelity of the trajectory, inclusive.
+            to: The highest fidelity of the trajectory, inclusive.
+
+        Returns:
+            A view of the trajectory from `frm` to `to`.
+        """
+        assert isinstance(query.fidelity, tuple)
+        fid_name, _ = query.fidelity
+
+        curve = self._curves.get(key)
+        if curve is None:
+            df = benchmark.trajectory(query=query, frm=frm, to=to)
+            self._curves[key] = _Curve.from_frame(fid_name, df, frm, to)
+        else:
+            # NOTE: Only fetch the parts of the range that were not fetched before,
+            # including any gaps between previously fetched ranges.
+            for lo, hi in curve.missing(frm, to):
+                curve.merge(benchmark.trajectory(query=query, frm=lo, to=hi))
+                curve.add_span(lo, hi)
+
+        return TrajectoryView(buffer=self, key=key, frm=frm, to=to)
+
+    def to_frame(self, key: Hashable, frm: float, to: float) -> pd.DataFrame:
+        """Materialize part of the curve of a config as a `DataFrame`, indexed by fidelity."""
+        curve = self._curves[key]
+        start, stop = np.searchsorted(curve.index, [frm, to], side="left")
+        if stop < len(curve.index) and curve.index[stop] == to:
+            stop += 1
+
+        return pd.DataFrame(
+            {name: values[start:stop] for name, values in curve.columns.items()},
+            index=pd.Index(curve.index[start:stop], name=curve.fid_name),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class TrajectoryView:
+    """A range of the learning curve of a config held in a
+    [`TrajectoryBuffer`][hpoglue.trajectory.TrajectoryBuffer].
+
+    Use [`to_frame()`][hpoglue.trajectory.TrajectoryView.to_frame] to get it as a
+    `DataFrame`, indexed by the fidelity, with a column per value of the benchmark.
+    """
+
+    buffer: TrajectoryBuffer
+    """The buffer holding the curve."""
+
+    key: Hashable
+    """The key of the config in the buffer."""
+
+    frm: int | float
+    """The lowest fidelity of the trajectory, inclusive."""
+
+    to: int | float
+    """The highest fidelity of the trajectory, inclusive."""
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize the trajectory as a `DataFrame`."""
+        return self.buffer.to_frame(self.key, self.frm, self.to)
+
+    def __len__(self) -> int:
+        return len(self.to_frame())
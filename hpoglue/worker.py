@@ -0,0 +1,432 @@
+"""Persistent benchmark worker processes.
+
+A [`BenchmarkWorker`][hpoglue.worker.BenchmarkWorker] launches a long-lived python process,
+typically inside the [`Venv`][hpoglue.env.Venv] of a benchmark, loads the benchmark once
+and then serves queries over the process' stdin/stdout pipes.
+
+Every message is a single frame of the form
+
+```
+| kind (u8) | request id (u32) | payload length (u32) | payload (pickle) |
+```
+
+Requests are answered strictly in the order they are received, which allows the client
+to pipeline many requests before reading any of the responses. The client only sends
+ahead as many request bytes as surely fit in the pipe to the worker, so neither side
+can block on writing while the other one does too.
+
+The worker side is started with `python -m hpoglue.worker`, which requires `hpoglue`
+and the benchmark's own dependencies to be installed in that environment.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import pickle
+import select
+import struct
+import subprocess
+import sys
+import traceback
+from collections import deque
+from collections.abc import Iterable
+from enum import IntEnum
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from hpoglue.config import Config
+from hpoglue.query import Query
+from hpoglue.result import Result
+from hpoglue.symbols import SymbolTable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from hpoglue.benchmark import BenchmarkDescription
+    from hpoglue.env import Venv
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<BII")
+"""Frame header: message kind, request id and payload length."""
+
+_PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+_MAX_IN_FLIGHT_BYTES = 2**14
+"""The most request bytes sent ahead of the responses, well below the size of a pipe."""
+
+
+class _Msg(IntEnum):
+    LOAD = 1
+    QUERY = 2
+    TRAJECTORY = 3
+    CLOSE = 4
+    OK = 16
+    ERROR = 17
+
+
+class BenchmarkWorkerError(RuntimeError):
+    """Raised when the benchmark worker fails to answer a request."""
+
+
+def _write_frame(out: IO[bytes], kind: int, request_id: int, payload: bytes) -> None:
+    out.write(_HEADER.pack(kind, request_id, len(payload)))
+    out.write(payload)
+
+
+def _read_frame(inp: IO[bytes]) -> tuple[int, int, bytes] | None:
+    header = inp.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+
+    kind, request_id, length = _HEADER.unpack(header)
+    payload = inp.read(length)
+    if len(payload) < length:
+        return None
+
+    return kind, request_id, payload
+
+
+class _FrameReader:
+    """Reads frames from a file descriptor, keeping track of what is already buffered.
+
+    Knowing whether another complete request is already buffered lets the worker
+    delay flushing its responses while requests are pipelined.
+    """
+
+    def __init__(self, fd: int, chunk_size: int = 2**16) -> None:
+        self.fd = fd
+        self.chunk_size = chunk_size
+        self._buf = bytearray()
+
+    def _fill(self, n: int) -> bool:
+        while len(self._buf) < n:
+            chunk = os.read(self.fd, max(self.chunk_size, n - len(self._buf)))
+            if not chunk:
+                return False
+            self._buf += chunk
+        return True
+
+    def has_frame(self) -> bool:
+        """Whether a complete frame can be read without blocking."""
+        if len(self._buf) >= _HEADER.size:
+            _, _, length = _HEADER.unpack_from(self._buf)
+            if len(self._buf) >= _HEADER.size + length:
+                return True
+
+        readable, _, _ = select.select([self.fd], [], [], 0)
+        return bool(readable)
+
+    def read_frame(self) -> tuple[int, int, bytes] | None:
+        """Read the next frame, returning `None` once the stream has ended."""
+        if not self._fill(_HEADER.size):
+            return None
+
+        kind, request_id, length = _HEADER.unpack_from(self._buf)
+        end = _HEADER.size + length
+        if not self._fill(end):
+            return None
+
+        payload = bytes(self._buf[_HEADER.size:end])
+        del self._buf[:end]
+        return kind, request_id, payload
+
+
+def _pack_query(query: Query) -> tuple[str, dict[str, Any] | None, Any]:
+    # NOTE: Only ship what the benchmark needs, `optimizer_info` may not be picklable
+    # and there is no need to send it back and forth.
+    return (query.config_id, query.config.values, query.fidelity)
+
+
+def _unpack_query(packed: tuple[str, dict[str, Any] | None, Any]) -> Query:
+    config_id, values, fidelity = packed
+    return Query(config=Config(config_id=config_id, values=values), fidelity=fidelity)
+
+
+class BenchmarkWorker:
+    """A loaded benchmark living in a separate, persistent python process.
+
+    The worker can be used in place of a loaded [`Benchmark`][hpoglue.benchmark.Benchmark],
+    i.e. it provides `query()` and `trajectory()`.
+
+    ```python
+    with BenchmarkWorker.from_venv(desc, venv=Venv(Path("envs/my_benchmark"))) as bench:
+        result = bench.query(query)
+        results = bench.query_many(queries)  # pipelined
+    ```
+    """
+
+    def __init__(
+        self,
+        desc: BenchmarkDescription,
+        *,
+        python: str | Path | None = None,
+        max_in_flight: int = 32,
+    ) -> None:
+        """Start a worker process and load the benchmark in it.
+
+        Args:
+            desc: The description of the benchmark to load. It is pickled and sent
+                to the worker, so everything it references must be importable there.
+
+            python: The python executable to launch the worker with.
+                If `None`, the currently running interpreter is used.
+
+            max_in_flight: The number of pipelined requests that are sent
+                before waiting on responses.
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"{max_in_flight=} must be >= 1")
+
+        self.desc = desc
+        self.name = desc.name
+        self.config_space = desc.config_space
+        self.max_in_flight = max_in_flight
+        self.python = str(python) if python is not None else sys.executable
+
+        self._symbols = SymbolTable()
+        self._next_id = 0
+        self._pending: deque[tuple[int, Query | None, int]] = deque()
+        self._in_flight_bytes = 0
+        cmd = [self.python, "-m", "hpoglue.worker"]
+        logger.debug(cmd)
+        self._proc = subprocess.Popen(  # noqa: S603
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        assert self._proc.stdin is not None
+        assert self._proc.stdout is not None
+        self._stdin: IO[bytes] = self._proc.stdin
+        self._stdout: IO[bytes] = self._proc.stdout
+
+        try:
+            self._send(_Msg.LOAD, pickle.dumps(desc, protocol=_PICKLE_PROTOCOL), query=None)
+            self._flush()
+            self._receive()
+        except BaseException:
+            # NOTE: The caller never gets hold of the worker, so nobody else can close it.
+            self._kill()
+            raise
+
+    @classmethod
+    def from_venv(
+        cls,
+        desc: BenchmarkDescription,
+        *,
+        venv: Venv,
+        max_in_flight: int = 32,
+    ) -> BenchmarkWorker:
+        """Start a worker using the python executable of a virtual environment.
+
+        Args:
+            desc: The description of the benchmark to load.
+            venv: The virtual environment to run the worker in.
+            max_in_flight: The number of pipelined requests per window.
+
+        Returns:
+            The started worker with the benchmark loaded.
+        """
+        return cls(desc, python=venv.python, max_in_flight=max_in_flight)
+
+    def query(self, query: Query) -> Result:
+        """Query the benchmark in the worker for a result."""
+        self._drain(0)
+        self._send(_Msg.QUERY, pickle.dumps(_pack_query(query), protocol=_PICKLE_PROTOCOL), query)
+        self._flush()
+        return self._receive_result()
+
+    def query_many(self, queries: Iterable[Query]) -> list[Result]:
+        """Query the benchmark for many results, pipelining the requests.
+
+        Args:
+            queries: The queries to evaluate.
+
+        Returns:
+            The results, in the same order as the queries.
+        """
+        self._drain(0)
+        results: list[Result] = []
+        for query in queries:
+            payload = pickle.dumps(_pack_query(query), protocol=_PICKLE_PROTOCOL)
+
+            # NOTE: Keep up to two windows of requests in flight so that the worker
+            # always has a queue of work while we read the responses of the previous one.
+            if len(self._pending) >= 2 * self.max_in_flight:
+                self._flush()
+                while len(self._pending) > self.max_in_flight:
+                    results.append(self._receive_result())
+
+            # NOTE: If the pipe to the worker filled up while the worker is blocked on
+            # writing responses we do not read yet, both processes would wait forever.
+            size = _HEADER.size + len(payload)
+            if self._pending and self._in_flight_bytes + size > _MAX_IN_FLIGHT_BYTES:
+                self._flush()
+                while self._pending and self._in_flight_bytes + size > _MAX_IN_FLIGHT_BYTES:
+                    results.append(self._receive_result())
+
+            self._send(_Msg.QUERY, payload, query)
+
+        self._flush()
+        while self._pending:
+            results.append(self._receive_result())
+
+        return results
+
+    def trajectory(
+        self,
+        *,
+        query: Query,
+        frm: int | float | None = None,
+        to: int | float | None = None,
+    ) -> pd.DataFrame:
+        """Query the benchmark in the worker for a trajectory."""
+        self._drain(0)
+        payload = pickle.dumps((_pack_query(query), frm, to), protocol=_PICKLE_PROTOCOL)
+        self._send(_Msg.TRAJECTORY, payload, query=None)
+        self._flush()
+        return self._receive()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Shut down the worker process."""
+        if self._proc.poll() is not None:
+            return
+
+        try:
+            _write_frame(self._stdin, _Msg.CLOSE, 0, b"")
+            self._stdin.close()
+        except BrokenPipeError:
+            pass
+
+        try:
+            self._proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Benchmark worker for {self.name} did not exit, killing it.")
+            self._proc.kill()
+            self._proc.wait()
+        finally:
+            self._stdout.close()
+
+    def _kill(self) -> None:
+        self._proc.kill()
+        self._proc.wait()
+        for pipe in (self._stdin, self._stdout):
+            with contextlib.suppress(BrokenPipeError):
+                pipe.close()
+
+    def __enter__(self) -> BenchmarkWorker:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _send(self, kind: _Msg, payload: bytes, query: Query | None) -> None:
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) % (2**32)
+        _write_frame(self._stdin, kind, request_id, payload)
+        size = _HEADER.size + len(payload)
+        self._pending.append((request_id, query, size))
+        self._in_flight_bytes += size
+
+    def _flush(self) -> None:
+        self._stdin.flush()
+
+    def _drain(self, n: int) -> None:
+        if len(self._pending) > n:
+            self._flush()
+        while len(self._pending) > n:
+            self._receive()
+
+    def _receive_result(self) -> Result:
+        result = self._receive()
+        assert isinstance(result, Result)
+        return result
+
+    def _receive(self) -> Any:
+        request_id, query, size = self._pending.popleft()
+        self._in_flight_bytes -= size
+        frame = _read_frame(self._stdout)
+        if frame is None:
+            raise BenchmarkWorkerError(
+                f"Benchmark worker for {self.name} exited with code {self._proc.poll()}"
+            )
+
+        kind, response_id, payload = frame
+        if response_id != request_id:
+            raise BenchmarkWorkerError(
+                f"Out of order response from benchmark worker for {self.name}:"
+                f" expected {request_id}, got {response_id}"
+            )
+
+        # NOTE: The payload comes from a process we spawned ourselves.
+        response = pickle.loads(payload)  # noqa: S301
+        match kind:
+            case _Msg.OK:
+                if query is None:
+                    return response
+
+                # NOTE: Every unpickled result has its own copy of the metric names.
+                values, fidelity, trajectory = response
+                return Result(
+                    query=query,
+                    fidelity=self._symbols.intern_fidelity(fidelity),
+                    values=self._symbols.intern_keys(values),
+                    trajectory=trajectory,
+                )
+            case _Msg.ERROR:
+                name, msg, tb = response
+                raise BenchmarkWorkerError(
+                    f"Benchmark worker for {self.name} raised {name}: {msg}\n{tb}"
+                )
+            case _:
+                raise BenchmarkWorkerError(f"Unexpected message kind {kind} from worker")
+
+
+def _serve(inp: _FrameReader, out: IO[bytes]) -> None:
+    benchmark = None
+    while (frame := inp.read_frame()) is not None:
+        kind, request_id, payload = frame
+        if kind == _Msg.CLOSE:
+            break
+
+        try:
+            match kind:
+                case _Msg.LOAD:
+                    desc = pickle.loads(payload)  # noqa: S301
+                    benchmark = desc.load(desc)
+                    response: Any = desc.name
+                case _Msg.QUERY:
+                    assert benchmark is not None, "Benchmark not loaded"
+                    result = benchmark.query(_unpack_query(pickle.loads(payload)))  # noqa: S301
+                    response = (result.values, result.fidelity, result.trajectory_frame())
+                case _Msg.TRAJECTORY:
+                    assert benchmark is not None, "Benchmark not loaded"
+                    packed, frm, to = pickle.loads(payload)  # noqa: S301
+                    response = benchmark.trajectory(query=_unpack_query(packed), frm=frm, to=to)
+                case _:
+                    raise ValueError(f"Unknown message kind {kind}")
+        except Exception as e:  # noqa: BLE001
+            error = (type(e).__name__, str(e), traceback.format_exc())
+            _write_frame(out, _Msg.ERROR, request_id, pickle.dumps(error))
+        else:
+            _write_frame(out, _Msg.OK, request_id, pickle.dumps(response, _PICKLE_PROTOCOL))
+
+        # Only flush once there are no more pipelined requests waiting to be served
+        if not inp.has_frame():
+            out.flush()
+
+
+def main() -> None:
+    """Entry point of the worker process."""
+    # NOTE: Keep the real stdout for the protocol and send anything the benchmark prints
+    # to stderr instead, otherwise it would corrupt the stream of frames.
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    with out:
+        _serve(_FrameReader(sys.stdin.fileno()), out)
+
+
+if __name__ == "__main__":
+    main()
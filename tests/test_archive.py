@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from hpoglue._run import _run
+from hpoglue.archive import ROW_GROUP_SIZE, RunArchive
+from hpoglue.benchmark import FunctionalBenchmark
+from hpoglue.config import Config
+from hpoglue.measure import Measure
+from hpoglue.optimizer import Optimizer
+from hpoglue.problem import Problem
+from hpoglue.query import Query
+from hpoglue.result import Result
+from hpoglue.result_store import ResultStore
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_N_ROWS = 3 * ROW_GROUP_SIZE
+
+
+def _query(query: Query) -> Result:
+    return Result(query=query, fidelity=None, values={"y": query.config.values["x"]})
+
+
+_BENCHMARK = FunctionalBenchmark(
+    name="archived",
+    config_space=[Config(config_id=str(i), values={"x": i / 4}) for i in range(4)],
+    metrics={"y": Measure.metric((0.0, 1.0), minimize=True)},
+    query=_query,
+)
+
+
+class _Optimizer(Optimizer):
+    """Asks for the configs of the benchmark in order."""
+
+    name = "in_order"
+    support = Problem.Support(
+        fidelities=(None,),
+        objectives=("single",),
+        cost_awareness=(None,),
+        tabular=True,
+    )
+
+    def __init__(self, *, problem, seed, working_directory) -> None:  # noqa: ARG002
+        assert isinstance(problem.config_space, list)
+        self.configs = iter(problem.config_space)
+
+    def ask(self) -> Query:
+        return Query(config=next(self.configs))
+
+    def tell(self, result: Result) -> None:
+        pass
+
+
+@pytest.fixture
+def problem() -> Problem:
+    return Problem.problem(
+        optimizer=_Optimizer,
+        benchmark=_BENCHMARK.desc,
+        objectives="y",
+        budget=len(_BENCHMARK.desc.config_space),
+        continuations=False,
+    )
+
+
+def _results(n: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"budget_used_total": np.arange(1, n + 1, dtype=np.float64), "results.y": np.zeros(n)}
+    )
+
+
+def test_budget_range_skips_row_groups(tmp_path: Path, problem: Problem) -> None:
+    archive = RunArchive(tmp_path)
+    path = archive.write(_results(_N_ROWS), problem=problem, seed=0)
+    assert pq.ParquetFile(path).metadata.num_row_groups == _N_ROWS // ROW_GROUP_SIZE
+
+    df = archive.read(budget=(10, 20))
+    assert df["budget_used_total"].tolist() == list(range(10, 21))
+    assert set(df["seed"]) == {0}
+
+
+def test_budget_range_on_a_run_without_the_column_raises(
+    tmp_path: Path,
+    problem: Problem,
+) -> None:
+    archive = RunArchive(tmp_path)
+    archive.write(_results(10).drop(columns="budget_used_total"), problem=problem, seed=0)
+    with pytest.raises(ValueError, match="budget_used_total"):
+        archive.read(budget=(1, 2))
+
+
+def test_result_store_round_trip(tmp_path: Path, problem: Problem) -> None:
+    store = _run(problem, seed=3, result_store=ResultStore())
+    archive = RunArchive(tmp_path)
+    archive.write(store, problem=problem, seed=3)
+
+    (file,) = archive.files(benchmarks=["archived"], seeds=[3])
+    assert file.problem_dict() == problem.to_dict()
+
+    df = file.read()
+    expected = store.to_pandas(configs=True)
+    pd.testing.assert_frame_equal(df[expected.columns], expected)
+    assert df["results.y"].tolist() == [0.0, 0.25, 0.5, 0.75]
+    assert set(df["seed"]) == {3}
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hpoglue.batching import BatchingBenchmark
+from hpoglue.benchmark import FunctionalBenchmark
+from hpoglue.config import Config
+from hpoglue.measure import Measure
+from hpoglue.query import Query
+from hpoglue.result import Result
+
+_N_CALLERS = 16
+_MAX_BATCH_SIZE = 4
+
+
+def _query(query: Query) -> Result:
+    x = query.config.values["x"]
+    if x < 0:
+        raise ValueError(f"negative {x=}")
+    return Result(query=query, fidelity=None, values={"y": 2 * x})
+
+
+_BENCHMARK = FunctionalBenchmark(
+    name="batched",
+    config_space=[Config(config_id="a", values={"x": 1.0})],
+    metrics={"y": Measure.metric((0.0, float("inf")), minimize=True)},
+    query=_query,
+)
+
+
+def _queries(n: int) -> list[Query]:
+    return [Query(config=Config(config_id=str(i), values={"x": float(i)})) for i in range(n)]
+
+
+class _Recorder:
+    """Evaluates batches one by one, recording their sizes."""
+
+    def __init__(self) -> None:
+        self.sizes: list[int] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, queries: list[Query]) -> list[Result]:
+        with self._lock:
+            self.sizes.append(len(queries))
+        if any(q.config.values["x"] < 0 for q in queries):
+            raise ValueError("batch with a negative x")
+        return [_query(q) for q in queries]
+
+
+def _batching(recorder: _Recorder) -> BatchingBenchmark:
+    benchmark = _BENCHMARK.desc.load(_BENCHMARK.desc)
+    return BatchingBenchmark(
+        benchmark,
+        max_batch_size=_MAX_BATCH_SIZE,
+        max_wait_s=0.05,
+        query_batch=recorder,
+    )
+
+
+def test_concurrent_queries_are_batched() -> None:
+    recorder = _Recorder()
+    queries = _queries(_N_CALLERS)
+    with _batching(recorder) as benchmark, ThreadPoolExecutor(_N_CALLERS) as pool:
+        results = list(pool.map(benchmark.query, queries))
+
+    assert [r.values for r in results] == [_query(q).values for q in queries]
+    assert all(r.query is q for r, q in zip(results, queries, strict=True))
+    assert sum(recorder.sizes) == benchmark.n_queries == _N_CALLERS
+    assert max(recorder.sizes) <= _MAX_BATCH_SIZE
+    assert benchmark.n_batches < _N_CALLERS
+
+
+def test_a_failing_query_only_fails_its_caller() -> None:
+    recorder = _Recorder()
+    queries = [*_queries(_N_CALLERS - 1), Query(config=Config(config_id="bad", values={"x": -1}))]
+
+    def query(q: Query) -> Result | Exception:
+        try:
+            return benchmark.query(q)
+        except ValueError as e:
+            return e
+
+    with _batching(recorder) as benchmark, ThreadPoolExecutor(_N_CALLERS) as pool:
+        outcomes = list(pool.map(query, queries))
+
+    *results, error = outcomes
+    assert [r.values for r in results if isinstance(r, Result)] == [
+        _query(q).values for q in queries[:-1]
+    ]
+    assert isinstance(error, ValueError)
+    assert benchmark.n_queries == _N_CALLERS - 1
+
+
+def test_closed_benchmark_rejects_queries() -> None:
+    benchmark = _batching(_Recorder())
+    assert benchmark.query(_queries(1)[0]).values == {"y": 0.0}
+    benchmark.close()
+    benchmark.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        benchmark.query(_queries(1)[0])
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ConfigSpace import ConfigurationSpace
+
+from hpoglue.benchmark import BenchmarkCache, BenchmarkDescription, FunctionalBenchmark
+from hpoglue.config import Config
+from hpoglue.fidelity import RangeFidelity
+from hpoglue.measure import Measure
+from hpoglue.optimizer import Optimizer
+from hpoglue.problem import Problem
+from hpoglue.query import Query
+from hpoglue.result import Result
+from hpoglue.run_glue import run_glue
+
+_TOLD: list[list[int]] = []
+_CONFIG = Config(config_id="a", values={"x": 1.0})
+
+
+def _query(query: Query) -> Result:
+    assert isinstance(query.fidelity, tuple)
+    _, epoch = query.fidelity
+    return Result(query=query, fidelity=query.fidelity, values={"y": 1 / epoch})
+
+
+_BENCHMARK = FunctionalBenchmark(
+    name="curve",
+    config_space=ConfigurationSpace({"x": (0.0, 2.0)}),
+    metrics={"y": Measure.metric((0.0, 1.0), minimize=True)},
+    fidelities={"epoch": RangeFidelity.from_tuple((1, 10, 1), supports_continuation=True)},
+    query=_query,
+)
+
+
+class _Optimizer(Optimizer):
+    """Evaluates a single config at increasing epochs."""
+
+    name = "curve_opt"
+    support = Problem.Support(
+        fidelities=("single",),
+        objectives=("single",),
+        cost_awareness=(None,),
+        tabular=False,
+        continuations=True,
+    )
+    multi_fideltiy_requires_learning_curve = True
+
+    def __init__(self, *, problem, seed, working_directory) -> None:  # noqa: ARG002
+        self.epochs = iter([3, 6, 9, 10])
+
+    def ask(self) -> Query:
+        return Query(config=_CONFIG, fidelity=("epoch", next(self.epochs)))
+
+    def tell(self, result: Result) -> None:
+        trajectory = result.trajectory_frame()
+        assert trajectory is not None
+        _TOLD.append(trajectory.index.tolist())
+
+
+def test_range_fidelity_iterates_every_step() -> None:
+    assert list(RangeFidelity.from_tuple((1, 5, 1))) == [1, 2, 3, 4, 5]
+
+
+def test_functional_trajectory_covers_the_requested_range() -> None:
+    benchmark = _BENCHMARK.desc.load(_BENCHMARK.desc)
+    query = Query(config=_CONFIG, fidelity=("epoch", 6))
+    trajectory = benchmark.trajectory(query=query, frm=3, to=6)
+    assert trajectory.index.tolist() == [3, 4, 5, 6]
+    assert trajectory["y"].tolist() == [1 / 3, 1 / 4, 1 / 5, 1 / 6]
+
+
+def test_continuation_run_on_a_functional_benchmark() -> None:
+    df = run_glue(
+        _Optimizer,
+        _BENCHMARK,
+        objectives="y",
+        fidelities="epoch",
+        budget=2,
+        cache_benchmark=False,
+    )
+    assert len(df) == len(_TOLD)
+    assert _TOLD[:3] == [[1, 2, 3], [1, 2, 3, 4, 5, 6], [1, 2, 3, 4, 5, 6, 7, 8, 9]]
+
+
+def _desc(name: str, load) -> BenchmarkDescription:
+    return BenchmarkDescription(
+        name=name,
+        config_space=[_CONFIG],
+        load=load,
+        metrics={"y": Measure.metric((0.0, 1.0), minimize=True)},
+    )
+
+
+def test_cache_does_not_block_other_benchmarks_during_a_load() -> None:
+    cache = BenchmarkCache()
+    release = threading.Event()
+
+    def slow_load(desc: BenchmarkDescription) -> object:
+        assert release.wait(timeout=10)
+        return desc.name
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        slow = pool.submit(cache.load, _desc("slow", slow_load))
+        assert cache.load(_desc("fast", lambda desc: desc.name)) == "fast"
+        release.set()
+        assert slow.result() == "slow"
+
+
+def test_cache_loads_a_benchmark_once_for_concurrent_callers() -> None:
+    cache = BenchmarkCache()
+    loads: list[str] = []
+
+    def load(desc: BenchmarkDescription) -> object:
+        loads.append(desc.name)
+        return object()
+
+    desc = _desc("once", load)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        benchmarks = list(pool.map(lambda _: cache.load(desc), range(32)))
+
+    assert loads == ["once"]
+    assert all(b is benchmarks[0] for b in benchmarks)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from hpoglue.benchmark import FunctionalBenchmark
+from hpoglue.callbacks import Callback, LiveMetricsCallback, bound_hooks
+from hpoglue.config import Config
+from hpoglue.measure import Measure
+from hpoglue.optimizer import Optimizer
+from hpoglue.problem import Problem
+from hpoglue.query import Query
+from hpoglue.result import Result
+from hpoglue.run_glue import run_glue
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_VALUES = [np.nan, 0.5, 0.1, 0.3]
+
+
+def _query(query: Query) -> Result:
+    return Result(query=query, fidelity=None, values={"y": _VALUES[int(query.config.config_id)]})
+
+
+_BENCHMARK = FunctionalBenchmark(
+    name="values",
+    config_space=[Config(config_id=str(i), values={"x": float(i)}) for i in range(4)],
+    metrics={"y": Measure.metric((0.0, 1.0), minimize=True)},
+    query=_query,
+)
+
+
+class _Optimizer(Optimizer):
+    """Asks for the configs of the benchmark in order."""
+
+    name = "in_order"
+    support = Problem.Support(
+        fidelities=(None,),
+        objectives=("single",),
+        cost_awareness=(None,),
+        tabular=True,
+    )
+
+    def __init__(self, *, problem, seed, working_directory) -> None:  # noqa: ARG002
+        assert isinstance(problem.config_space, list)
+        self.configs = iter(problem.config_space)
+
+    def ask(self) -> Query:
+        return Query(config=next(self.configs))
+
+    def tell(self, result: Result) -> None:
+        pass
+
+
+class _Recorder(Callback):
+    def __init__(self) -> None:
+        self.asked: list[str] = []
+
+    def on_ask(self, query: Query) -> None:
+        self.asked.append(query.config.config_id)
+
+
+def test_only_overridden_hooks_are_bound() -> None:
+    recorder = _Recorder()
+    assert bound_hooks([recorder], "on_ask") == [recorder.on_ask]
+    assert bound_hooks([recorder], "on_result") == []
+
+
+def test_live_metrics_skip_failed_trials(tmp_path: Path) -> None:
+    path = tmp_path / "live.json"
+    recorder = _Recorder()
+    run_glue(
+        _Optimizer,
+        _BENCHMARK,
+        objectives="y",
+        budget=4,
+        cache_benchmark=False,
+        callbacks=[recorder, LiveMetricsCallback(path, interval_s=0)],
+    )
+
+    metrics = json.loads(path.read_text(), parse_constant=lambda c: c)
+    assert recorder.asked == ["0", "1", "2", "3"]
+    assert metrics["status"] == "finished"
+    assert metrics["n_results"] == len(_VALUES)
+    assert metrics["incumbent"] == {"y": 0.1}
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+import pickle
+import subprocess
+import sys
+
+from hpoglue.config import CompactConfig, Config, ConfigSchema
+
+_UNPICKLE = """
+import pickle, sys
+config, rounded = pickle.loads(sys.stdin.buffer.read())
+assert hash(rounded) == hash(tuple(rounded)), "pickled tuple has a stale hash"
+fresh = config.to_tuple()
+assert hash(fresh) == hash(tuple(fresh)), "pickled config has a stale cache"
+assert {fresh: 1}.get(tuple(fresh)) == 1
+assert {tuple(rounded): 1}.get(rounded) == 1
+"""
+
+
+def test_config_pickle_round_trip_across_processes() -> None:
+    config = Config(config_id="a", values={"x": 0.123456789, "kernel": "rbf", "depth": 3})
+    rounded = config.to_tuple()
+    payload = pickle.dumps((config, rounded))
+
+    # NOTE: Strings hash differently in a process with another hash seed.
+    env = {**os.environ, "PYTHONHASHSEED": "12345"}
+    proc = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", _UNPICKLE],
+        input=payload,
+        env=env,
+        capture_output=True,
+        check=False,
+    )
+    assert proc.returncode == 0, proc.stderr.decode()
+
+
+def test_config_pickle_keeps_values() -> None:
+    config = Config(config_id="a", values={"x": 1.5, "kernel": "rbf"}, description="d")
+    config.to_tuple()
+
+    restored = pickle.loads(pickle.dumps(config))  # noqa: S301
+    assert restored == config
+    assert restored.to_tuple() == config.to_tuple()
+
+
+def _compact() -> CompactConfig:
+    return ConfigSchema(names=("x", "kernel", "depth")).make("a", {"x": 1.5, "kernel": "rbf"})
+
+
+def test_compact_config_values_are_built_once() -> None:
+    config = _compact()
+    assert config.values is config.values
+    assert config.values == {"x": 1.5, "kernel": "rbf"}
+
+    config.values = {"x": 2.5}
+    assert config["x"] == 2.5  # noqa: PLR2004
+    assert config.values == {"x": 2.5}
+
+
+def test_compact_config_replace_and_with_values() -> None:
+    config = _compact()
+
+    replaced = dataclasses.replace(config, description="d")
+    assert replaced == Config(config_id="a", values=config.values, description="d")
+
+    other = config.with_values({"depth": 3})
+    assert other.schema is config.schema
+    assert other == Config(config_id="a", values={"depth": 3})
+
+
+def test_compact_config_pickle_round_trip() -> None:
+    config = _compact()
+    restored = pickle.loads(pickle.dumps(config))  # noqa: S301
+    assert restored == config
+    assert restored.schema.names == config.schema.names
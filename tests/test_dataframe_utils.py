@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from hpoglue.dataframe_utils import inc_traces
+
+
+def test_elapsed_time_starts_at_the_first_row_of_a_run() -> None:
+    t0 = pd.Timestamp("2024-01-01")
+    df = pd.DataFrame(
+        {
+            "seed": [0, 0, 0, 1, 1],
+            "time_start": t0 + pd.to_timedelta([0, 6, 18, 0, 2], unit="s"),
+            "time_end": t0 + pd.to_timedelta([5, 7, 19, 1, 3], unit="s"),
+            "value": [np.nan, 2.0, 1.0, 3.0, 4.0],
+        }
+    )
+    traces = inc_traces(df, y_col="value", x_col="time_end", x_start_col="time_start", by=["seed"])
+    assert traces["time_end"].tolist() == [7.0, 19.0, 1.0]
+    assert traces["y"].tolist() == [2.0, 1.0, 3.0]
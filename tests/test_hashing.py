@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from hpoglue.hashing import content_hash
+
+_HASH = """
+import numpy as np
+from hpoglue.hashing import content_hash
+print(content_hash({"fn": np.mean, "cls": dict, "builtin": len, "x": np.float64(0.5)}))
+"""
+
+
+def test_functions_and_classes_hash_the_same_across_processes() -> None:
+    hashes = {
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-c", _HASH],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        for _ in range(2)
+    }
+    assert len(hashes) == 1
+
+
+@pytest.mark.parametrize("value", [object(), [1].append])
+def test_values_without_stable_encoding_raise(value: object) -> None:
+    with pytest.raises(TypeError, match="content hash"):
+        content_hash({"a": value})
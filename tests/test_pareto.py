@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hpoglue.benchmark import BenchmarkDescription
+from hpoglue.config import Config
+from hpoglue.measure import Measure
+from hpoglue.optimizer import Optimizer
+from hpoglue.pareto import ParetoArchive, hypervolume, hypervolume_traces
+from hpoglue.problem import Problem
+
+_OBJECTIVES = {
+    "y0": Measure.metric((0.0, 1.0), minimize=True),
+    "y1": Measure.metric((0.0, 1.0), minimize=True),
+}
+
+
+class _Optimizer(Optimizer):
+    name = "opt"
+    support = Problem.Support(
+        fidelities=(None,),
+        objectives=("many",),
+        cost_awareness=(None,),
+        tabular=True,
+    )
+
+    def __init__(self, *, problem, seed, working_directory) -> None:
+        raise NotImplementedError
+
+    def ask(self):
+        raise NotImplementedError
+
+    def tell(self, result) -> None:
+        raise NotImplementedError
+
+
+_DESC = BenchmarkDescription(
+    name="bench",
+    config_space=[Config(config_id="a", values={"x": 1.0})],
+    load=lambda _: NotImplemented,
+    metrics=_OBJECTIVES,
+)
+
+
+def _naive_front(points: np.ndarray) -> np.ndarray:
+    keep = [
+        i
+        for i, p in enumerate(points)
+        if not any(np.all(q <= p) and np.any(q < p) for q in points)
+        and not any(np.array_equal(points[j], p) for j in range(i))
+    ]
+    return points[keep]
+
+
+def _naive_hypervolume(points: np.ndarray, reference_point: np.ndarray) -> float:
+    # NOTE: Sums the cells between the coordinates of the points that are dominated.
+    points = np.minimum(points, reference_point)
+    edges = [
+        np.unique(np.r_[points[:, d], reference_point[d]]) for d in range(len(reference_point))
+    ]
+    volume = 0.0
+    for cell in itertools.product(*(range(len(e) - 1) for e in edges)):
+        lower = np.array([e[i] for e, i in zip(edges, cell, strict=True)])
+        if np.any(np.all(points <= lower, axis=1)):
+            upper = np.array([e[i + 1] for e, i in zip(edges, cell, strict=True)])
+            volume += float(np.prod(upper - lower))
+    return volume
+
+
+def _points(n: int, n_objectives: int, seed: int) -> np.ndarray:
+    # NOTE: Few distinct values, such that there are ties and duplicates.
+    return np.random.default_rng(seed).integers(0, 8, size=(n, n_objectives)) / 8
+
+
+@pytest.mark.parametrize("n_objectives", [2, 3])
+@pytest.mark.parametrize("seed", range(5))
+def test_archive_keeps_the_front_and_its_hypervolume(n_objectives: int, seed: int) -> None:
+    objectives = {f"y{i}": Measure.metric((0.0, 1.0), minimize=True) for i in range(n_objectives)}
+    archive = ParetoArchive(objectives)
+    points = _points(30, n_objectives, seed)
+    for k, point in enumerate(points, start=1):
+        archive.add(point)
+
+        expected = _naive_front(points[:k])
+        assert sorted(map(tuple, archive.points)) == sorted(map(tuple, expected))
+        assert archive.hypervolume == pytest.approx(
+            _naive_hypervolume(expected, archive.reference_point)
+        )
+
+
+@pytest.mark.parametrize("n_objectives", [1, 2, 3])
+def test_hypervolume(n_objectives: int) -> None:
+    points = _points(20, n_objectives, seed=0)
+    reference_point = np.full(n_objectives, 0.9)
+    assert hypervolume(points, reference_point) == pytest.approx(
+        _naive_hypervolume(points, reference_point)
+    )
+
+
+def test_maximized_objectives_are_negated() -> None:
+    archive = ParetoArchive(
+        {
+            "loss": Measure.metric((0.0, 1.0), minimize=True),
+            "acc": Measure.metric((0.0, 1.0), minimize=False),
+        }
+    )
+    assert archive.add([0.5, 0.5])
+    assert not archive.add([0.6, 0.4])
+    assert archive.add([0.4, 0.6])
+    assert len(archive) == 1
+    assert archive.hypervolume == pytest.approx(0.6 * 0.6)
+
+
+def test_hypervolume_traces_per_run() -> None:
+    points = _points(10, 2, seed=1)
+    df = pd.DataFrame(
+        {
+            "seed": [0, 1] * 5,
+            "budget_used_total": np.arange(1.0, 11.0),
+            "results.y0": points[:, 0],
+            "results.y1": points[:, 1],
+        }
+    )
+    problem = Problem.problem(
+        optimizer=_Optimizer,
+        benchmark=_DESC,
+        objectives=list(_OBJECTIVES),
+        budget=10,
+        continuations=False,
+    )
+    traces = hypervolume_traces(df, problem)
+
+    for seed, trace in traces.groupby("seed"):
+        run = points[df["seed"].to_numpy() == seed]
+        expected = [_naive_hypervolume(run[: k + 1], np.ones(2)) for k in range(len(run))]
+        assert trace["hypervolume"].to_numpy() == pytest.approx(expected)
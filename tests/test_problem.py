@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from hpoglue.benchmark import BenchmarkDescription
+from hpoglue.config import Config
+from hpoglue.measure import Measure
+from hpoglue.optimizer import Optimizer
+from hpoglue.problem import Problem
+
+
+class _Optimizer(Optimizer):
+    name = "opt"
+    support = Problem.Support(
+        fidelities=(None,),
+        objectives=("single",),
+        cost_awareness=(None,),
+        tabular=False,
+    )
+
+    def __init__(self, *, problem, seed, working_directory) -> None:
+        raise NotImplementedError
+
+    def ask(self):
+        raise NotImplementedError
+
+    def tell(self, result) -> None:
+        raise NotImplementedError
+
+
+_DESC = BenchmarkDescription(
+    name="bench",
+    config_space=[Config(config_id="a", values={"x": 1.0})],
+    load=lambda _: NotImplemented,
+    metrics={"y": Measure.metric((0.0, 1.0), minimize=True)},
+)
+
+
+def test_grid_dedupes_list_valued_hyperparameters() -> None:
+    problems = Problem.grid(
+        optimizers=[
+            (_Optimizer, {"a": [1, 2]}),
+            (_Optimizer, {"a": [1, 2]}),
+            (_Optimizer, {"a": [3]}),
+        ],
+        benchmarks=[_DESC],
+        budgets=[5],
+    )
+    assert [p.optimizer_hyperparameters for p in problems] == [{"a": [1, 2]}, {"a": [3]}]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hpoglue.benchmark import FunctionalBenchmark
+from hpoglue.config import Config
+from hpoglue.measure import Measure
+from hpoglue.regret import OptimumResolver, regret
+from hpoglue.result import Result
+
+if TYPE_CHECKING:
+    from hpoglue.query import Query
+
+
+def _query(query: Query) -> Result:
+    x = query.config.values["x"]
+    return Result(query=query, fidelity=None, values={"acc": 1 - x, "loss": x})
+
+
+# NOTE: The optimum of `loss` is its bound, `acc` is unbounded and resolved by its points.
+_LOSS = FunctionalBenchmark(
+    name="loss",
+    config_space=[Config(config_id="a", values={"x": 1.0})],
+    metrics={"loss": Measure.metric((0.0, 2.0), minimize=True)},
+    query=_query,
+)
+_ACC = FunctionalBenchmark(
+    name="acc",
+    config_space=[Config(config_id="a", values={"x": 1.0})],
+    metrics={"acc": Measure.metric((-np.inf, np.inf), minimize=False)},
+    query=_query,
+    predefined_points={
+        "good": Config(config_id="good", values={"x": 0.1}),
+        "bad": Config(config_id="bad", values={"x": 0.7}),
+    },
+)
+
+
+def _results() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 20
+    return pd.DataFrame(
+        {
+            "benchmark": rng.choice(["loss", "acc"], size=n),
+            "results.loss": rng.uniform(0.0, 2.0, size=n),
+            "results.acc": rng.uniform(-1.0, 0.9, size=n),
+        }
+    )
+
+
+def _naive(df: pd.DataFrame) -> pd.DataFrame:
+    rows = []
+    worst_acc = df.loc[df["benchmark"] == "acc", "results.acc"].min()
+    for _, row in df.iterrows():
+        if row["benchmark"] == "loss":
+            loss = row["results.loss"] - 0.0
+            rows.append({"loss": loss, "n_loss": loss / 2.0, "acc": np.nan, "n_acc": np.nan})
+        else:
+            acc = 0.9 - row["results.acc"]
+            n_acc = acc / (0.9 - worst_acc)
+            rows.append({"loss": np.nan, "n_loss": np.nan, "acc": acc, "n_acc": n_acc})
+    return pd.DataFrame(rows)
+
+
+def test_regret_matches_a_row_by_row_reference() -> None:
+    df = _results()
+    out = regret(df, [_LOSS, _ACC], ["loss", "acc"], resolver=OptimumResolver())
+    expected = _naive(df)
+
+    np.testing.assert_allclose(out["regret.loss"], expected["loss"])
+    np.testing.assert_allclose(out["normalized_regret.loss"], expected["n_loss"])
+    np.testing.assert_allclose(out["regret.acc"], expected["acc"])
+    np.testing.assert_allclose(out["normalized_regret.acc"], expected["n_acc"])
+
+
+def test_oracle_takes_precedence() -> None:
+    resolver = OptimumResolver({("loss", "loss"): 0.5})
+    assert resolver.optimum(_LOSS.desc, "loss") == 0.5  # noqa: PLR2004
+    assert resolver.optimum(_ACC.desc, "acc") == pytest.approx(0.9)
+
+
+def test_infinite_bounds_can_raise() -> None:
+    with pytest.raises(ValueError, match="infinite bounds"):
+        regret(_results(), [_ACC, _LOSS], "acc", infinite_bounds="raise")
+
+
+def test_missing_benchmark_description_raises() -> None:
+    with pytest.raises(KeyError, match="acc"):
+        regret(_results(), [_LOSS], "loss")
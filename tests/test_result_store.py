@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import numpy as np
+
+from hpoglue.config import Config
+from hpoglue.query import Query
+from hpoglue.result import Result
+from hpoglue.result_store import ResultStore
+
+
+def _result(config_id: str, **values: object) -> Result:
+    query = Query(config=Config(config_id=config_id, values={"x": 1.0}))
+    return Result(query=query, fidelity=None, values=values)
+
+
+def test_columns_of_results_with_other_keys_are_filled_with_missing_values() -> None:
+    store = ResultStore(capacity=1)
+    store.extend([_result("a", y=1.0), _result("b", y=2.0, note="slow"), _result("a", z=3)])
+
+    assert len(store) == 3  # noqa: PLR2004
+    assert store.column("config_index").tolist() == [0, 1, 0]
+    np.testing.assert_array_equal(store.column("results.y"), [1.0, 2.0, np.nan])
+    np.testing.assert_array_equal(store.column("results.z"), [np.nan, np.nan, 3.0])
+    assert store.column("results.note").tolist() == [None, "slow", None]
+
+
+def test_mixed_type_columns_are_exported_as_strings() -> None:
+    store = ResultStore()
+    store.extend([_result("a", note="slow"), _result("b", note=1.5), _result("c", y=0.0)])
+
+    table = store.to_arrow(configs=True)
+    assert table.column("results.note").to_pylist() == ["slow", "1.5", None]
+    assert table.column("config_id").to_pylist() == ["a", "b", "c"]
+    assert table.column("config.x").to_pylist() == [1.0, 1.0, 1.0]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from hpoglue.benchmark import FunctionalBenchmark
+from hpoglue.config import Config
+from hpoglue.measure import Measure
+from hpoglue.optimizer import Optimizer
+from hpoglue.problem import Problem
+from hpoglue.query import Query
+from hpoglue.result import Result
+from hpoglue.run_glue import run_glue
+
+
+def _query(query: Query) -> Result:
+    x = query.config.values["x"]
+    return Result(query=query, fidelity=None, values={"y": x, "z": 1 - x})
+
+
+_BENCHMARK = FunctionalBenchmark(
+    name="two_metrics",
+    config_space=[
+        Config(config_id=str(i), values={"x": i / 4, "kernel": ["rbf", "poly"][i % 2]})
+        for i in range(4)
+    ],
+    metrics={
+        "y": Measure.metric((0.0, 1.0), minimize=True),
+        "z": Measure.metric((0.0, 1.0), minimize=True),
+    },
+    query=_query,
+)
+
+
+class _Optimizer(Optimizer):
+    """Asks for the configs of the benchmark in order."""
+
+    name = "in_order"
+    support = Problem.Support(
+        fidelities=(None,),
+        objectives=("single", "many"),
+        cost_awareness=(None,),
+        tabular=True,
+    )
+
+    def __init__(self, *, problem, seed, working_directory) -> None:  # noqa: ARG002
+        assert isinstance(problem.config_space, list)
+        self.configs = iter(problem.config_space)
+
+    def ask(self) -> Query:
+        return Query(config=next(self.configs))
+
+    def tell(self, result: Result) -> None:
+        pass
+
+
+def test_list_valued_objectives_have_one_entry_per_row() -> None:
+    df = run_glue(_Optimizer, _BENCHMARK, objectives=["y", "z"], budget=3, cache_benchmark=False)
+    assert len(df) == 3  # noqa: PLR2004
+    assert df["objectives"].tolist() == [["y", "z"]] * 3
+
+
+def test_compact_results_match_the_nested_frame() -> None:
+    kwargs = {"objectives": ["y", "z"], "budget": 3, "cache_benchmark": False}
+    nested = run_glue(_Optimizer, _BENCHMARK, **kwargs)
+    compact = run_glue(_Optimizer, _BENCHMARK, compact=True, **kwargs)
+
+    assert isinstance(compact["optimizer"].dtype, pd.CategoricalDtype)
+    assert isinstance(compact["config.kernel"].dtype, pd.CategoricalDtype)
+    assert compact["objectives"].tolist() == ["y,z"] * 3
+    assert compact["results.y"].dtype == np.float64
+    for (_, row), (_, flat) in zip(nested.iterrows(), compact.iterrows(), strict=True):
+        for hp, value in row["config"].items():
+            assert flat[f"config.{hp}"] == value
+        for key, value in row["results"].items():
+            assert flat[f"results.{key}"] == value
+        assert flat["benchmark"] == row["benchmark"]
+        assert flat["budget_used_total"] == row["budget_used_total"]
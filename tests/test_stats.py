@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hpoglue.stats import PerformanceMatrix
+
+
+def _results() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "benchmark": "b",
+            "optimizer": ["rs", "rs", "rs", "rs", "tpe", "tpe", "tpe", "tpe"],
+            "seed": [0, 0, 1, 1, 0, 0, 1, 1],
+            "budget_used_total": [1, 2, 1, 2, 1, 2, 1, 2],
+            "value": [3.0, 2.0, 4.0, 1.0, 2.0, 2.0, 5.0, 3.0],
+        }
+    )
+
+
+def test_final_incumbent_per_block() -> None:
+    matrix = PerformanceMatrix.from_results(_results(), y_col="value")
+    assert matrix.optimizers == ["rs", "tpe"]
+    assert matrix.values.tolist() == [[2.0, 2.0], [1.0, 3.0]]
+
+
+def test_several_runs_in_a_block_raise() -> None:
+    with pytest.raises(ValueError, match="one run per block"):
+        PerformanceMatrix.from_results(
+            _results(), y_col="value", blocks=("benchmark",), strata=()
+        )
+
+
+def test_auc_grid_spans_each_benchmark() -> None:
+    budgets = {"short": np.arange(1, 11), "long": np.arange(10, 101, 10)}
+    df = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "benchmark": benchmark,
+                    "optimizer": "rs",
+                    "seed": 0,
+                    "budget_used_total": budget,
+                    "value": 1 / np.arange(1, 11),
+                }
+            )
+            for benchmark, budget in budgets.items()
+        ],
+        ignore_index=True,
+    )
+    matrix = PerformanceMatrix.from_results(df, y_col="value", measure="auc", grid=10)
+    # Both benchmarks have the same curve over 10 evenly spaced steps of their own budget
+    expected = np.mean(1 / np.arange(1, 11))
+    np.testing.assert_allclose(matrix.values[:, 0], [expected, expected])
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hpoglue.dataframe_utils import inc_traces
+from hpoglue.streaming import StreamingAggregator, aggregate_files
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_BY = ["optimizer", "seed"]
+_COLUMNS = [*_BY, "budget_used_total", "y", "test_y"]
+
+
+def _results() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    runs = [
+        pd.DataFrame(
+            {
+                "optimizer": optimizer,
+                "seed": seed,
+                "budget_used_total": np.arange(1, n + 1, dtype=np.float64),
+                "results.y": rng.random(n),
+                "results.test_y": rng.random(n),
+            }
+        )
+        for optimizer in ("a", "b")
+        for seed, n in enumerate((17, 5, 30))
+    ]
+    # NOTE: Interleaves the runs, keeping the order of the results within each run.
+    df = pd.concat(runs, ignore_index=True)
+    return df.sort_values("budget_used_total", kind="stable", ignore_index=True)
+
+
+def _aggregator() -> StreamingAggregator:
+    return StreamingAggregator(y_col="y", test_y_col="test_y", by=_BY)
+
+
+def _expected_traces(df: pd.DataFrame) -> pd.DataFrame:
+    traces = inc_traces(df, y_col="y", test_y_col="test_y", by=_BY)
+    return traces.sort_values([*_BY, "budget_used_total"], ignore_index=True)[_COLUMNS]
+
+
+def _expected_final(df: pd.DataFrame) -> pd.DataFrame:
+    rows = []
+    for (optimizer, seed), run in df.groupby(_BY, sort=True):
+        best = run["results.y"].to_numpy().argmin()
+        rows.append(
+            {
+                "optimizer": optimizer,
+                "seed": seed,
+                "n": len(run),
+                "budget_used_total": run["budget_used_total"].max(),
+                "y": run["results.y"].iloc[best],
+                "test_y": run["results.test_y"].iloc[best],
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _final(aggregator: StreamingAggregator) -> pd.DataFrame:
+    final = aggregator.final_performance().sort_values(_BY, ignore_index=True)
+    return final.astype({"n": np.int64})
+
+
+@pytest.mark.parametrize("chunksize", [1, 7, 1_000])
+def test_chunks_give_the_traces_and_final_performance_of_the_whole(chunksize: int) -> None:
+    df = _results()
+    aggregator = _aggregator()
+    for start in range(0, len(df), chunksize):
+        aggregator.update(df.iloc[start : start + chunksize])
+
+    pd.testing.assert_frame_equal(
+        aggregator.traces()[_COLUMNS], _expected_traces(df), check_dtype=False
+    )
+    pd.testing.assert_frame_equal(_final(aggregator), _expected_final(df), check_dtype=False)
+
+
+def test_merged_aggregators_over_split_runs() -> None:
+    df = _results()
+    half = len(df) // 2
+    first, second = _aggregator(), _aggregator()
+    first.update(df.iloc[:half])
+    second.update(df.iloc[half:])
+    first.merge(second)
+
+    pd.testing.assert_frame_equal(first.traces()[_COLUMNS], _expected_traces(df), check_dtype=False)
+    pd.testing.assert_frame_equal(_final(first), _expected_final(df), check_dtype=False)
+
+
+def test_ranks_within_seeds() -> None:
+    df = _results()
+    aggregator = _aggregator()
+    aggregator.update(df)
+
+    ranks = aggregator.ranks(within=["seed"])
+    expected = _expected_final(df)
+    expected["rank"] = expected.groupby("seed")["y"].rank()
+    pd.testing.assert_frame_equal(
+        ranks.sort_values(_BY, ignore_index=True)[["optimizer", "seed", "rank"]],
+        expected[["optimizer", "seed", "rank"]],
+    )
+
+
+def test_results_out_of_order_across_chunks_raise() -> None:
+    df = _results()
+    run = df[(df["optimizer"] == "a") & (df["seed"] == 0)]
+    aggregator = _aggregator()
+    aggregator.update(run.iloc[5:])
+    with pytest.raises(ValueError, match="increasing order"):
+        aggregator.update(run.iloc[:5])
+
+
+def test_aggregate_csv_files(tmp_path: Path) -> None:
+    df = _results()
+    paths = []
+    for optimizer, run in df.groupby("optimizer"):
+        path = tmp_path / f"{optimizer}.csv"
+        run.to_csv(path, index=False)
+        paths.append(path)
+
+    aggregator = aggregate_files(paths, y_col="y", test_y_col="test_y", by=_BY, chunksize=4)
+    pd.testing.assert_frame_equal(_final(aggregator), _expected_final(df), check_dtype=False)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from hpoglue.benchmark import FunctionalBenchmark
+from hpoglue.callbacks import Callback
+from hpoglue.config import Config
+from hpoglue.measure import Measure
+from hpoglue.optimizer import Optimizer
+from hpoglue.problem import Problem
+from hpoglue.query import Query
+from hpoglue.result import Result
+from hpoglue.study import MANIFEST_NAME, StudyManifest, fingerprint, run_study
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_SEEDS = [0, 1]
+_BUDGET = 3
+
+
+def _query(query: Query) -> Result:
+    return Result(query=query, fidelity=None, values={"y": query.config.values["x"]})
+
+
+_BENCHMARK = FunctionalBenchmark(
+    name="study",
+    config_space=[Config(config_id=str(i), values={"x": i / 4}) for i in range(4)],
+    metrics={"y": Measure.metric((0.0, 1.0), minimize=True)},
+    query=_query,
+)
+
+
+class _Optimizer(Optimizer):
+    """Asks for the configs of the benchmark in order."""
+
+    name = "in_order"
+    support = Problem.Support(
+        fidelities=(None,),
+        objectives=("single",),
+        cost_awareness=(None,),
+        tabular=True,
+    )
+
+    def __init__(self, *, problem, seed, working_directory) -> None:  # noqa: ARG002
+        assert isinstance(problem.config_space, list)
+        self.configs = iter(problem.config_space)
+
+    def ask(self) -> Query:
+        return Query(config=next(self.configs))
+
+    def tell(self, result: Result) -> None:
+        pass
+
+
+class _Counter(Callback):
+    def __init__(self) -> None:
+        self.n_asked = 0
+
+    def on_ask(self, query: Query) -> None:  # noqa: ARG002
+        self.n_asked += 1
+
+
+@pytest.fixture
+def problem() -> Problem:
+    return Problem.problem(
+        optimizer=_Optimizer,
+        benchmark=_BENCHMARK.desc,
+        objectives="y",
+        budget=_BUDGET,
+        continuations=False,
+    )
+
+
+def _run_study(problem: Problem, root: Path) -> int:
+    counter = _Counter()
+    entries = run_study([problem], _SEEDS, archive=root, callbacks=[counter])
+    assert [(e.seed, e.status, e.n_results) for e in entries] == [
+        (seed, "completed", _BUDGET) for seed in _SEEDS
+    ]
+    return counter.n_asked
+
+
+def test_completed_runs_are_skipped(tmp_path: Path, problem: Problem) -> None:
+    assert _run_study(problem, tmp_path) == _BUDGET * len(_SEEDS)
+    assert _run_study(problem, tmp_path) == 0
+    assert len(StudyManifest(tmp_path / MANIFEST_NAME)) == len(_SEEDS)
+
+
+def test_runs_without_results_file_are_run_again(tmp_path: Path, problem: Problem) -> None:
+    _run_study(problem, tmp_path)
+    manifest = StudyManifest(tmp_path / MANIFEST_NAME)
+    entry = manifest.get(fingerprint(problem, 1))
+    assert entry is not None
+    assert entry.path is not None
+
+    (tmp_path / entry.path).unlink()
+    assert not manifest.completed(problem, 1)
+    assert manifest.completed(problem, 0)
+    assert _run_study(problem, tmp_path) == _BUDGET
+
+
+def test_truncated_manifest_line_is_skipped(tmp_path: Path, problem: Problem) -> None:
+    _run_study(problem, tmp_path)
+    path = tmp_path / MANIFEST_NAME
+    lines = path.read_bytes().splitlines(keepends=True)
+
+    # NOTE: As if the process crashed while appending the entry of the second seed.
+    path.write_bytes(lines[0] + lines[1][: len(lines[1]) // 2])
+    manifest = StudyManifest(path)
+    assert [e.seed for e in manifest.entries()] == [0]
+
+    assert _run_study(problem, tmp_path) == _BUDGET
+    assert [e.seed for e in StudyManifest(path).entries()] == _SEEDS
+
+
+_FINGERPRINT = """
+from hpoglue import Measure, Optimizer, Problem
+from hpoglue.benchmark import BenchmarkDescription
+from hpoglue.config import Config
+from hpoglue.study import fingerprint
+
+class Opt(Optimizer):
+    name = "opt"
+    support = Problem.Support(
+        fidelities=(None,), objectives=("single",), cost_awareness=(None,), tabular=True
+    )
+
+desc = BenchmarkDescription(
+    name="bench",
+    config_space=[Config(config_id="a", values={"x": 1.0})],
+    load=lambda _: NotImplemented,
+    metrics={"y": Measure.metric((0.0, 1.0), minimize=True)},
+)
+problem = Problem.problem(
+    optimizer=Opt,
+    optimizer_hyperparameters={"a": 1},
+    benchmark=desc,
+    budget=5,
+    continuations=False,
+)
+print(fingerprint(problem, 0, hpoglue_version="1.0"))
+"""
+
+
+def test_fingerprint_is_the_same_across_processes() -> None:
+    fingerprints = {
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-c", _FINGERPRINT],
+            env={**os.environ, "PYTHONHASHSEED": str(seed)},
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        for seed in range(2)
+    }
+    assert len(fingerprints) == 1
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from hpoglue.config import Config
+from hpoglue.query import Query
+from hpoglue.trajectory import TrajectoryBuffer
+
+
+class _CurveBenchmark:
+    """Serves the curve `value = epoch` and records the requested ranges."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[float, float]] = []
+
+    def trajectory(self, *, query: Query, frm: float, to: float) -> pd.DataFrame:  # noqa: ARG002
+        self.requests.append((frm, to))
+        epochs = np.arange(frm, to + 1)
+        return pd.DataFrame({"value": epochs.astype(float)}, index=pd.Index(epochs, name="epoch"))
+
+
+def _query(epoch: int) -> Query:
+    return Query(config=Config(config_id="a", values={"x": 1.0}), fidelity=("epoch", epoch))
+
+
+def test_non_adjacent_ranges_are_filled() -> None:
+    benchmark = _CurveBenchmark()
+    buffer = TrajectoryBuffer()
+
+    buffer.fetch(benchmark, key="a", query=_query(5), frm=1, to=5)
+    buffer.fetch(benchmark, key="a", query=_query(9), frm=7, to=9)
+    df = buffer.fetch(benchmark, key="a", query=_query(9), frm=1, to=9).to_frame()
+
+    assert df.index.tolist() == list(range(1, 10))
+    assert df["value"].tolist() == [float(e) for e in range(1, 10)]
+    assert benchmark.requests == [(1, 5), (7, 9), (5, 7)]
+
+
+def test_covered_ranges_are_not_fetched_again() -> None:
+    benchmark = _CurveBenchmark()
+    buffer = TrajectoryBuffer()
+
+    buffer.fetch(benchmark, key="a", query=_query(9), frm=1, to=9)
+    df = buffer.fetch(benchmark, key="a", query=_query(6), frm=3, to=6).to_frame()
+
+    assert df.index.tolist() == [3, 4, 5, 6]
+    assert benchmark.requests == [(1, 9)]
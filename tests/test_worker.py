@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from hpoglue.benchmark import FunctionalBenchmark
+from hpoglue.config import Config
+from hpoglue.measure import Measure
+from hpoglue.query import Query
+from hpoglue.result import Result
+from hpoglue.worker import BenchmarkWorker, BenchmarkWorkerError
+
+# NOTE: Large enough that a window of requests or responses overflows a pipe.
+_N_METRICS = 2_000
+_PADDING = "x" * 50_000
+
+
+def _query(query: Query) -> Result:
+    x = query.config.values["x"]
+    if x < 0:
+        raise ValueError(f"negative {x=}")
+
+    values = {f"y{i}": x + i for i in range(query.config.values.get("n_metrics", 1))}
+    trajectory = pd.DataFrame({"y0": [x, x]}, index=pd.Index([1, 2], name="epoch"))
+    return Result(query=query, fidelity=None, values=values, trajectory=trajectory)
+
+
+_BENCHMARK = FunctionalBenchmark(
+    name="worker",
+    config_space=[Config(config_id="a", values={"x": 1.0})],
+    metrics={"y0": Measure.metric((0.0, float("inf")), minimize=True)},
+    query=_query,
+)
+
+
+@pytest.fixture
+def worker(monkeypatch: pytest.MonkeyPatch):
+    # NOTE: The worker unpickles `_query`, so it must be able to import this module.
+    tests = str(Path(__file__).parent)
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join([tests, os.environ.get("PYTHONPATH", "")]))
+    with BenchmarkWorker(_BENCHMARK.desc, max_in_flight=4) as worker:
+        yield worker
+
+
+def _config(x: float, **values: object) -> Config:
+    return Config(config_id=str(x), values={"x": x, **values})
+
+
+def test_query_returns_values_and_trajectory(worker: BenchmarkWorker) -> None:
+    result = worker.query(Query(config=_config(1.0)))
+    assert result.values == {"y0": 1.0}
+    trajectory = result.trajectory_frame()
+    assert trajectory is not None
+    assert trajectory["y0"].tolist() == [1.0, 1.0]
+
+
+def test_query_many_keeps_the_order(worker: BenchmarkWorker) -> None:
+    queries = [Query(config=_config(float(i))) for i in range(20)]
+    results = worker.query_many(queries)
+    assert [r.values["y0"] for r in results] == [float(i) for i in range(20)]
+    assert all(r.query is q for r, q in zip(results, queries, strict=True))
+
+
+def test_query_many_with_large_requests_and_responses(worker: BenchmarkWorker) -> None:
+    queries = [
+        Query(config=_config(float(i), n_metrics=_N_METRICS, pad=_PADDING)) for i in range(20)
+    ]
+    results: list[Result] = []
+    thread = threading.Thread(target=lambda: results.extend(worker.query_many(queries)))
+    thread.start()
+    thread.join(timeout=30)
+    if thread.is_alive():
+        worker._kill()
+        pytest.fail("query_many deadlocked")
+
+    assert len(results) == len(queries)
+    assert all(len(r.values) == _N_METRICS for r in results)
+
+
+def test_errors_are_raised_and_the_worker_keeps_serving(worker: BenchmarkWorker) -> None:
+    with pytest.raises(BenchmarkWorkerError, match="negative"):
+        worker.query(Query(config=_config(-1.0)))
+
+    assert worker.query(Query(config=_config(2.0))).values == {"y0": 2.0}
+
+
+def test_close_stops_the_process(worker: BenchmarkWorker) -> None:
+    worker.close()
+    assert worker._proc.poll() == 0
+    worker.close()